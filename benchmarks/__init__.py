@@ -0,0 +1 @@
+# benchmarks：效能量測腳本，請在專案根目錄用 `python -m benchmarks.<name>` 執行
@@ -0,0 +1,125 @@
+# benchmarks/bench_environment.py
+"""
+TicTacToeEnvironment 微型效能測試：比較原本 list 版與 bitboard 版
+每秒可以執行多少次 step。
+
+執行方式（在專案根目錄）：
+    python -m benchmarks.bench_environment
+"""
+import argparse
+import random
+import time
+from typing import List, Optional
+
+from environment import TicTacToeEnvironment
+
+
+class ListTicTacToeEnvironment:
+    """改成 bitboard 之前的 list 版實作，只留作效能比較的基準。"""
+
+    lines = [
+        (0, 1, 2), (3, 4, 5), (6, 7, 8),
+        (0, 3, 6), (1, 4, 7), (2, 5, 8),
+        (0, 4, 8), (2, 4, 6),
+    ]
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.board: List[Optional[str]] = [None] * 9
+        self.current_player: str = 'X'
+        self.winner: Optional[str] = None
+        self.done: bool = False
+
+    def available_actions(self) -> List[int]:
+        return [i for i, cell in enumerate(self.board) if cell is None]
+
+    def step(self, action: int) -> None:
+        if self.done:
+            raise ValueError("Game already finished.")
+        if action not in self.available_actions():
+            raise ValueError(f"Invalid action: {action}")
+        self.board[action] = self.current_player
+        self.winner = self._check_winner()
+        if self.winner is not None:
+            self.done = True
+        elif not self.available_actions():
+            self.done = True
+        else:
+            self.current_player = 'O' if self.current_player == 'X' else 'X'
+
+    def _check_winner(self) -> Optional[str]:
+        for a, b, c in self.lines:
+            if self.board[a] is not None and \
+               self.board[a] == self.board[b] == self.board[c]:
+                return self.board[a]
+        return None
+
+
+def _make_orders(games: int, seed: int) -> List[List[int]]:
+    """事先產生每一局的落子順序，避免把亂數成本算進 step。"""
+    rng = random.Random(seed)
+    orders = []
+    for _ in range(games):
+        order = list(range(9))
+        rng.shuffle(order)
+        orders.append(order)
+    return orders
+
+
+def bench_steps(env_cls, orders: List[List[int]]) -> float:
+    """依序下完每一局，回傳 steps / sec。"""
+    env = env_cls()
+    steps = 0
+    start = time.perf_counter()
+    for order in orders:
+        env.reset()
+        for action in order:
+            env.step(action)
+            steps += 1
+            if env.done:
+                break
+    elapsed = time.perf_counter() - start
+    return steps / elapsed
+
+
+def bench_self_play(env_cls, games: int, seed: int) -> float:
+    """模擬 self-play：每步都呼叫 available_actions() 再隨機選，回傳 steps / sec。"""
+    rng = random.Random(seed)
+    env = env_cls()
+    steps = 0
+    start = time.perf_counter()
+    for _ in range(games):
+        env.reset()
+        while not env.done:
+            env.step(rng.choice(env.available_actions()))
+            steps += 1
+    elapsed = time.perf_counter() - start
+    return steps / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="TicTacToeEnvironment step 效能比較")
+    parser.add_argument("--games", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    orders = _make_orders(args.games, args.seed)
+    rows = [
+        ("step (固定順序)",
+         bench_steps(ListTicTacToeEnvironment, orders),
+         bench_steps(TicTacToeEnvironment, orders)),
+        ("self-play (含 available_actions)",
+         bench_self_play(ListTicTacToeEnvironment, args.games, args.seed),
+         bench_self_play(TicTacToeEnvironment, args.games, args.seed)),
+    ]
+
+    print(f"{'情境':<34}{'list 版':>14}{'bitboard 版':>14}{'倍數':>8}")
+    for name, before, after in rows:
+        print(f"{name:<34}{before:>14,.0f}{after:>14,.0f}{after / before:>7.2f}x")
+    print("（單位：steps / sec）")
+
+
+if __name__ == "__main__":
+    main()
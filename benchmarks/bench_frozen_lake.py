@@ -0,0 +1,61 @@
+# benchmarks/bench_frozen_lake.py
+"""
+FrozenLake 8x8 Q-learning training throughput (episodes / sec):
+- serial: frozen_lake.run(), one gymnasium env stepped in a Python loop
+- serial fast: frozen_lake.run(fast=True), same loop on frozen_lake_sim.FastFrozenLake
+- vectorized: frozen_lake_vec.train_vectorized() with several lockstep batch sizes
+
+run() writes its pickle / plot into the working directory, so the benchmark
+runs inside a temporary directory and never touches frozen_lake8x8.pkl.
+
+Usage (from the project root):
+    python -m benchmarks.bench_frozen_lake
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import frozen_lake
+from frozen_lake_model import TransitionModel
+from frozen_lake_vec import train_vectorized
+
+
+def bench_serial(episodes, fast=False):
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            start = time.perf_counter()
+            frozen_lake.run(episodes, is_training=True, fast=fast)
+            return episodes / (time.perf_counter() - start)
+        finally:
+            os.chdir(cwd)
+
+
+def bench_vectorized(episodes, n_envs, model, seed):
+    start = time.perf_counter()
+    train_vectorized(episodes, n_envs=n_envs, seed=seed, model=model)
+    return episodes / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FrozenLake training episodes/sec: serial vs vectorized")
+    parser.add_argument("--episodes", type=int, default=3000)
+    parser.add_argument("--envs", type=int, nargs="+", default=[16, 64, 256])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    model = TransitionModel.from_gym("8x8", is_slippery=True)
+    serial = bench_serial(args.episodes)
+    print(f"{'mode':<22}{'episodes/s':>14}{'speedup':>10}")
+    print(f"{'serial run()':<22}{serial:>14,.0f}{1.0:>9.1f}x")
+    fast = bench_serial(args.episodes, fast=True)
+    print(f"{'serial run(fast=True)':<22}{fast:>14,.0f}{fast / serial:>9.1f}x")
+    for n_envs in args.envs:
+        rate = bench_vectorized(args.episodes, n_envs, model, args.seed)
+        print(f"{f'vectorized x{n_envs}':<22}{rate:>14,.0f}{rate / serial:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
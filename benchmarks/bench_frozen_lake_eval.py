@@ -0,0 +1,77 @@
+# benchmarks/bench_frozen_lake_eval.py
+"""
+FrozenLake evaluation cost for one Q-table:
+- rolling success curve: run()'s old per-episode slice sum vs. frozen_lake_metrics.rolling_sum()
+- greedy evaluation: one episode at a time on FastFrozenLake vs. frozen_lake_metrics.evaluate_policy()
+
+The Q-table comes from value iteration, so no training run or pickle is needed.
+
+Usage (from the project root):
+    python -m benchmarks.bench_frozen_lake_eval
+"""
+import argparse
+import time
+
+import numpy as np
+
+from frozen_lake_metrics import evaluate_policy, rolling_sum, success_summary
+from frozen_lake_model import TransitionModel
+from frozen_lake_sim import FastFrozenLake
+from frozen_lake_solver import value_iteration
+
+
+def slice_sum(rewards, window=100):
+    """The loop run() used before rolling_sum()."""
+    sums = np.zeros(rewards.size)
+    for t in range(rewards.size):
+        sums[t] = np.sum(rewards[max(0, t - window):(t + 1)])
+    return sums
+
+
+def evaluate_serial(q, episodes, model, seed):
+    env = FastFrozenLake(model, seed=seed)
+    rewards = np.zeros(episodes)
+    for i in range(episodes):
+        state = env.reset()[0]
+        terminated = truncated = False
+        reward = 0
+        while not terminated and not truncated:
+            state, reward, terminated, truncated, _ = env.step(int(np.argmax(q[state, :])))
+        rewards[i] = reward == 1
+    return rewards
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FrozenLake rolling metrics and greedy evaluation: loop vs batched")
+    parser.add_argument("--episodes", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    model = TransitionModel.from_gym("8x8", is_slippery=True)
+    q, _ = value_iteration(model)
+    rewards = np.random.default_rng(args.seed).integers(0, 2, args.episodes).astype(float)
+
+    loop_sums, loop_time = timed(slice_sum, rewards)
+    fast_sums, fast_time = timed(rolling_sum, rewards)
+    assert np.allclose(loop_sums, fast_sums)
+    print(f"{'rolling sum':<24}{'seconds':>10}{'speedup':>10}")
+    print(f"{'  slice loop':<24}{loop_time:>10.4f}{1.0:>9.1f}x")
+    print(f"{'  cumsum':<24}{fast_time:>10.4f}{loop_time / fast_time:>9.1f}x")
+
+    serial, serial_time = timed(evaluate_serial, q, args.episodes, model, args.seed)
+    batched, batched_time = timed(evaluate_policy, q, args.episodes, model, args.seed)
+    print(f"\n{'greedy evaluation':<24}{'seconds':>10}{'speedup':>10}{'success (95% CI)':>28}")
+    for name, result, seconds in (("  serial", serial, serial_time), ("  batched", batched, batched_time)):
+        s = success_summary(result)
+        ci = f"{s['rate'] * 100:.2f}% [{s['low'] * 100:.2f}, {s['high'] * 100:.2f}]"
+        print(f"{name:<24}{seconds:>10.3f}{serial_time / seconds:>9.1f}x{ci:>28}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# benchmarks/bench_frozen_lake_large.py
+"""
+Q-learning on generated FrozenLake maps vs. grid size (frozen_lake_large):
+- model build time and transition-model memory
+- Q-table memory: dense float64 (what run() would allocate), dense float32, sparse visited rows
+- training time per episode and greedy success, shaped vs. zero initialization
+- optimal success (value iteration) for reference
+
+Usage (from the project root):
+    python -m benchmarks.bench_frozen_lake_large --sizes 16 32 64 128
+"""
+import argparse
+import time
+
+from frozen_lake_large import random_map_model, train_large
+from frozen_lake_metrics import evaluate_policy
+from frozen_lake_solver import value_iteration
+
+
+def model_bytes(model):
+    return sum(a.nbytes for a in (model.next_states, model.probs, model.cum_probs, model.rewards, model.terminals))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FrozenLake large-map scaling: memory and time per episode vs. grid size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 32, 64, 128])
+    parser.add_argument("--episodes", type=int, default=2000)
+    parser.add_argument("--eval-episodes", type=int, default=2000)
+    parser.add_argument("--p", type=float, default=0.95)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'size':>5} {'build s':>8} {'model KiB':>10} {'storage':>8} {'init':>7} {'Q KiB':>8} {'f64 KiB':>8} "
+          f"{'visited':>8} {'ms/ep':>7} {'success':>8} {'optimal':>8}")
+    for size in args.sizes:
+        start = time.perf_counter()
+        model = random_map_model(size, args.p, args.seed)
+        build = time.perf_counter() - start
+        q_opt, _ = value_iteration(model, sparse=True)
+        optimal = evaluate_policy(q_opt, args.eval_episodes, model=model, seed=args.seed).mean()
+        dense64 = model.n_states * model.n_actions * 8
+        for storage, init in (("dense", "zeros"), ("dense", "shaped"), ("sparse", "shaped")):
+            start = time.perf_counter()
+            table, _, _ = train_large(model, args.episodes, storage, init, seed=args.seed)
+            per_episode = (time.perf_counter() - start) / args.episodes * 1000
+            success = evaluate_policy(table.to_dense(), args.eval_episodes, model=model, seed=args.seed).mean()
+            visited = table.visited if storage == "sparse" else model.n_states
+            print(f"{size:>5} {build:>8.2f} {model_bytes(model) / 1024:>10.0f} {storage:>8} {init:>7} "
+                  f"{table.nbytes / 1024:>8.1f} {dense64 / 1024:>8.0f} {visited:>8} {per_episode:>7.2f} "
+                  f"{success * 100:>7.1f}% {optimal * 100:>7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
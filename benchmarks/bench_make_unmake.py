@@ -0,0 +1,179 @@
+# benchmarks/bench_make_unmake.py
+"""
+make / unmake 搜尋 vs 原本的「複製 board list」搜尋：
+同一批盤面分別用改版前的 MediumStrategy / MinimaxStrategy（alphabeta，不使用置換表）
+與目前的版本決策，比較每次決策的延遲，以及決策期間暫時配置的記憶體（tracemalloc peak）。
+
+執行方式（在專案根目錄）：
+    python -m benchmarks.bench_make_unmake
+    python -m benchmarks.bench_make_unmake --positions 500 --repeat 5
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Callable, List, Optional, Tuple
+
+from environment import CELL_LINES, TicTacToeEnvironment
+from players import WIN_SCORE, MediumStrategy, MinimaxStrategy
+
+_STATIC_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+
+
+def _winning_moves(board: List[Optional[str]], symbol: str, actions: List[int]) -> List[int]:
+    result = []
+    for a in actions:
+        for line in CELL_LINES[a]:
+            if all(i == a or board[i] == symbol for i in line):
+                result.append(a)
+                break
+    return result
+
+
+class ListMediumStrategy:
+    """改成連線計數之前的 MediumStrategy：每次決策讀 env.board 再逐條連線掃描。"""
+
+    def __init__(self, ai_symbol: str) -> None:
+        self.ai_symbol = ai_symbol
+        self.op_symbol = 'O' if ai_symbol == 'X' else 'X'
+
+    def choose_action(self, env) -> Optional[int]:
+        actions = env.available_actions()
+        if not actions:
+            return None
+        board = env.board
+        wins = _winning_moves(board, self.ai_symbol, actions)
+        if wins:
+            return wins[0]
+        blocks = _winning_moves(board, self.op_symbol, actions)
+        if blocks:
+            return blocks[0]
+        if board[4] is None:
+            return 4
+        return random.choice(actions)
+
+
+class ListAlphaBetaStrategy:
+    """改成 make / unmake 之前的 alpha-beta（不使用置換表）：在 board list 的副本上搜尋。"""
+
+    def __init__(self, ai_symbol: str) -> None:
+        self.ai_symbol = ai_symbol
+        self.op_symbol = 'O' if ai_symbol == 'X' else 'X'
+
+    def choose_action(self, env) -> Optional[int]:
+        board = env.board.copy()
+        best_score, best_action = -WIN_SCORE - 1, None
+        alpha, beta = -WIN_SCORE - 1, WIN_SCORE + 1
+        for action in self._ordered_moves(board, self.ai_symbol, self.op_symbol):
+            board[action] = self.ai_symbol
+            score = self._score_move(board, action, self.ai_symbol, self.op_symbol, 0, alpha, beta)
+            board[action] = None
+            if score > best_score:
+                best_score, best_action = score, action
+                alpha = max(alpha, score)
+        return best_action
+
+    def _score_move(self, board, action, mover, other, ply, alpha, beta) -> int:
+        if any(all(board[i] == mover for i in line) for line in CELL_LINES[action]):
+            return WIN_SCORE - (ply + 1)
+        return -self._alphabeta(board, other, mover, ply + 1, -beta, -alpha)
+
+    def _alphabeta(self, board, to_move, other, ply, alpha, beta) -> int:
+        if all(c is not None for c in board):
+            return 0
+        best_score = -WIN_SCORE - 1
+        for idx in self._ordered_moves(board, to_move, other):
+            board[idx] = to_move
+            score = self._score_move(board, idx, to_move, other, ply, alpha, beta)
+            board[idx] = None
+            best_score = max(best_score, score)
+            alpha = max(alpha, best_score)
+            if alpha >= beta:
+                break
+        return best_score
+
+    @staticmethod
+    def _ordered_moves(board, to_move, other) -> List[int]:
+        empties = [i for i in _STATIC_ORDER if board[i] is None]
+        threats = _winning_moves(board, to_move, empties)
+        threats += [a for a in _winning_moves(board, other, empties) if a not in threats]
+        if not threats:
+            return empties
+        return threats + [a for a in empties if a not in threats]
+
+
+def _positions(count: int, seed: int) -> List[TicTacToeEnvironment]:
+    """隨機對局中途、還沒結束的盤面（0 ~ 5 子）。"""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        env = TicTacToeEnvironment()
+        for _ in range(rng.randrange(0, 6)):
+            env.step(rng.choice(env.available_actions()))
+        if not env.done:
+            positions.append(env)
+    return positions
+
+
+def _decide_all(factory: Callable[[str], object], positions: List[TicTacToeEnvironment]) -> None:
+    strategies = {s: factory(s) for s in 'XO'}
+    for env in positions:
+        strategies[env.current_player].choose_action(env)
+
+
+def measure(factory: Callable[[str], object], positions: List[TicTacToeEnvironment],
+            repeat: int) -> Tuple[float, float, int]:
+    """
+    回傳 (每次決策秒數（取 repeat 次最快）, 每次決策暫時配置的平均 bytes, 最大 bytes)。
+    暫時配置 = 決策期間 tracemalloc 的 peak 減掉決策前已配置的量，
+    也就是搜尋過程中同時存在的 list / generator / 副本佔用的記憶體。
+    """
+    strategies = {s: factory(s) for s in 'XO'}
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for env in positions:
+            strategies[env.current_player].choose_action(env)
+        best = min(best, time.perf_counter() - start)
+
+    peaks = []
+    tracemalloc.start()
+    try:
+        for env in positions:
+            strategy = strategies[env.current_player]
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            strategy.choose_action(env)
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    finally:
+        tracemalloc.stop()
+    return best / len(positions), sum(peaks) / len(peaks), max(peaks)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="make / unmake 與複製 board 的搜尋成本比較")
+    parser.add_argument("--positions", type=int, default=300, help="盤面數")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    positions = _positions(args.positions, args.seed)
+    rows = [
+        ("medium", ListMediumStrategy, MediumStrategy),
+        ("alphabeta", ListAlphaBetaStrategy,
+         lambda symbol: MinimaxStrategy(symbol, use_table=False)),
+    ]
+    print(f"{args.positions} 個盤面（0 ~ 5 子），延遲取 {args.repeat} 次最快；"
+          f"暫時配置 = 決策期間 tracemalloc peak 的增量")
+    print(f"{'策略':<12}{'版本':<12}{'每步 (µs)':>12}{'平均配置 (B)':>14}{'最大配置 (B)':>14}")
+    for name, before, after in rows:
+        old = measure(before, positions, args.repeat)
+        new = measure(after, positions, args.repeat)
+        for label, (seconds, mean_bytes, max_bytes) in (("board 副本", old), ("make/unmake", new)):
+            print(f"{name:<12}{label:<12}{seconds * 1e6:>12.1f}{mean_bytes:>14,.0f}{max_bytes:>14,}")
+        print(f"{'':<12}{'倍數':<12}{old[0] / new[0]:>11.2f}x{old[1] / max(new[1], 1):>13.2f}x"
+              f"{old[2] / max(new[2], 1):>13.2f}x")
+
+
+if __name__ == "__main__":
+    main()
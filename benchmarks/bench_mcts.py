@@ -0,0 +1,117 @@
+# benchmarks/bench_mcts.py
+"""
+MCTSStrategy 的強度與延遲取捨：
+1. 不同迭代預算下，每步延遲、每秒模擬場數，以及對 MediumStrategy 的勝 / 和 / 敗
+2. 子樹重用：同樣的迭代預算，重用與不重用時整局的總節點數與耗時
+3. root parallel：同樣的時間預算，1 個與多個 process 時根節點的總拜訪次數
+
+執行方式（在專案根目錄）：
+    python -m benchmarks.bench_mcts
+    python -m benchmarks.bench_mcts --size 5 --k 4 --games 10
+"""
+import argparse
+import time
+from typing import List, Optional, Tuple
+
+from environment import TicTacToeEnvironment
+from players import AIStrategy, MCTSStrategy, MediumStrategy
+
+
+def play(mcts: MCTSStrategy, opponent: AIStrategy, mcts_symbol: str, size: int, k: int,
+         first: str) -> Tuple[Optional[str], float, int, int]:
+    """打一局，回傳 (勝方, MCTS 思考總秒數, MCTS 走了幾步, 模擬總場數)。"""
+    env = TicTacToeEnvironment(size, k)
+    env.current_player = first
+    thinking, moves, playouts = 0.0, 0, 0
+    while not env.done:
+        if env.current_player == mcts_symbol:
+            start = time.perf_counter()
+            action = mcts.choose_action(env)
+            thinking += time.perf_counter() - start
+            moves += 1
+            playouts += mcts.playouts
+        else:
+            action = opponent.choose_action(env)
+        env.step(action)
+    return env.winner, thinking, moves, playouts
+
+
+def bench_budget(budgets: List[int], games: int, size: int, k: int, seed: int) -> None:
+    print(f"迭代預算 vs 強度（{size}x{size} 連 {k}，對 MediumStrategy 各 {games} 局，輪流先手）")
+    print(f"{'迭代':>8}{'每步 ms':>10}{'模擬 / 秒':>12}{'勝':>6}{'和':>6}{'敗':>6}")
+    for budget in budgets:
+        win = draw = loss = 0
+        thinking, moves, playouts = 0.0, 0, 0
+        for game in range(games):
+            symbol = 'X' if game % 2 == 0 else 'O'
+            mcts = MCTSStrategy(symbol, time_limit=None, iterations=budget, seed=seed + game)
+            opponent = MediumStrategy('O' if symbol == 'X' else 'X')
+            winner, t, n, p = play(mcts, opponent, symbol, size, k, 'XO'[game // 2 % 2])
+            thinking += t
+            moves += n
+            playouts += p
+            if winner == symbol:
+                win += 1
+            elif winner is None:
+                draw += 1
+            else:
+                loss += 1
+        per_move = thinking / max(moves, 1) * 1000
+        rate = playouts / thinking if thinking > 0 else 0.0
+        print(f"{budget:>8}{per_move:>10.2f}{rate:>12,.0f}{win:>6}{draw:>6}{loss:>6}")
+    print()
+
+
+def bench_reuse(budget: int, size: int, k: int, seed: int) -> None:
+    print(f"子樹重用（{size}x{size} 連 {k}，每步 {budget} 次迭代，MCTS 自己對下一局）")
+    print(f"{'模式':<10}{'新建節點':>12}{'耗時 (s)':>10}")
+    for reuse in (False, True):
+        strategies = {s: MCTSStrategy(s, time_limit=None, iterations=budget,
+                                      reuse_tree=reuse, seed=seed) for s in 'XO'}
+        env = TicTacToeEnvironment(size, k)
+        nodes = 0
+        start = time.perf_counter()
+        while not env.done:
+            strategy = strategies[env.current_player]
+            env.step(strategy.choose_action(env))
+            nodes += strategy.nodes
+        elapsed = time.perf_counter() - start
+        print(f"{'重用' if reuse else '不重用':<10}{nodes:>12,}{elapsed:>10.2f}")
+    print()
+
+
+def bench_parallel(workers: List[int], time_limit: float, size: int, k: int) -> None:
+    print(f"root parallel（{size}x{size} 連 {k} 空棋盤，每步 {time_limit} 秒）")
+    print(f"{'process':>8}{'根節點拜訪':>14}{'延遲 (s)':>10}")
+    env = TicTacToeEnvironment(size, k)
+    for n in workers:
+        strategy = MCTSStrategy('X', time_limit=time_limit, workers=n, reuse_tree=False, seed=0)
+        try:
+            strategy.choose_action(env)  # 第一次會建立 process pool，不列入計時
+            start = time.perf_counter()
+            strategy.choose_action(env)
+            elapsed = time.perf_counter() - start
+            visits = sum(strategy.last_visits.values())
+        finally:
+            strategy.close()
+        print(f"{n:>8}{visits:>14,}{elapsed:>10.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MCTSStrategy 強度 / 延遲 / 平行")
+    parser.add_argument("--size", type=int, default=3)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--budgets", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--time-limit", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    bench_budget(args.budgets, args.games, args.size, args.k, args.seed)
+    bench_reuse(args.budgets[-1], args.size, args.k, args.seed)
+    bench_parallel(args.workers, args.time_limit, args.size, args.k)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# benchmarks/bench_minimax.py
+"""
+MinimaxStrategy 的思考成本：
+1. 第一步（空棋盤）的延遲：不使用置換表 / 冷啟動（先清空）/ 暖啟動
+   （同一張表再算一次，含另一個符號的實例）
+2. 每次決策拜訪的節點數：minimax 與 alphabeta 兩種搜尋模式（皆不使用置換表）
+
+執行方式（在專案根目錄）：
+    python -m benchmarks.bench_minimax
+"""
+import argparse
+import random
+import time
+from typing import Dict, List
+
+from environment import TicTacToeEnvironment
+from players import MinimaxStrategy
+
+SEARCH_MODES = ("minimax", "alphabeta")
+
+
+def _first_move_time(strategy: MinimaxStrategy, first_player: str) -> float:
+    env = TicTacToeEnvironment()
+    env.current_player = first_player
+    start = time.perf_counter()
+    strategy.choose_action(env)
+    return time.perf_counter() - start
+
+
+def bench_latency(search: str, repeat: int) -> None:
+    table = MinimaxStrategy.table if search == "minimax" else MinimaxStrategy.alphabeta_table
+
+    no_table = _first_move_time(MinimaxStrategy('X', use_table=False, search=search), 'X')
+
+    table.clear()
+    cold = _first_move_time(MinimaxStrategy('X', search=search), 'X')
+    cold_stats = table.stats()
+
+    warm_x = min(_first_move_time(MinimaxStrategy('X', search=search), 'X')
+                 for _ in range(repeat))
+    # O 的實例共用同一張表
+    warm_o = min(_first_move_time(MinimaxStrategy('O', search=search), 'O')
+                 for _ in range(repeat))
+    warm_stats = table.stats()
+
+    print(f"[{search}] 第一步延遲")
+    print(f"{'情境':<20}{'延遲 (ms)':>12}")
+    print(f"{'無置換表':<20}{no_table * 1000:>12.2f}")
+    print(f"{'冷啟動':<20}{cold * 1000:>12.2f}")
+    print(f"{'暖啟動 (X)':<20}{warm_x * 1000:>12.3f}")
+    print(f"{'暖啟動 (O)':<20}{warm_o * 1000:>12.3f}")
+    print(f"冷啟動後：表大小 {cold_stats['size']}，hits {cold_stats['hits']}，misses {cold_stats['misses']}")
+    print(f"暖啟動後：hits {warm_stats['hits']}，misses {warm_stats['misses']}，"
+          f"命中率 {warm_stats['hit_rate']:.1%}")
+    print()
+
+
+def _sample_positions(games: int, seed: int) -> List[TicTacToeEnvironment]:
+    """隨機對局中每個還沒結束的盤面（空棋盤除外）。"""
+    rng = random.Random(seed)
+    positions = []
+    for _ in range(games):
+        env = TicTacToeEnvironment()
+        env.current_player = rng.choice(['X', 'O'])
+        env.step(rng.choice(env.available_actions()))
+        while not env.done:
+            snapshot = TicTacToeEnvironment()
+            snapshot.set_position(env.x_bits, env.o_bits, env.current_player)
+            positions.append(snapshot)
+            env.step(rng.choice(env.available_actions()))
+    return positions
+
+
+def bench_nodes(games: int, seed: int) -> None:
+    positions = _sample_positions(games, seed)
+    empty = TicTacToeEnvironment()
+
+    rows: Dict[str, List[int]] = {}
+    for search in SEARCH_MODES:
+        strategy = MinimaxStrategy('X', use_table=False, search=search)
+        strategy.choose_action(empty)
+        first = strategy.nodes
+        total = 0
+        for env in positions:
+            strategy = MinimaxStrategy(env.current_player, use_table=False, search=search)
+            strategy.choose_action(env)
+            total += strategy.nodes
+        rows[search] = [first, total // max(len(positions), 1)]
+
+    print(f"每次決策拜訪的節點數（不使用置換表，隨機盤面 {len(positions)} 個）")
+    print(f"{'模式':<12}{'空棋盤':>12}{'隨機盤面平均':>16}")
+    for search, (first, avg) in rows.items():
+        print(f"{search:<12}{first:>12,}{avg:>16,}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MinimaxStrategy 延遲與節點數")
+    parser.add_argument("--repeat", type=int, default=5, help="暖啟動量測次數")
+    parser.add_argument("--games", type=int, default=20, help="節點數量測用的隨機對局數")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for search in SEARCH_MODES:
+        bench_latency(search, args.repeat)
+    bench_nodes(args.games, args.seed)
+
+
+if __name__ == "__main__":
+    main()
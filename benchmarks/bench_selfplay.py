@@ -0,0 +1,127 @@
+# benchmarks/bench_selfplay.py
+"""
+井字棋 self-play 的吞吐量（局 / 秒）：
+1. 只推進環境（隨機落子）：TicTacToeEnvironment 一次一盤 vs VecTicTacToeEnv 一次 N 盤
+2. Q-learning 訓練：序列版（一次一盤 TicTacToeEnvironment，Q 表是 Python list，
+   演算法和 train_selfplay 相同）vs tictactoe_vec.train_selfplay，不同的同時盤數
+最後用各自訓練出的表和 MinimaxStrategy / MediumStrategy 對打，確認兩者學到的東西相當。
+
+執行方式（在專案根目錄，需要 numpy）：
+    python -m benchmarks.bench_selfplay
+    python -m benchmarks.bench_selfplay --games 100000 --envs 256 1024 4096
+"""
+import argparse
+import random
+import time
+from typing import List
+
+import numpy as np
+
+from environment import TicTacToeEnvironment
+from tictactoe_table import NUM_CODES, encode
+from tictactoe_vec import VecTicTacToeEnv, epsilon_schedule, evaluate, train_selfplay
+
+
+def random_games_serial(games: int, seed: int = 0) -> float:
+    """一次一盤隨機對局，回傳局 / 秒。"""
+    rng = random.Random(seed)
+    env = TicTacToeEnvironment()
+    start = time.perf_counter()
+    for _ in range(games):
+        env.reset()
+        while not env.done:
+            env.step(rng.choice(env.available_actions()))
+    return games / (time.perf_counter() - start)
+
+
+def random_games_vectorized(games: int, n_envs: int, seed: int = 0) -> float:
+    """n_envs 盤一起隨機對局，打滿 games 局，回傳局 / 秒。"""
+    rng = np.random.default_rng(seed)
+    env = VecTicTacToeEnv(n_envs)
+    rounds = max(1, games // n_envs)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        env.reset()
+        while not env.done.all():
+            idx = np.flatnonzero(~env.done)
+            legal = env.legal_mask(idx)
+            env.step(np.argmax(rng.random(legal.shape) * legal, axis=1), idx)
+    return rounds * n_envs / (time.perf_counter() - start)
+
+
+def train_serial(games: int, seed: int = 0, learning_rate: float = 0.5,
+                 discount: float = 0.95) -> List[List[float]]:
+    """和 train_selfplay 相同的 negamax Q-learning，但一次只推進一盤。"""
+    rng = random.Random(seed)
+    q = [[0.0] * 9 for _ in range(NUM_CODES)]
+    epsilon = epsilon_schedule(games).tolist()
+    env = TicTacToeEnvironment()
+    for game in range(games):
+        env.reset()
+        env.current_player = 'X' if game % 2 == 0 else 'O'
+        eps = epsilon[game]
+        while not env.done:
+            state = encode(env.board, env.current_player)
+            actions = env.available_actions()
+            if rng.random() < eps:
+                action = rng.choice(actions)
+            else:
+                row = q[state]
+                action = max(actions, key=row.__getitem__)
+            env.step(action)
+            if env.winner is not None:
+                target = 1.0
+            elif env.done:
+                target = 0.0
+            else:
+                row = q[encode(env.board, env.current_player)]
+                target = -discount * max(row[a] for a in env.available_actions())
+            q[state][action] += learning_rate * (target - q[state][action])
+    return q
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="井字棋 self-play Q-learning 吞吐量")
+    parser.add_argument("--games", type=int, default=50_000, help="向量化版訓練局數")
+    parser.add_argument("--serial-games", type=int, default=10_000, help="序列版訓練局數")
+    parser.add_argument("--envs", type=int, nargs="+", default=[64, 256, 1024, 4096, 16384])
+    parser.add_argument("--eval-games", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print("只推進環境（隨機落子）")
+    print(f"{'版本':<22}{'局 / 秒':>12}{'倍數':>8}")
+    serial_rate = random_games_serial(args.serial_games, args.seed)
+    print(f"{'TicTacToeEnvironment':<22}{serial_rate:>12,.0f}{1:>7.1f}x")
+    for n_envs in args.envs:
+        rate = random_games_vectorized(args.games, n_envs, args.seed)
+        print(f"{f'VecTicTacToeEnv ({n_envs} 盤)':<22}{rate:>12,.0f}{rate / serial_rate:>7.1f}x")
+
+    print("\nself-play Q-learning 訓練")
+    print(f"{'版本':<22}{'局數':>10}{'耗時 (s)':>10}{'局 / 秒':>12}{'倍數':>8}")
+    start = time.perf_counter()
+    train_serial(args.serial_games, args.seed)
+    serial_rate = args.serial_games / (time.perf_counter() - start)
+    print(f"{'序列 (1 盤)':<22}{args.serial_games:>10,}{args.serial_games / serial_rate:>10.2f}"
+          f"{serial_rate:>12,.0f}{1:>7.1f}x")
+
+    q = None
+    for n_envs in args.envs:
+        start = time.perf_counter()
+        q, _ = train_selfplay(args.games, n_envs, seed=args.seed)
+        elapsed = time.perf_counter() - start
+        rate = args.games / elapsed
+        print(f"{f'向量化 ({n_envs} 盤)':<22}{args.games:>10,}{elapsed:>10.2f}"
+              f"{rate:>12,.0f}{rate / serial_rate:>7.1f}x")
+
+    if args.eval_games > 0 and q is not None:
+        # 序列版用同樣的局數訓練，比較學到的策略
+        serial_q = np.array(train_serial(args.games, args.seed), dtype=np.float32)
+        print(f"\n訓練 {args.games:,} 局後對 MinimaxStrategy / MediumStrategy 各 {args.eval_games} 局（勝, 和, 敗）")
+        for label, table in (("序列", serial_q), (f"向量化 ({args.envs[-1]} 盤)", q)):
+            print(f"{label:<22}minimax {evaluate(table, args.eval_games, 'minimax')}  "
+                  f"medium {evaluate(table, args.eval_games, 'medium')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# benchmarks/bench_speculation.py
+"""
+AI 對人類的預先計算（SpeculativeSearch）：模擬人類每一步思考 think 秒，
+比較人類下完之後要等 AI 多久才回應：
+- 不預先計算：人類下完才開始搜尋
+- 預先計算：人類思考時背景先算好每一種下法的回應，命中就直接查表；
+  沒算到就停掉預先計算再搜尋
+人類用 MediumStrategy 下（會贏就贏、會輸就擋），AI 是 O。
+
+執行方式（在專案根目錄）：
+    python -m benchmarks.bench_speculation
+    python -m benchmarks.bench_speculation --games 20 --think 0.05 0.5 2 --mcts-time 0.5
+"""
+import argparse
+import random
+import threading
+import time
+from typing import Callable, List, Tuple
+
+from environment import TicTacToeEnvironment
+from instrumentation import percentile
+from players import AIPlayer, AIStrategy, MCTSStrategy, MediumStrategy, MinimaxStrategy
+from speculation import SpeculationStats, SpeculativeSearch
+
+
+def play(factory: Callable[[], AIStrategy], games: int, think: float, speculate: bool,
+         seed: int = 0) -> Tuple[List[float], SpeculationStats]:
+    """下 games 局，回傳 (每次人類下完到 AI 回應的秒數, 預先計算的統計)。"""
+    rng = random.Random(seed)
+    random.seed(seed)
+    ai = AIPlayer('O', factory())
+    human = MediumStrategy('X')
+    stats = SpeculationStats()
+    waits: List[float] = []
+    for _ in range(games):
+        env = TicTacToeEnvironment()
+        env.current_player = rng.choice('XO')
+        thread = None
+        while not env.done:
+            if env.current_player == 'O':
+                env.step(ai.select_action(env))
+                continue
+            search = None
+            if speculate:
+                if thread is not None:
+                    thread.join()
+                search = SpeculativeSearch(ai, env, stats)
+                thread = threading.Thread(target=search.run, daemon=True)
+                thread.start()
+            time.sleep(think)
+            env.step(human.choose_action(env))
+            if search is not None:
+                search.stop()
+            if env.done:
+                break
+
+            start = time.perf_counter()
+            reply = search.lookup(env) if search is not None else None
+            if reply is None:
+                if thread is not None:
+                    thread.join()
+                action = ai.select_action(env)
+            else:
+                action = reply[0]
+            waits.append(time.perf_counter() - start)
+            env.step(action)
+        if thread is not None:
+            thread.join()
+    return waits, stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AI 對人類的預先計算：命中率與等待時間")
+    parser.add_argument("--games", type=int, default=5, help="每種設定下幾局")
+    parser.add_argument("--think", type=float, nargs="+", default=[0.02, 0.1, 0.4],
+                        help="人類每一步思考幾秒")
+    parser.add_argument("--mcts-time", type=float, default=0.05, help="MCTS 每步的時間預算（秒）")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rows = [
+        ("minimax", lambda: MinimaxStrategy('O', use_table=False)),
+        ("mcts", lambda: MCTSStrategy('O', time_limit=args.mcts_time)),
+    ]
+    print(f"每種設定 {args.games} 局；等待 = 人類下完到 AI 回應（ms）")
+    print(f"{'策略':<10}{'人類思考 (s)':>14}{'命中率':>8}{'等待 p50':>10}{'等待 p95':>10}"
+          f"{'不預先 p50':>12}{'不預先 p95':>12}")
+    for name, factory in rows:
+        for think in args.think:
+            base, _ = play(factory, args.games, think, speculate=False, seed=args.seed)
+            waits, stats = play(factory, args.games, think, speculate=True, seed=args.seed)
+            base.sort()
+            waits.sort()
+            print(f"{name:<10}{think:>14.2f}{stats.hit_rate:>8.0%}"
+                  f"{percentile(waits, 50) * 1000:>10.2f}{percentile(waits, 95) * 1000:>10.2f}"
+                  f"{percentile(base, 50) * 1000:>12.2f}{percentile(base, 95) * 1000:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# benchmarks/bench_startup.py
+"""
+Cold start-up time of the FrozenLake modules, each measured in a fresh interpreter
+(what a batch job or a pool worker pays before doing any work):
+- import frozen_lake (plotting is lazy, so no matplotlib)
+- import frozen_lake + frozen_lake_plot's pyplot (what the first plot costs)
+- the heavy dependencies on their own, for reference
+
+Usage (from the project root):
+    python -m benchmarks.bench_startup
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+CASES = (
+    ("python (empty)", "pass"),
+    ("import numpy", "import numpy"),
+    ("import gymnasium", "import gymnasium"),
+    ("import matplotlib.pyplot", "import matplotlib; matplotlib.use('Agg'); import matplotlib.pyplot"),
+    ("import frozen_lake", "import frozen_lake"),
+    ("frozen_lake + first plot", "import frozen_lake, frozen_lake_plot; frozen_lake_plot._pyplot()"),
+)
+
+
+def startup_ms(code, repeat):
+    """Best-of-``repeat`` wall time of ``python -c code``, in milliseconds."""
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, env=env)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FrozenLake module start-up time in a fresh interpreter")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'case':<28}{'ms':>10}")
+    for name, code in CASES:
+        print(f"{name:<28}{startup_ms(code, args.repeat):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# benchmarks/bench_strategies.py
+"""
+各 AI 策略每一步的延遲分布（instrumentation.py）：
+1. 每個策略和隨機對手打 N 局，依棋盤上的棋子數列出耗時 p50 / p95 / p99、
+   平均節點數與 cache 命中率；--json 另外寫出完整結果（含直方圖）
+2. 量測本身的成本：同一批盤面分別用原本的策略、關閉的 proxy、開啟的 proxy 決策
+
+執行方式（在專案根目錄）：
+    python -m benchmarks.bench_strategies
+    python -m benchmarks.bench_strategies --games 200 --json strategies.json
+"""
+import argparse
+import random
+import time
+from typing import Callable, List, Tuple
+
+from environment import TicTacToeEnvironment
+from instrumentation import InstrumentedStrategy, Metrics
+from players import (
+    AIStrategy,
+    HeuristicSearchStrategy,
+    MCTSStrategy,
+    MediumStrategy,
+    MinimaxStrategy,
+    RandomStrategy,
+    TableStrategy,
+)
+from tictactoe_table import table_exists
+
+# (名稱, 棋盤大小, k, 建立策略的函式)
+StrategySpec = Tuple[str, int, int, Callable[[str], AIStrategy]]
+
+
+def _strategies(large_games: bool) -> List[StrategySpec]:
+    specs: List[StrategySpec] = [
+        ("easy", 3, 3, lambda symbol: RandomStrategy()),
+        ("medium", 3, 3, MediumStrategy),
+        ("minimax", 3, 3, MinimaxStrategy),
+        ("mcts", 3, 3, lambda symbol: MCTSStrategy(symbol, time_limit=None, iterations=500)),
+    ]
+    if table_exists():
+        specs.append(("table", 3, 3, TableStrategy))
+    if large_games:
+        specs.append(("heuristic", 5, 4, lambda symbol: HeuristicSearchStrategy(symbol, time_limit=0.2)))
+    return specs
+
+
+def play_against_random(strategy: AIStrategy, symbol: str, size: int, k: int,
+                        rng: random.Random) -> None:
+    """strategy 執 symbol，對手隨機下，打完一局。"""
+    env = TicTacToeEnvironment(size, k)
+    env.current_player = rng.choice(['X', 'O'])
+    while not env.done:
+        if env.current_player == symbol:
+            action = strategy.choose_action(env)
+        else:
+            action = rng.choice(env.available_actions())
+        env.step(action)
+
+
+def bench_distribution(games: int, large_games: int, seed: int) -> Metrics:
+    metrics = Metrics()
+    for name, size, k, factory in _strategies(large_games > 0):
+        rng = random.Random(seed)
+        n = games if size == 3 else large_games
+        for game in range(n):
+            symbol = 'X' if game % 2 == 0 else 'O'
+            play_against_random(InstrumentedStrategy(factory(symbol), metrics, name),
+                                symbol, size, k, rng)
+    print("每一步的耗時（依棋盤上的棋子數）")
+    print(metrics.format_table(by_fill=True))
+    print()
+    print("不分棋子數")
+    print(metrics.format_table())
+    print()
+    return metrics
+
+
+def _positions(count: int, seed: int) -> List[TicTacToeEnvironment]:
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        env = TicTacToeEnvironment()
+        for _ in range(rng.randrange(0, 6)):
+            env.step(rng.choice(env.available_actions()))
+        if not env.done:
+            positions.append(env)
+    return positions
+
+
+def bench_overhead(decisions: int, repeat: int, seed: int) -> None:
+    """MediumStrategy 很快，proxy 的額外成本在它身上最明顯。"""
+    positions = _positions(decisions, seed)
+    inner = MediumStrategy('X')
+    variants = [
+        ("不包 proxy", inner),
+        ("proxy（關閉）", InstrumentedStrategy(inner, Metrics(enabled=False))),
+        ("proxy（開啟）", InstrumentedStrategy(inner, Metrics())),
+    ]
+    print(f"量測成本（MediumStrategy，{decisions} 個盤面，取 {repeat} 次最快）")
+    print(f"{'版本':<16}{'每步 (µs)':>12}{'額外 (µs)':>12}")
+    base = None
+    for label, strategy in variants:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for env in positions:
+                strategy.choose_action(env)
+            best = min(best, time.perf_counter() - start)
+        per_move = best / len(positions) * 1e6
+        base = per_move if base is None else base
+        print(f"{label:<16}{per_move:>12.3f}{per_move - base:>12.3f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AI 策略每一步的延遲分布")
+    parser.add_argument("--games", type=int, default=100, help="3x3 策略每個打幾局")
+    parser.add_argument("--large-games", type=int, default=4, help="5x5 連 4 的 heuristic 打幾局（0 = 略過）")
+    parser.add_argument("--decisions", type=int, default=20000, help="量測成本用的盤面數")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="把延遲分布寫成 JSON 檔")
+    args = parser.parse_args()
+
+    metrics = bench_distribution(args.games, args.large_games, args.seed)
+    if args.json:
+        metrics.dump(args.json)
+    bench_overhead(args.decisions, args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
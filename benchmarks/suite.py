@@ -0,0 +1,316 @@
+# benchmarks/suite.py
+"""
+整體效能基準（benchmark suite），可存成 JSON 基準檔，之後比對有沒有退步：
+- environment：TicTacToeEnvironment 的 reset / step / available_actions
+- strategy：RandomStrategy、MediumStrategy、MinimaxStrategy、MCTSStrategy 在空棋盤、
+  中盤、接近終局三種盤面的 choose_action 延遲
+  （Minimax 不使用置換表、MCTS 固定 500 次迭代且不重用子樹，
+  量的是搜尋本身，不會因為表 / 樹已經暖好而失真）
+- frozen_lake：訓練每秒幾個 episode（序列 fast 模擬器 / 向量化）、貪婪策略評估吞吐量
+  （需要 numpy / gymnasium；沒安裝時這一組會被略過）
+- tictactoe_vec：井字棋向量化 self-play Q-learning 每秒訓練幾局（需要 numpy）
+
+量法和 pytest-benchmark 一樣：先校正每一輪要呼叫幾次，讓一輪至少 min_time 秒，
+再量 rounds 輪，回報每次操作的 min / median / mean / stddev 與每秒次數。
+比對時預設用 min（最不受雜訊影響）：新的值比基準慢超過 threshold 就算退步，結束碼為 1。
+
+執行方式（在專案根目錄）：
+    python -m benchmarks.suite --save baseline.json
+    python -m benchmarks.suite --compare baseline.json --threshold 0.1
+    python -m benchmarks.suite --filter strategy.minimax
+"""
+import argparse
+import atexit
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from environment import TicTacToeEnvironment
+from players import MCTSStrategy, MediumStrategy, MinimaxStrategy, RandomStrategy
+
+# setup() 回傳 (要量的函式, 每呼叫一次等於幾次操作)
+Setup = Callable[[], Tuple[Callable[[], object], int]]
+
+# name -> (group, unit, setup)
+BENCHMARKS: Dict[str, Tuple[str, str, Setup]] = {}
+
+# 固定盤面（依序落子，X 先手）
+POSITIONS: Dict[str, List[int]] = {
+    "empty": [],
+    "midgame": [4, 0, 8],                  # 3 子，輪到 O
+    "near_terminal": [0, 4, 8, 2, 6, 3, 5],  # 7 子，輪到 O，剩 1 / 7 兩格
+}
+
+
+def benchmark(name: str, group: str, unit: str = "op") -> Callable[[Setup], Setup]:
+    """註冊一個 benchmark；被裝飾的函式負責準備資料並回傳要量的函式。"""
+    def register(setup: Setup) -> Setup:
+        BENCHMARKS[name] = (group, unit, setup)
+        return setup
+    return register
+
+
+def _position(moves: List[int]) -> TicTacToeEnvironment:
+    env = TicTacToeEnvironment()
+    env.current_player = 'X'
+    for action in moves:
+        env.step(action)
+    return env
+
+
+# ========= environment =========
+
+@benchmark("environment.reset", "environment")
+def _env_reset():
+    env = TicTacToeEnvironment()
+    return env.reset, 1
+
+
+@benchmark("environment.step", "environment", unit="step")
+def _env_step():
+    # 事先產生好的隨機對局，量的只有 reset 之後逐步 step
+    rng = random.Random(0)
+    games = []
+    for _ in range(200):
+        env = TicTacToeEnvironment()
+        moves = []
+        while not env.done:
+            action = rng.choice(env.available_actions())
+            env.step(action)
+            moves.append(action)
+        games.append(moves)
+    steps = sum(len(moves) for moves in games)
+    env = TicTacToeEnvironment()
+
+    def play():
+        for moves in games:
+            env.reset()
+            for action in moves:
+                env.step(action)
+    return play, steps
+
+
+@benchmark("environment.available_actions", "environment")
+def _env_available_actions():
+    env = _position(POSITIONS["midgame"])
+    return env.available_actions, 1
+
+
+# ========= strategy =========
+
+def _register_strategy(label: str, factory: Callable[[str], object]) -> None:
+    for position, moves in POSITIONS.items():
+        def setup(factory=factory, moves=moves):
+            env = _position(moves)
+            strategy = factory(env.current_player)
+            return (lambda: strategy.choose_action(env)), 1
+        benchmark(f"strategy.{label}.{position}", "strategy", unit="move")(setup)
+
+
+_register_strategy("random", lambda symbol: RandomStrategy())
+_register_strategy("medium", MediumStrategy)
+_register_strategy("minimax", lambda symbol: MinimaxStrategy(symbol, use_table=False))
+_register_strategy("mcts", lambda symbol: MCTSStrategy(symbol, time_limit=None, iterations=500,
+                                                       reuse_tree=False, seed=0))
+
+
+# ========= frozen_lake =========
+
+FROZEN_LAKE_EPISODES = 500
+EVAL_EPISODES = 20000
+
+
+def _frozen_lake_model():
+    from frozen_lake_model import TransitionModel
+    return TransitionModel.from_gym("8x8", is_slippery=True)
+
+
+@benchmark("frozen_lake.train.serial_fast", "frozen_lake", unit="episode")
+def _fl_train_serial():
+    import frozen_lake
+    tmp = tempfile.mkdtemp()
+    atexit.register(shutil.rmtree, tmp, ignore_errors=True)
+    path = os.path.join(tmp, "q.npy")
+
+    def train():
+        with contextlib.redirect_stdout(io.StringIO()):
+            frozen_lake.run(FROZEN_LAKE_EPISODES, fast=True, seed=0, qtable_path=path, plot=False)
+    return train, FROZEN_LAKE_EPISODES
+
+
+@benchmark("frozen_lake.train.vectorized", "frozen_lake", unit="episode")
+def _fl_train_vectorized():
+    from frozen_lake_vec import train_vectorized
+    model = _frozen_lake_model()
+    episodes = FROZEN_LAKE_EPISODES * 8
+    return (lambda: train_vectorized(episodes, n_envs=64, seed=0, model=model)), episodes
+
+
+@benchmark("frozen_lake.evaluate", "frozen_lake", unit="episode")
+def _fl_evaluate():
+    from frozen_lake_metrics import evaluate_policy
+    from frozen_lake_solver import value_iteration
+    model = _frozen_lake_model()
+    q = value_iteration(model)[0]
+    return (lambda: evaluate_policy(q, EVAL_EPISODES, model=model, seed=0)), EVAL_EPISODES
+
+
+# ========= tictactoe_vec =========
+
+SELFPLAY_GAMES = 20000
+
+
+@benchmark("tictactoe_vec.train", "tictactoe_vec", unit="game")
+def _ttt_train_selfplay():
+    from tictactoe_vec import train_selfplay
+    return (lambda: train_selfplay(SELFPLAY_GAMES, n_envs=4096, seed=0)), SELFPLAY_GAMES
+
+
+# ========= 量測 =========
+
+def measure(fn: Callable[[], object], ops: int, rounds: int = 5,
+            min_time: float = 0.05) -> Dict[str, float]:
+    """
+    先校正每輪的呼叫次數（一輪至少 min_time 秒），再量 rounds 輪。
+    回傳每次操作的秒數統計與每秒操作數。
+    """
+    fn()  # 暖身（import、快取、lazy 初始化）
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    per_op = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        per_op.append((time.perf_counter() - start) / (loops * ops))
+    median = statistics.median(per_op)
+    return {
+        "min": min(per_op),
+        "median": median,
+        "mean": statistics.fmean(per_op),
+        "stddev": statistics.stdev(per_op) if len(per_op) > 1 else 0.0,
+        "ops_per_sec": 1 / median if median > 0 else 0.0,
+        "rounds": rounds,
+        "loops": loops,
+    }
+
+
+def run_suite(pattern: Optional[str] = None, rounds: int = 5,
+              min_time: float = 0.05) -> Dict[str, dict]:
+    results: Dict[str, dict] = {}
+    for name, (group, unit, setup) in BENCHMARKS.items():
+        if pattern and pattern not in name:
+            continue
+        try:
+            fn, ops = setup()
+        except ImportError as exc:
+            print(f"略過 {name}：{exc}", file=sys.stderr)
+            continue
+        stats = measure(fn, ops, rounds, min_time)
+        stats.update(group=group, unit=unit)
+        results[name] = stats
+        print(f"{name:<42}{_format_time(stats['median']):>12}/{unit:<8}"
+              f"{stats['ops_per_sec']:>16,.0f} {unit}/s")
+    return results
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+# ========= 基準檔 =========
+
+def save(path: str, results: Dict[str, dict]) -> None:
+    data = {
+        "created": time.time(),
+        "machine": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+        },
+        "benchmarks": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def compare(baseline: Dict[str, dict], results: Dict[str, dict],
+            threshold: float, stat: str = "min") -> List[Tuple[str, float, float, float]]:
+    """
+    印出每一項和基準的 stat（min / median / mean）比較，回傳退步的項目
+    [(name, 基準秒數, 新秒數, 變化比例)]。只出現在其中一邊的項目不比。
+    """
+    regressions = []
+    print(f"\n{'benchmark':<42}{'基準 ' + stat:>14}{'目前 ' + stat:>14}{'變化':>10}")
+    for name, stats in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        change = stats[stat] / old[stat] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  ⚠ 退步"
+            regressions.append((name, old[stat], stats[stat], change))
+        elif change < -threshold:
+            flag = "  ✓ 變快"
+        print(f"{name:<42}{_format_time(old[stat]):>14}{_format_time(stats[stat]):>14}"
+              f"{change:>+10.1%}{flag}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="環境、AI 策略與 FrozenLake 的效能基準")
+    parser.add_argument("--filter", help="只跑名稱包含這個字串的項目")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.05, help="每一輪至少幾秒")
+    parser.add_argument("--save", metavar="PATH", help="把結果存成 JSON 基準檔")
+    parser.add_argument("--compare", metavar="PATH", help="和這個基準檔比對")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="變慢超過這個比例就算退步（預設 0.10 = 10%%）")
+    parser.add_argument("--stat", choices=["min", "median", "mean"], default="min",
+                        help="比對用的統計量")
+    parser.add_argument("--list", action="store_true", help="只列出所有項目")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, (group, unit, _) in BENCHMARKS.items():
+            print(f"{name:<42}{group:<14}{unit}")
+        return
+
+    results = run_suite(args.filter, args.rounds, args.min_time)
+    if args.save:
+        save(args.save, results)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["benchmarks"]
+        regressions = compare(baseline, results, args.threshold, args.stat)
+        if regressions:
+            print(f"\n{len(regressions)} 項退步超過 {args.threshold:.0%}")
+            sys.exit(1)
+        print(f"\n沒有退步超過 {args.threshold:.0%} 的項目")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,132 @@
 # environment.py
-from typing import List, Optional
+import random
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+# Zobrist hash 的位數；8 種對稱的 hash 各佔一段打包在同一個整數裡
+HASH_BITS = 64
+HASH_MASK = (1 << HASH_BITS) - 1
+# 每條連線的棋子數佔幾個 bit（最大 19x19，數量不會超過 255）
+COUNT_BITS = 8
+COUNT_MASK = (1 << COUNT_BITS) - 1
+
+
+def square_symmetries(n: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    回傳 n x n 棋盤的 8 種對稱（4 種旋轉 x 是否左右翻轉）。
+    每一種是一個長度 n*n 的 tuple：perm[i] = 轉換後第 i 格對應原本的哪一格。
+    第 0 個永遠是恆等轉換。
+    """
+    def rotate(perm):
+        # 順時針轉 90 度：新的 (r, c) 來自原本的 (n-1-c, r)
+        return tuple(perm[(n - 1 - c) * n + r] for r in range(n) for c in range(n))
+
+    def mirror(perm):
+        return tuple(perm[r * n + (n - 1 - c)] for r in range(n) for c in range(n))
+
+    perms = []
+    perm = tuple(range(n * n))
+    for _ in range(4):
+        perms.append(perm)
+        perms.append(mirror(perm))
+        perm = rotate(perm)
+    return tuple(perms)
+
+
+class BoardGeometry:
+    """
+    size x size 棋盤、連成 k 個獲勝時的所有連線資訊（只計算一次，見 get_geometry）：
+    - lines：所有長度 k 的連線（橫 / 直 / 兩種斜線），每條是格子 index 的 tuple
+    - line_masks：每條連線對應的 bitmask（第 i 格 = 第 i 個 bit）
+    - cell_lines / cell_line_masks：每一格「會經過」的連線，落子後只需要檢查這幾條
+    - cell_line_ids：每一格經過的連線在 lines 裡的編號
+    - cell_count_steps：連線計數打包成一個整數（每條連線 8 bit），
+      在第 i 格落子 = 計數加上 cell_count_steps[i]
+    - full_mask：整個棋盤都有子時的 bitmask
+    - center：正中間（偶數邊長時取左上那格）
+    - symmetries：8 種對稱的 index 排列
+    - zobrist：每一格、每個玩家（0 = X、1 = O）的 64-bit 亂數；zobrist_side 是「輪到 O」
+    - zobrist_steps：8 種對稱的 hash 打包成一個整數（每種 64 bit），
+      玩家 p 在第 i 格落子 = hash 互斥或 zobrist_steps[p][i]
+    """
+
+    def __init__(self, size: int, k: int) -> None:
+        if size < 1:
+            raise ValueError(f"Board size must be positive: {size}")
+        if not 1 <= k <= size:
+            raise ValueError(f"k must be between 1 and {size}: {k}")
+        self.size = size
+        self.k = k
+        self.n_cells = size * size
+
+        lines = []
+        directions = ((0, 1), (1, 0), (1, 1), (1, -1))  # 橫列、直行、兩種斜線
+        for dr, dc in directions:
+            for r in range(size):
+                for c in range(size):
+                    end_r, end_c = r + dr * (k - 1), c + dc * (k - 1)
+                    if 0 <= end_r < size and 0 <= end_c < size:
+                        lines.append(tuple((r + dr * j) * size + (c + dc * j)
+                                           for j in range(k)))
+        self.lines: Tuple[Tuple[int, ...], ...] = tuple(lines)
+        self.line_masks: Tuple[int, ...] = tuple(
+            sum(1 << i for i in line) for line in self.lines
+        )
+        self.cell_lines: Tuple[Tuple[Tuple[int, ...], ...], ...] = tuple(
+            tuple(line for line in self.lines if i in line) for i in range(self.n_cells)
+        )
+        self.cell_line_masks: Tuple[Tuple[int, ...], ...] = tuple(
+            tuple(mask for mask in self.line_masks if (mask >> i) & 1)
+            for i in range(self.n_cells)
+        )
+        self.cell_line_ids: Tuple[Tuple[int, ...], ...] = tuple(
+            tuple(j for j, line in enumerate(self.lines) if i in line)
+            for i in range(self.n_cells)
+        )
+        self.full_mask: int = (1 << self.n_cells) - 1
+        self.center: int = (size - 1) // 2 * size + (size - 1) // 2
+        self.symmetries: Tuple[Tuple[int, ...], ...] = square_symmetries(size)
+
+        # 固定種子：同一組 (size, k) 在任何 process 裡的 hash 都一樣
+        rng = random.Random(size * 1000 + k)
+        self.zobrist: Tuple[Tuple[int, int], ...] = tuple(
+            (rng.getrandbits(64), rng.getrandbits(64)) for _ in range(self.n_cells)
+        )
+        self.zobrist_side: int = rng.getrandbits(64)
+        # perm[i] = 轉換後第 i 格來自原本哪一格，所以原本第 c 格會到 perm.index(c)
+        inverses = [{c: i for i, c in enumerate(perm)} for perm in self.symmetries]
+        self.zobrist_steps: Tuple[Tuple[int, ...], ...] = tuple(
+            tuple(
+                sum(self.zobrist[inverse[c]][player] << (HASH_BITS * s)
+                    for s, inverse in enumerate(inverses))
+                for c in range(self.n_cells)
+            )
+            for player in (0, 1)
+        )
+        self.hash_shifts: Tuple[int, ...] = tuple(HASH_BITS * s for s in range(len(inverses)))
+        self.cell_count_steps: Tuple[int, ...] = tuple(
+            sum(1 << (COUNT_BITS * j) for j in ids) for ids in self.cell_line_ids
+        )
+
+
+@lru_cache(maxsize=None)
+def get_geometry(size: int = 3, k: int = 3) -> BoardGeometry:
+    """同一組 (size, k) 只建立一次連線表。"""
+    return BoardGeometry(size, k)
+
+
+# ========= 標準 3x3 井字棋（Minimax / 完整解表使用） =========
+
+_GEOMETRY_3X3 = get_geometry(3, 3)
+
+# 8 條連線（橫 / 直 / 斜）
+LINES: Tuple[Tuple[int, ...], ...] = _GEOMETRY_3X3.lines
+LINE_MASKS: Tuple[int, ...] = _GEOMETRY_3X3.line_masks
+CELL_LINES: Tuple[Tuple[Tuple[int, ...], ...], ...] = _GEOMETRY_3X3.cell_lines
+CELL_LINE_MASKS: Tuple[Tuple[int, ...], ...] = _GEOMETRY_3X3.cell_line_masks
+FULL_MASK: int = _GEOMETRY_3X3.full_mask
+SYMMETRIES: Tuple[Tuple[int, ...], ...] = _GEOMETRY_3X3.symmetries
+
 
 class TicTacToeEnvironment:
     """
@@ -8,22 +135,104 @@ class TicTacToeEnvironment:
     - 檢查合法步
     - 判斷勝負 / 平手
     - 管理輪到誰下
+
+    棋盤大小 size 與獲勝所需連線長度 k 可以調整（預設 3x3 連 3），
+    例如 4x4 連 4、5x5 連 4、15x15 連 5（五子棋）。
+
+    內部用 bitboard 表示棋盤：x_bits / o_bits 各是一個 size*size-bit 整數，
+    第 i 個 bit 為 1 代表第 i 格有該玩家的棋子。
+    board / available_actions() / render_text() 保留原本的介面，
+    讓 players.py 與 gui_main.py 不需要修改。
+
+    給 AI 搜尋用的增量狀態（make / unmake 時一起更新，不需要複製棋盤）：
+    - 每條連線上 X / O 各有幾顆子（line_counts()），
+      「下這格能不能贏 / 要不要擋」只要查計數（winning_actions、is_winning_move）
+    - zobrist_hash：盤面加上輪到誰的 64-bit Zobrist hash；
+      canonical_hash 是 8 種對稱中最小的那個，對稱的盤面會得到同一個值
+    直接改 x_bits / o_bits 會讓這些狀態失效，請用 set_position()。
     """
 
-    def __init__(self) -> None:
+    def __init__(self, size: int = 3, k: int = 3) -> None:
+        self.geometry: BoardGeometry = get_geometry(size, k)
+        self.size: int = size
+        self.k: int = k
+        self.n_cells: int = self.geometry.n_cells
         self.reset()
 
     def reset(self) -> None:
         """重設棋盤"""
-        # None 代表空格, 'X' / 'O' 代表玩家
-        self.board: List[Optional[str]] = [None] * 9
+        self.x_bits: int = 0
+        self.o_bits: int = 0
         self.current_player: str = 'X'
         self.winner: Optional[str] = None
         self.done: bool = False
+        self.last_action: Optional[int] = None
+        self._board_cache: Optional[List[Optional[str]]] = None
+        # 連線計數與 Zobrist hash 都打包成整數，落子只要一次加法 / 一次互斥或
+        self._x_counts: int = 0
+        self._o_counts: int = 0
+        # 8 種對稱下的 hash（只含棋子，輪到誰在讀取時才併入）
+        self._hash: int = 0
+        # make() 下過的格子，unmake() 依序還原
+        self._moves: List[int] = []
+
+    def copy(self) -> "TicTacToeEnvironment":
+        """
+        回傳獨立的副本。
+        背景 thread 的 AI 在副本上思考，不會動到 GUI 正在顯示的棋盤。
+        """
+        clone = TicTacToeEnvironment.__new__(TicTacToeEnvironment)
+        clone.__dict__.update(self.__dict__)
+        clone._board_cache = None
+        clone._moves = self._moves.copy()
+        return clone
+
+    def set_position(self, x_bits: int, o_bits: int, current_player: str = 'X') -> None:
+        """
+        直接設定盤面（例如從別的 process 傳來的 bitboard），並重算所有增量狀態。
+        勝負依盤面判斷；make() 的紀錄會清空，之前的步不能 unmake。
+        """
+        self.reset()
+        self.current_player = current_player
+        geometry = self.geometry
+        occupied = x_bits | o_bits
+        while occupied:
+            low = occupied & -occupied
+            cell = low.bit_length() - 1
+            if x_bits & low:
+                self._x_counts += geometry.cell_count_steps[cell]
+                self._hash ^= geometry.zobrist_steps[0][cell]
+            else:
+                self._o_counts += geometry.cell_count_steps[cell]
+                self._hash ^= geometry.zobrist_steps[1][cell]
+            occupied ^= low
+        self.x_bits, self.o_bits = x_bits, o_bits
+        self.winner = self._check_winner()
+        self.done = self.winner is not None or (x_bits | o_bits) == self.geometry.full_mask
+
+    @property
+    def board(self) -> List[Optional[str]]:
+        """
+        相容用的 list 檢視：None 代表空格, 'X' / 'O' 代表玩家。
+        只在棋盤有變動後重建一次；請當作唯讀，要修改請先 copy()。
+        """
+        if self._board_cache is None:
+            x_bits, o_bits = self.x_bits, self.o_bits
+            self._board_cache = [
+                'X' if (x_bits >> i) & 1 else 'O' if (o_bits >> i) & 1 else None
+                for i in range(self.n_cells)
+            ]
+        return self._board_cache
 
     def available_actions(self) -> List[int]:
-        """回傳所有可以下的位置 index (0~8)"""
-        return [i for i, cell in enumerate(self.board) if cell is None]
+        """回傳所有可以下的位置 index (0 ~ size*size-1)"""
+        empty = self.geometry.full_mask & ~(self.x_bits | self.o_bits)
+        actions = []
+        while empty:
+            low = empty & -empty
+            actions.append(low.bit_length() - 1)
+            empty ^= low
+        return actions
 
     def step(self, action: int) -> None:
         """
@@ -32,40 +241,139 @@ class TicTacToeEnvironment:
         """
         if self.done:
             raise ValueError("Game already finished.")
-        if action not in self.available_actions():
+        if not 0 <= action < self.n_cells or ((self.x_bits | self.o_bits) >> action) & 1:
             raise ValueError(f"Invalid action: {action}")
+        self.make(action)
 
-        self.board[action] = self.current_player
-        self.winner = self._check_winner()
+    # ========= 給 AI 搜尋用：make / unmake =========
 
-        if self.winner is not None:
-            self.done = True
-        elif not self.available_actions():
+    def make(self, action: int) -> None:
+        """
+        和 step() 一樣下一步，但不檢查合法性（呼叫者保證遊戲沒結束、格子是空的），
+        之後可以用 unmake() 還原。
+        """
+        geometry = self.geometry
+        bit = 1 << action
+        if self.current_player == 'X':
+            self.x_bits |= bit
+            bits = self.x_bits
+            self._x_counts += geometry.cell_count_steps[action]
+            self._hash ^= geometry.zobrist_steps[0][action]
+        else:
+            self.o_bits |= bit
+            bits = self.o_bits
+            self._o_counts += geometry.cell_count_steps[action]
+            self._hash ^= geometry.zobrist_steps[1][action]
+        self._moves.append(action)
+        self.last_action = action
+        self._board_cache = None
+
+        # 增量檢查：只看經過 action 的連線
+        for mask in geometry.cell_line_masks[action]:
+            if bits & mask == mask:
+                self.winner = self.current_player
+                self.done = True
+                return
+        if (self.x_bits | self.o_bits) == geometry.full_mask:
             # 沒有空格且沒人贏 => 平手
             self.done = True
         else:
             # 換人
             self.current_player = 'O' if self.current_player == 'X' else 'X'
 
+    def unmake(self) -> None:
+        """還原最近一次 make()（或 step()）。"""
+        action = self._moves.pop()
+        if self.done:
+            self.done = False
+            self.winner = None
+        else:
+            self.current_player = 'O' if self.current_player == 'X' else 'X'
+        geometry = self.geometry
+        if self.current_player == 'X':
+            self.x_bits ^= 1 << action
+            self._x_counts -= geometry.cell_count_steps[action]
+            self._hash ^= geometry.zobrist_steps[0][action]
+        else:
+            self.o_bits ^= 1 << action
+            self._o_counts -= geometry.cell_count_steps[action]
+            self._hash ^= geometry.zobrist_steps[1][action]
+        self.last_action = self._moves[-1] if self._moves else None
+        self._board_cache = None
+
+    @property
+    def zobrist_hash(self) -> int:
+        """盤面 + 輪到誰的 Zobrist hash。"""
+        value = self._hash & HASH_MASK
+        if self.current_player == 'O':
+            value ^= self.geometry.zobrist_side
+        return value
+
+    @property
+    def canonical_hash(self) -> int:
+        """8 種對稱中最小的 hash（再併入輪到誰），置換表用它當 key。"""
+        h = self._hash
+        value = min((h >> shift) & HASH_MASK for shift in self.geometry.hash_shifts)
+        if self.current_player == 'O':
+            value ^= self.geometry.zobrist_side
+        return value
+
+    def line_counts(self, symbol: str) -> List[int]:
+        """每條連線（順序同 geometry.lines）上 symbol 有幾顆子。"""
+        counts = self._x_counts if symbol == 'X' else self._o_counts
+        return list(counts.to_bytes(len(self.geometry.lines), "little"))
+
+    def is_winning_move(self, action: int, symbol: str) -> bool:
+        """symbol 下在 action（必須是空格）會不會直接連成一線。"""
+        mine, theirs = (self._x_counts, self._o_counts) if symbol == 'X' else (self._o_counts, self._x_counts)
+        need = self.k - 1
+        for line in self.geometry.cell_line_ids[action]:
+            shift = COUNT_BITS * line
+            if (mine >> shift) & COUNT_MASK == need and not (theirs >> shift) & COUNT_MASK:
+                return True
+        return False
+
+    def winning_mask(self, symbol: str) -> int:
+        """symbol 下了就會直接獲勝的空格，以 bitmask 表示（搜尋時不用建 list）。"""
+        n_lines = len(self.geometry.lines)
+        mine = (self._x_counts if symbol == 'X' else self._o_counts).to_bytes(n_lines, "little")
+        theirs = (self._o_counts if symbol == 'X' else self._x_counts).to_bytes(n_lines, "little")
+        need = self.k - 1
+        line_masks = self.geometry.line_masks
+        found = 0
+        for line, count in enumerate(mine):
+            if count == need and not theirs[line]:
+                found |= line_masks[line]
+        return found & ~(self.x_bits | self.o_bits)
+
+    def winning_actions(self, symbol: str) -> List[int]:
+        """symbol 下了就會直接獲勝的所有空格（由小到大）。"""
+        found = self.winning_mask(symbol)
+        actions = []
+        while found:
+            low = found & -found
+            actions.append(low.bit_length() - 1)
+            found ^= low
+        return actions
+
     def _check_winner(self) -> Optional[str]:
         """檢查是否有勝利者，有的話回傳 'X' 或 'O'，否則 None。"""
-        lines = [
-            (0, 1, 2), (3, 4, 5), (6, 7, 8),  # 橫列
-            (0, 3, 6), (1, 4, 7), (2, 5, 8),  # 直行
-            (0, 4, 8), (2, 4, 6)              # 斜線
-        ]
-
-        for a, b, c in lines:
-            if self.board[a] is not None and \
-               self.board[a] == self.board[b] == self.board[c]:
-                return self.board[a]
+        for mask in self.geometry.line_masks:
+            if self.x_bits & mask == mask:
+                return 'X'
+            if self.o_bits & mask == mask:
+                return 'O'
         return None
 
     def render_text(self) -> str:
         """回傳文字版棋盤（可以在 terminal demo 時使用）"""
+        board = self.board
+        n = self.size
+
         def cell(i):
-            return self.board[i] if self.board[i] is not None else ' '
+            return board[i] if board[i] is not None else ' '
         rows = []
-        for r in range(3):
-            rows.append(f" {cell(3*r)} | {cell(3*r+1)} | {cell(3*r+2)} ")
-        return "\n---+---+---\n".join(rows)
+        for r in range(n):
+            rows.append("|".join(f" {cell(n*r + c)} " for c in range(n)))
+        separator = "\n" + "+".join(["---"] * n) + "\n"
+        return separator.join(rows)
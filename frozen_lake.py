@@ -1,7 +1,16 @@
+import argparse
+import os
 import gymnasium as gym
 import numpy as np
-import matplotlib.pyplot as plt
-import pickle
+
+from frozen_lake_metrics import success_summary
+from frozen_lake_store import load_checkpoint, load_qtable, save_checkpoint, save_qtable
+
+DISCOUNT_FACTOR_G = 0.99020       # gamma or discount rate. Near 0: more weight/reward placed on immediate state. Near 1: more on future state.
+EPSILON_DECAY_RATE = 0.00007642   # epsilon decay rate. 1/0.0001 = 10,000
+# learning rate (alpha) for epsilon in (0.8, 1], (0.5, 0.8], (0.1, 0.5], (0.05, 0.1], (0, 0.05]
+LEARNING_RATE_TIERS = (0.5, 0.6391, 0.4250, 0.1, 0.0456)
+FINAL_LEARNING_RATE = 0.0001      # once epsilon reaches 0
 
 
 def print_success_rate(rewards_per_episode):
@@ -9,30 +18,105 @@ def print_success_rate(rewards_per_episode):
     total_episodes = len(rewards_per_episode)
     success_count = np.sum(rewards_per_episode)
     success_rate = (success_count / total_episodes) * 100
-    print(f"✅ Success Rate: {success_rate:.2f}% ({int(success_count)} / {total_episodes} episodes)")
+    summary = success_summary(rewards_per_episode)
+    print(f"✅ Success Rate: {success_rate:.2f}% ({int(success_count)} / {total_episodes} episodes), "
+          f"95% CI [{summary['low'] * 100:.2f}%, {summary['high'] * 100:.2f}%]")
     return success_rate
 
-def run(episodes, is_training=True, render=False):
-
-    env = gym.make('FrozenLake-v1', map_name="8x8", is_slippery=True, render_mode='human' if render else None)
+def learning_rate_for(epsilon, tiers=LEARNING_RATE_TIERS):
+    """Learning-rate schedule: alpha is tiered on the current epsilon."""
+    if(epsilon > 0.8):
+        return tiers[0]
+    elif(epsilon > 0.5 and epsilon <= 0.8):
+        return tiers[1]
+    elif(epsilon > 0.1 and epsilon <= 0.5):
+        return tiers[2]
+    elif(epsilon > 0.05 and epsilon <= 0.1):
+        return tiers[3]
+    elif(epsilon > 0 and epsilon <= 0.05):
+        return tiers[4]
+    return FINAL_LEARNING_RATE
+
+def default_paths(map_name="8x8"):
+    """Default Q-table pickle and plot written by run() for a map: frozen_lake8x8.pkl / frozen_lake8x8.png."""
+    return f'frozen_lake{map_name}.pkl', f'frozen_lake{map_name}.png'
+
+
+def run(episodes, is_training=True, render=False, fast=False, map_name="8x8", is_slippery=True,
+        seed=None, qtable_path=None, plot_path=None, plot=True,
+        checkpoint_path=None, checkpoint_every=1000, resume=False, dtype=np.float64):
+    """Train (or evaluate) a Q-table on FrozenLake (8x8 by default).
+
+    fast=True swaps gymnasium's env for frozen_lake_sim.FastFrozenLake, which
+    samples the same transition table without the wrapper stack.
+    qtable_path / plot_path default to default_paths(map_name); plot=False
+    skips the plot, and with it the matplotlib import. The Q-table format
+    follows qtable_path's extension (.pkl / .npy / .npz, see frozen_lake_store).
+
+    With checkpoint_path, training writes a checkpoint every checkpoint_every
+    episodes, and resume=True continues from it if the file exists. At each
+    checkpoint the env is reseeded from the agent's RNG, so a resumed run
+    plays exactly the episodes the uninterrupted run would have.
+    dtype=np.float32 trains and stores a half-size Q-table.
+    Returns rewards_per_episode.
+    """
+    default_qtable, default_plot = default_paths(map_name)
+    qtable_path = qtable_path or default_qtable
+    plot_path = plot_path or default_plot
+
+    if fast:
+        if render:
+            raise ValueError("The fast simulator does not support rendering.")
+        from frozen_lake_sim import FastFrozenLake
+        env = FastFrozenLake.from_gym(map_name, is_slippery=is_slippery)
+    else:
+        env = gym.make('FrozenLake-v1', map_name=map_name, is_slippery=is_slippery, render_mode='human' if render else None)
 
     if(is_training):
-        q = np.zeros((env.observation_space.n, env.action_space.n)) # init a 64 x 4 array
+        q = np.zeros((env.observation_space.n, env.action_space.n), dtype=dtype) # init a 64 x 4 array
     else:
-        f = open('frozen_lake8x8.pkl', 'rb')
-        q = pickle.load(f)
-        f.close()
+        q, _ = load_qtable(qtable_path, mmap=True)
 
-    learning_rate_a = 0.5 # alpha or learning rate
-    discount_factor_g = 0.99020 # gamma or discount rate. Near 0: more weight/reward placed on immediate state. Near 1: more on future state.
+    learning_rate_a = LEARNING_RATE_TIERS[0] # alpha or learning rate
+    discount_factor_g = DISCOUNT_FACTOR_G # gamma or discount rate
     epsilon = 1         # 1 = 100% random actions
-    epsilon_decay_rate = 0.00007642        # epsilon decay rate. 1/0.0001 = 10,000
-    rng = np.random.default_rng()   # random number generator
+    epsilon_decay_rate = EPSILON_DECAY_RATE        # epsilon decay rate
+    rng = np.random.default_rng(seed)   # random number generator
 
     rewards_per_episode = np.zeros(episodes)
-
-    for i in range(episodes):
-        state = env.reset()[0]  # states: 0 to 63, 0=top left corner,63=bottom right corner
+    metadata = {
+        "map_name": map_name,
+        "is_slippery": is_slippery,
+        "episodes": episodes,
+        "seed": seed,
+        "discount_factor_g": discount_factor_g,
+        "epsilon_decay_rate": epsilon_decay_rate,
+        "learning_rate_tiers": list(LEARNING_RATE_TIERS),
+    }
+
+    start = 0
+    env_seed = seed
+    checkpointing = is_training and checkpoint_path is not None
+    if checkpointing and resume and os.path.exists(checkpoint_path):
+        q, done_rewards, saved, rng = load_checkpoint(checkpoint_path)
+        for key in ("map_name", "is_slippery", "episodes"):
+            if saved[key] != metadata[key]:
+                raise ValueError(f"Checkpoint {checkpoint_path} has {key}={saved[key]!r}, expected {metadata[key]!r}")
+        q = q.astype(dtype, copy=False)
+        start = saved["episode"]
+        rewards_per_episode[:start] = done_rewards
+        epsilon, learning_rate_a = saved["epsilon"], saved["learning_rate"]
+        env_seed = int(rng.integers(2**31))
+
+    for i in range(start, episodes):
+        if checkpointing and i > start and i % checkpoint_every == 0:
+            save_checkpoint(checkpoint_path, q, rewards_per_episode, i, rng,
+                            dict(metadata, epsilon=epsilon, learning_rate=learning_rate_a))
+            env_seed = int(rng.integers(2**31))
+        if env_seed is not None:
+            env.action_space.seed(env_seed)
+        state = env.reset(seed=env_seed)[0]  # states: 0 to 63, 0=top left corner,63=bottom right corner
+        env_seed = None
         terminated = False      # True when fall in hole or reached goal
         truncated = False       # True when actions > 200
 
@@ -52,44 +136,55 @@ def run(episodes, is_training=True, render=False):
             state = new_state
 
         epsilon = max(epsilon - epsilon_decay_rate, 0)
-
-        if(epsilon > 0.8): 
-            learning_rate_a = 0.5 
-        elif(epsilon > 0.5 and epsilon <= 0.8): 
-            learning_rate_a = 0.6391 
-        elif(epsilon > 0.1 and epsilon <= 0.5): 
-            learning_rate_a = 0.4250 
-        elif(epsilon > 0.05 and epsilon <= 0.1): 
-            learning_rate_a = 0.1 
-        elif(epsilon > 0 and epsilon <= 0.05): 
-            learning_rate_a = 0.0456  
-
-
-        if(epsilon==0):
-            learning_rate_a = 0.0001
+        learning_rate_a = learning_rate_for(epsilon)
 
         if reward == 1:
             rewards_per_episode[i] = 1
 
     env.close()
 
-    sum_rewards = np.zeros(episodes)
-    for t in range(episodes):
-        sum_rewards[t] = np.sum(rewards_per_episode[max(0, t-100):(t+1)])
-    plt.plot(sum_rewards)
-    plt.savefig('frozen_lake8x8.png')
-    
+    if plot:
+        from frozen_lake_plot import save_rolling_success
+        save_rolling_success(rewards_per_episode, plot_path)
+
     if is_training == False:
         print(print_success_rate(rewards_per_episode))
 
     if is_training:
-        f = open("frozen_lake8x8.pkl","wb")
-        pickle.dump(q, f)
-        f.close()
+        save_qtable(qtable_path, q, metadata)
+        if checkpointing:
+            save_checkpoint(checkpoint_path, q, rewards_per_episode, episodes, rng,
+                            dict(metadata, epsilon=epsilon, learning_rate=learning_rate_a))
+
+    return rewards_per_episode
 
 if __name__ == '__main__':
-    print("開始訓練...")
-    run(15000, is_training=True, render=False)
-    print("開始評估...")
-    run(500, is_training=False, render=False)
+    parser = argparse.ArgumentParser(description="FrozenLake Q-learning: train and/or evaluate a Q-table")
+    parser.add_argument("--mode", choices=["train", "eval", "both"], default="both")
+    parser.add_argument("--episodes", type=int, default=15000, help="training episodes")
+    parser.add_argument("--eval-episodes", type=int, default=500)
+    parser.add_argument("--map", choices=["4x4", "8x8"], default="8x8")
+    parser.add_argument("--not-slippery", action="store_true")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--qtable", default=None, help="Q-table .pkl / .npy / .npz (default frozen_lake<map>.pkl)")
+    parser.add_argument("--float32", action="store_true", help="train and store a float32 Q-table")
+    parser.add_argument("--checkpoint", default=None, help="periodic training checkpoint (.npz)")
+    parser.add_argument("--checkpoint-every", type=int, default=1000)
+    parser.add_argument("--resume", action="store_true", help="continue training from --checkpoint")
+    parser.add_argument("--plot", default=None, help="rolling-success plot (default frozen_lake<map>.png)")
+    parser.add_argument("--no-plot", action="store_true", help="skip plotting (matplotlib is never imported)")
+    parser.add_argument("--fast", action="store_true", help="use frozen_lake_sim.FastFrozenLake")
+    parser.add_argument("--render", action="store_true", help="render evaluation episodes")
+    args = parser.parse_args()
+
+    options = dict(fast=args.fast, map_name=args.map, is_slippery=not args.not_slippery, seed=args.seed,
+                   qtable_path=args.qtable, plot_path=args.plot, plot=not args.no_plot)
+    if args.mode in ("train", "both"):
+        print("開始訓練...")
+        run(args.episodes, is_training=True, render=False, checkpoint_path=args.checkpoint,
+            checkpoint_every=args.checkpoint_every, resume=args.resume,
+            dtype=np.float32 if args.float32 else np.float64, **options)
+    if args.mode in ("eval", "both"):
+        print("開始評估...")
+        run(args.eval_episodes, is_training=False, render=args.render, **options)
 
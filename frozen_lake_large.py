@@ -0,0 +1,257 @@
+import argparse
+import time
+from array import array
+from collections import deque
+
+import numpy as np
+from gymnasium.envs.toy_text.frozen_lake import generate_random_map
+
+from frozen_lake import DISCOUNT_FACTOR_G, EPSILON_DECAY_RATE, LEARNING_RATE_TIERS, learning_rate_for
+from frozen_lake_metrics import evaluate_policy, success_summary
+from frozen_lake_model import TransitionModel
+from frozen_lake_sim import FastFrozenLake
+from frozen_lake_store import save_qtable
+
+# run()'s schedule is tuned for 15000 episodes; other lengths decay epsilon at the same relative pace
+DEFAULT_EPISODES = 15000
+
+
+def default_max_steps(size):
+    """Episode step limit: gymnasium's 100 on 8x8, growing with the side length beyond that."""
+    return max(100, 12 * size)
+
+
+def random_map_model(size, p=0.95, seed=None, is_slippery=True, max_episode_steps=None):
+    """Transition model of a generate_random_map() map (always has a path to the goal).
+
+    The model is built once; every trainer / evaluator below samples from its arrays.
+    ``p`` is the frozen-tile probability. gymnasium's default of 0.8 leaves
+    slippery maps of 16x16 and up almost unsolvable even for the optimal policy,
+    so the default here is 0.95.
+    """
+    desc = generate_random_map(size=size, p=p, seed=seed)
+    model = TransitionModel.from_gym(desc=desc, is_slippery=is_slippery)
+    model.max_episode_steps = max_episode_steps or default_max_steps(size)
+    return model
+
+
+def goal_distances(model):
+    """Fewest steps from every state to the goal if moves never slipped (inf if unreachable).
+
+    Breadth-first search backwards from the goal over every outcome with
+    non-zero probability; hole and goal cells do not lead anywhere.
+    """
+    cells = np.asarray(model.desc).reshape(-1)
+    stops = (cells == b'H') | (cells == b'G')
+    goal = int(np.flatnonzero(cells == b'G')[0])
+
+    s_idx = np.broadcast_to(np.arange(model.n_states)[:, None, None], model.next_states.shape)
+    edge = (model.probs > 0) & ~stops[:, None, None]
+    sources, targets = s_idx[edge], model.next_states[edge]
+    order = np.argsort(targets, kind="stable")
+    sources, targets = sources[order], targets[order]
+    bounds = np.searchsorted(targets, np.arange(model.n_states + 1))
+
+    distance = np.full(model.n_states, np.inf)
+    distance[goal] = 0
+    queue = deque([goal])
+    while queue:
+        s = queue.popleft()
+        for prev in sources[bounds[s]:bounds[s + 1]]:
+            if distance[prev] == np.inf:
+                distance[prev] = distance[s] + 1
+                queue.append(prev)
+    return distance
+
+
+class ShapedInit:
+    """Distance-to-goal initial Q-values.
+
+    V0(s) = gamma ** (d(s) - 1) is the return of walking straight to the goal
+    in d(s) steps, and Q0(s, a) is its one-step expectation over the slip
+    outcomes. The values are optimistic (slips are ignored beyond one step),
+    so greedy exploration is pulled towards the goal instead of wandering the
+    map, and unreachable / hole states start at 0.
+    """
+
+    def __init__(self, model, gamma=DISCOUNT_FACTOR_G):
+        distance = goal_distances(model)
+        self._v0 = np.where(np.isfinite(distance) & (distance > 0), gamma ** (distance - 1), 0.0)
+        self._model = model
+        self._gamma = gamma
+
+    def rows(self, states):
+        """Q0 for a batch of states: shape (len(states), n_actions)."""
+        m = self._model
+        future = np.where(m.terminals[states], 0.0, self._gamma * self._v0[m.next_states[states]])
+        return (m.probs[states] * (m.rewards[states] + future)).sum(axis=2)
+
+    def dense(self, dtype=np.float32):
+        return self.rows(np.arange(self._model.n_states)).astype(dtype)
+
+
+class DenseQTable:
+    """Full (S, A) array, float32 by default: 4 bytes per value."""
+
+    def __init__(self, n_states, n_actions, init=None, dtype=np.float32):
+        self.q = init.dense(dtype) if init is not None else np.zeros((n_states, n_actions), dtype=dtype)
+
+    def row(self, state):
+        return self.q[state]
+
+    @property
+    def nbytes(self):
+        return self.q.nbytes
+
+    def to_dense(self):
+        return self.q
+
+
+class SparseQTable:
+    """Rows are only created for states the agent has visited.
+
+    Each row is an ``array('f')`` (float32, and fast to index from Python),
+    filled from the shaped initialization or with zeros. Unvisited states
+    read as their initial values without being stored.
+    """
+
+    def __init__(self, n_states, n_actions, init=None):
+        self.n_states = n_states
+        self.n_actions = n_actions
+        self._init = init
+        self._rows = {}
+
+    def _initial(self, state):
+        if self._init is None:
+            return array('f', bytes(4 * self.n_actions))
+        return array('f', self._init.rows(np.array([state]))[0].tolist())
+
+    def row(self, state):
+        row = self._rows.get(state)
+        if row is None:
+            row = self._rows[state] = self._initial(state)
+        return row
+
+    @property
+    def visited(self):
+        return len(self._rows)
+
+    @property
+    def nbytes(self):
+        """Row storage only (the dict itself adds ~100 bytes per visited state)."""
+        return sum(row.itemsize * len(row) for row in self._rows.values())
+
+    def to_dense(self):
+        if self._init is not None:
+            q = self._init.dense()
+        else:
+            q = np.zeros((self.n_states, self.n_actions), dtype=np.float32)
+        for state, row in self._rows.items():
+            q[state] = row
+        return q
+
+
+def _argmax(row, n_actions):
+    # first maximum, like np.argmax, without numpy call overhead per step
+    best, best_value = 0, row[0]
+    for a in range(1, n_actions):
+        if row[a] > best_value:
+            best, best_value = a, row[a]
+    return best
+
+
+def train_large(model, episodes, storage="dense", init="shaped", seed=None,
+                discount_factor_g=DISCOUNT_FACTOR_G, epsilon_decay_rate=None):
+    """run()'s Q-learning loop on a large map, with compact Q storage.
+
+    storage: "dense" (float32 array) or "sparse" (visited states only).
+    init: "shaped" (ShapedInit) or "zeros".
+    epsilon_decay_rate defaults to run()'s rate rescaled to ``episodes``.
+    Returns (q_table, rewards_per_episode, steps_taken).
+    """
+    if epsilon_decay_rate is None:
+        epsilon_decay_rate = EPSILON_DECAY_RATE * DEFAULT_EPISODES / episodes
+    shaped = ShapedInit(model, discount_factor_g) if init == "shaped" else None
+    if storage == "dense":
+        table = DenseQTable(model.n_states, model.n_actions, shaped)
+    elif storage == "sparse":
+        table = SparseQTable(model.n_states, model.n_actions, shaped)
+    else:
+        raise ValueError(f"Unknown storage: {storage}")
+
+    env = FastFrozenLake(model, seed=seed)
+    rng = np.random.default_rng(seed)
+    n_actions = model.n_actions
+    epsilon = 1
+    learning_rate_a = LEARNING_RATE_TIERS[0]
+    rewards_per_episode = np.zeros(episodes)
+    steps_taken = 0
+
+    for i in range(episodes):
+        state = env.reset()[0]
+        row = table.row(state)
+        terminated = truncated = False
+        reward = 0
+        while not terminated and not truncated:
+            if rng.random() < epsilon:
+                action = env.action_space.sample()
+            else:
+                action = _argmax(row, n_actions)
+            new_state, reward, terminated, truncated, _ = env.step(action)
+            next_row = table.row(new_state)
+            row[action] += learning_rate_a * (reward + discount_factor_g * max(next_row) - row[action])
+            state, row = new_state, next_row
+            steps_taken += 1
+
+        epsilon = max(epsilon - epsilon_decay_rate, 0)
+        learning_rate_a = learning_rate_for(epsilon)
+        rewards_per_episode[i] = reward == 1
+
+    return table, rewards_per_episode, steps_taken
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Q-learning on a large random FrozenLake map")
+    parser.add_argument("--size", type=int, default=32, help="side length of the generated map")
+    parser.add_argument("--p", type=float, default=0.95, help="probability that a tile is frozen")
+    parser.add_argument("--map-seed", type=int, default=0)
+    parser.add_argument("--not-slippery", action="store_true")
+    parser.add_argument("--episodes", type=int, default=5000)
+    parser.add_argument("--storage", choices=["dense", "sparse"], default="dense")
+    parser.add_argument("--init", choices=["shaped", "zeros"], default="shaped")
+    parser.add_argument("--max-steps", type=int, default=None, help="episode step limit (default max(100, 12 * size))")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--eval-episodes", type=int, default=10000)
+    parser.add_argument("--output", default=None, help="save the Q-table (.npy / .npz / .pkl)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    model = random_map_model(args.size, args.p, args.map_seed, not args.not_slippery, args.max_steps)
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    table, rewards, steps = train_large(model, args.episodes, args.storage, args.init, args.seed)
+    elapsed = time.perf_counter() - start
+    q = table.to_dense()
+    summary = success_summary(evaluate_policy(q, args.eval_episodes, model=model, seed=args.seed))
+
+    print(f"{args.size}x{args.size} map: model built in {build:.2f}s, {model.n_states} states")
+    print(f"trained {args.episodes} episodes in {elapsed:.2f}s ({elapsed / args.episodes * 1000:.2f} ms/episode, "
+          f"{steps / elapsed:,.0f} steps/s)")
+    stored = f"{table.nbytes:,} bytes"
+    if args.storage == "sparse":
+        stored += f" ({table.visited} / {model.n_states} states visited)"
+    print(f"Q storage: {stored}; dense float64 would be {model.n_states * model.n_actions * 8:,} bytes")
+    print(f"✅ greedy success {summary['rate'] * 100:.2f}% "
+          f"(95% CI [{summary['low'] * 100:.2f}%, {summary['high'] * 100:.2f}%])")
+
+    if args.output:
+        save_qtable(args.output, q, {
+            "desc": [b"".join(row).decode() for row in model.desc],
+            "is_slippery": not args.not_slippery,
+            "episodes": args.episodes,
+            "seed": args.seed,
+            "storage": args.storage,
+            "init": args.init,
+            "max_episode_steps": model.max_episode_steps,
+        })
+        print(f"Q-table written to {args.output}")
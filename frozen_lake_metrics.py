@@ -0,0 +1,100 @@
+import argparse
+import time
+from statistics import NormalDist
+
+import numpy as np
+
+from frozen_lake_model import TransitionModel
+from frozen_lake_store import load_qtable
+
+
+def rolling_sum(values, window=100):
+    """Sum of ``values[max(0, t - window):t + 1]`` for every t, in O(n).
+
+    Same numbers as the per-episode slice sum run() used to plot (the current
+    episode plus up to ``window`` before it), from one cumulative sum.
+    """
+    values = np.asarray(values, dtype=float)
+    cumulative = np.concatenate(([0.0], np.cumsum(values)))
+    end = np.arange(1, values.size + 1)
+    start = np.maximum(0, end - 1 - window)
+    return cumulative[end] - cumulative[start]
+
+
+def rolling_mean(values, window=100):
+    """rolling_sum() divided by the number of episodes actually in each window."""
+    end = np.arange(1, len(values) + 1)
+    return rolling_sum(values, window) / (end - np.maximum(0, end - 1 - window))
+
+
+def wilson_interval(successes, trials, confidence=0.95):
+    """Wilson score interval for a success rate; stays inside [0, 1] even at 0% / 100%."""
+    if trials == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denominator
+    margin = z * np.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return float(max(0.0, center - margin)), float(min(1.0, center + margin))
+
+
+def success_summary(rewards_per_episode, confidence=0.95):
+    """Success rate and its Wilson interval: {"rate", "low", "high", "successes", "episodes"}."""
+    rewards = np.asarray(rewards_per_episode)
+    successes = int(np.count_nonzero(rewards == 1))
+    low, high = wilson_interval(successes, rewards.size, confidence)
+    return {
+        "rate": successes / rewards.size if rewards.size else 0.0,
+        "low": low,
+        "high": high,
+        "successes": successes,
+        "episodes": int(rewards.size),
+    }
+
+
+def evaluate_policy(q, episodes, model=None, seed=None, batch_size=100000):
+    """Play the greedy policy of ``q`` for ``episodes`` episodes, all in lockstep.
+
+    The policy is fixed, so argmax(q) is taken once (first max on ties, like
+    run()); every step then samples all still-running episodes at once with
+    TransitionModel.sample(). Returns a 0/1 reward array, one per episode, the
+    same as run()'s rewards_per_episode in evaluation mode.
+    """
+    if model is None:
+        model = TransitionModel.from_gym("8x8", is_slippery=True)
+    policy = np.argmax(q, axis=1)
+    max_steps = model.max_episode_steps or np.inf
+    rng = np.random.default_rng(seed)
+    rewards = np.zeros(episodes)
+
+    for first in range(0, episodes, batch_size):
+        n = min(batch_size, episodes - first)
+        state = np.full(n, model.initial_state, dtype=np.int64)
+        idx = np.arange(n)
+        steps = 0
+        while idx.size and steps < max_steps:
+            s_next, reward, terminated = model.sample(state[idx], policy[state[idx]], rng.random(idx.size))
+            state[idx] = s_next
+            steps += 1
+            ended = idx[terminated]
+            rewards[first + ended] = reward[terminated] == 1
+            idx = idx[~terminated]
+    return rewards
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Batched greedy evaluation of a FrozenLake Q-table")
+    parser.add_argument("--qtable", default='frozen_lake8x8.pkl', help=".pkl / .npy / .npz")
+    parser.add_argument("--episodes", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--confidence", type=float, default=0.95)
+    args = parser.parse_args()
+
+    q, _ = load_qtable(args.qtable, mmap=True)
+    start = time.perf_counter()
+    summary = success_summary(evaluate_policy(q, args.episodes, seed=args.seed), args.confidence)
+    elapsed = time.perf_counter() - start
+    print(f"✅ Success Rate: {summary['rate'] * 100:.2f}% ({summary['successes']} / {summary['episodes']} episodes), "
+          f"{args.confidence:.0%} CI [{summary['low'] * 100:.2f}%, {summary['high'] * 100:.2f}%]")
+    print(f"evaluated in {elapsed:.2f}s ({args.episodes / elapsed:,.0f} episodes/s)")
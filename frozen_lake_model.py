@@ -0,0 +1,78 @@
+import gymnasium as gym
+import numpy as np
+
+
+class TransitionModel:
+    """Dense, array-based copy of a FrozenLake transition table (``env.unwrapped.P``).
+
+    Every (state, action) pair gets ``K`` outcome slots (padded with zero
+    probability), so a whole batch of transitions can be sampled at once:
+
+    - ``next_states[s, a, k]``: state reached by outcome k
+    - ``probs[s, a, k]`` / ``cum_probs[s, a, k]``: outcome probability / running sum
+    - ``rewards[s, a, k]``: reward of outcome k
+    - ``terminals[s, a, k]``: True if outcome k ends the episode (hole or goal)
+    """
+
+    def __init__(self, P, initial_state=0, max_episode_steps=None, desc=None):
+        self.n_states = len(P)
+        self.n_actions = len(P[0])
+        self.initial_state = int(initial_state)
+        self.max_episode_steps = max_episode_steps
+        self.desc = desc
+
+        k = max(len(P[s][a]) for s in range(self.n_states) for a in range(self.n_actions))
+        shape = (self.n_states, self.n_actions, k)
+        self.next_states = np.zeros(shape, dtype=np.int64)
+        self.probs = np.zeros(shape)
+        self.rewards = np.zeros(shape)
+        self.terminals = np.zeros(shape, dtype=bool)
+
+        for s in range(self.n_states):
+            for a in range(self.n_actions):
+                for i, (p, s_next, r, done) in enumerate(P[s][a]):
+                    self.probs[s, a, i] = p
+                    self.next_states[s, a, i] = s_next
+                    self.rewards[s, a, i] = r
+                    self.terminals[s, a, i] = done
+                # padded slots repeat the last outcome so an index can never point at garbage
+                for i in range(len(P[s][a]), k):
+                    self.next_states[s, a, i] = self.next_states[s, a, i - 1]
+                    self.rewards[s, a, i] = self.rewards[s, a, i - 1]
+                    self.terminals[s, a, i] = self.terminals[s, a, i - 1]
+
+        self.cum_probs = np.cumsum(self.probs, axis=2)
+
+    @classmethod
+    def from_env(cls, env):
+        """Build the model from a (possibly wrapped) gymnasium FrozenLake env."""
+        unwrapped = env.unwrapped
+        max_steps = env.spec.max_episode_steps if env.spec is not None else None
+        return cls(
+            unwrapped.P,
+            initial_state=int(np.argmax(unwrapped.initial_state_distrib)),
+            max_episode_steps=max_steps,
+            desc=unwrapped.desc,
+        )
+
+    @classmethod
+    def from_gym(cls, map_name="8x8", is_slippery=True, desc=None):
+        env = gym.make('FrozenLake-v1', map_name=map_name, desc=desc, is_slippery=is_slippery)
+        model = cls.from_env(env)
+        env.close()
+        return model
+
+    def sample(self, states, actions, u):
+        """Sample one transition per (state, action) pair.
+
+        ``u`` holds uniform [0, 1) draws, one per pair. The outcome picked is
+        the first k with ``cum_probs[s, a, k] > u``, the same rule gymnasium's
+        ``categorical_sample`` uses. Returns (next_states, rewards, terminals).
+        """
+        cum = self.cum_probs[states, actions]                  # (N, K)
+        k = np.minimum((cum <= u[:, None]).sum(axis=1), cum.shape[1] - 1)
+        return (
+            self.next_states[states, actions, k],
+            self.rewards[states, actions, k],
+            self.terminals[states, actions, k],
+        )
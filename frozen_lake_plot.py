@@ -0,0 +1,42 @@
+"""Optional plotting for frozen_lake.run().
+
+matplotlib is only imported the first time a plot is saved, so training in
+batch jobs or pool workers never pays for the pyplot import. The
+non-interactive Agg backend is selected unless pyplot was already imported
+(e.g. from a notebook), which also keeps headless machines working.
+"""
+import warnings
+
+from frozen_lake_metrics import rolling_sum
+
+_plt = None
+
+
+def _pyplot():
+    global _plt
+    if _plt is None:
+        import sys
+
+        import matplotlib
+        if 'matplotlib.pyplot' not in sys.modules:
+            matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        _plt = plt
+    return _plt
+
+
+def save_rolling_success(rewards_per_episode, path, window=100):
+    """Plot the rolling success count (same curve run() always produced) to ``path``.
+
+    Returns False, with a warning, if matplotlib is not installed.
+    """
+    try:
+        plt = _pyplot()
+    except ImportError:
+        warnings.warn("matplotlib is not installed; skipping the plot.")
+        return False
+    fig, ax = plt.subplots()
+    ax.plot(rolling_sum(rewards_per_episode, window))
+    fig.savefig(path)
+    plt.close(fig)
+    return True
@@ -0,0 +1,205 @@
+import argparse
+import random
+import time
+
+import gymnasium as gym
+import numpy as np
+
+from frozen_lake_model import TransitionModel
+
+
+class _DiscreteSpace:
+    """Just enough of gymnasium's Discrete space for run(): ``n`` and ``sample()``."""
+
+    def __init__(self, n, rng):
+        self.n = n
+        self._rng = rng
+
+    def sample(self):
+        return self._rng.randrange(self.n)
+
+    def seed(self, seed=None):
+        """Reseed the RNG shared with the env (reset(seed=...) does the same)."""
+        self._rng.seed(seed)
+        return [seed]
+
+
+class FastFrozenLake:
+    """Drop-in replacement for ``gym.make('FrozenLake-v1', ...)`` without the wrapper stack.
+
+    The transition table comes from TransitionModel (cumulative probabilities,
+    next states, rewards, terminal flags), built once from the same map and
+    slipperiness. Each step is a few list lookups plus one uniform draw. The
+    outcome is picked with the same "first cumulative probability > u" rule
+    gymnasium uses. Episodes are truncated after the same ``max_episode_steps``
+    as the registered gymnasium env (100 for FrozenLake-v1).
+
+    reset() / step() return the same tuples as gymnasium; rendering is not
+    supported.
+    """
+
+    def __init__(self, model, seed=None):
+        self.model = model
+        self.max_episode_steps = model.max_episode_steps
+        # plain nested lists: indexing numpy scalars one at a time is slower than lists
+        self._cum = model.cum_probs.tolist()
+        self._next = model.next_states.tolist()
+        self._reward = model.rewards.tolist()
+        self._terminal = model.terminals.tolist()
+        self._rng = random.Random(seed)
+        self.observation_space = _DiscreteSpace(model.n_states, self._rng)
+        self.action_space = _DiscreteSpace(model.n_actions, self._rng)
+        self.s = model.initial_state
+        self._elapsed = 0
+
+    @classmethod
+    def from_gym(cls, map_name="8x8", is_slippery=True, seed=None):
+        return cls(TransitionModel.from_gym(map_name, is_slippery), seed=seed)
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self._rng.seed(seed)
+        self.s = self.model.initial_state
+        self._elapsed = 0
+        return self.s, {"prob": 1}
+
+    def step(self, action):
+        s = self.s
+        cum = self._cum[s][action]
+        u = self._rng.random()
+        k = 0
+        last = len(cum) - 1
+        while k < last and cum[k] <= u:
+            k += 1
+        self.s = self._next[s][action][k]
+        self._elapsed += 1
+        terminated = self._terminal[s][action][k]
+        truncated = (not terminated and self.max_episode_steps is not None
+                     and self._elapsed >= self.max_episode_steps)
+        return self.s, self._reward[s][action][k], terminated, truncated, {"prob": 1}
+
+    def close(self):
+        pass
+
+
+# ---------- statistical equivalence check against gymnasium ----------
+
+# chi-square critical values at p = 0.001 by degrees of freedom
+_CHI2_CRITICAL = {1: 10.83, 2: 13.82, 3: 16.27, 4: 18.47}
+
+
+def _transition_counts(env, model, samples):
+    """Put ``env`` in every state (both envs keep it in ``.s``) and tally where each action leads."""
+    counts = np.zeros(model.next_states.shape[:2] + (model.n_states,), dtype=np.int64)
+    for s in range(model.n_states):
+        for a in range(model.n_actions):
+            for _ in range(samples):
+                env.s = s
+                s_next = env.step(a)[0]
+                counts[s, a, s_next] += 1
+    return counts
+
+
+def _chi_square_failures(counts, model, samples):
+    """Number of (state, action) pairs whose next-state counts reject the true distribution."""
+    failures = 0
+    for s in range(model.n_states):
+        for a in range(model.n_actions):
+            expected = np.zeros(model.n_states)
+            np.add.at(expected, model.next_states[s, a], model.probs[s, a])
+            support = expected > 0
+            if support.sum() < 2:
+                # deterministic transition: every sample must land on the single outcome
+                failures += int(counts[s, a, ~support].sum() > 0)
+                continue
+            observed = counts[s, a, support]
+            exp = expected[support] * samples
+            stat = float(((observed - exp) ** 2 / exp).sum())
+            if stat > _CHI2_CRITICAL[int(support.sum()) - 1]:
+                failures += 1
+    return failures
+
+
+def _random_rollouts(env, episodes, seed):
+    rng = np.random.default_rng(seed)
+    successes = np.zeros(episodes)
+    lengths = np.zeros(episodes)
+    for i in range(episodes):
+        env.reset()
+        terminated = truncated = False
+        reward = 0
+        steps = 0
+        while not terminated and not truncated:
+            _, reward, terminated, truncated, _ = env.step(int(rng.integers(4)))
+            steps += 1
+        successes[i] = reward == 1
+        lengths[i] = steps
+    return successes, lengths
+
+
+def _z_score(a, b):
+    se = np.sqrt(a.var(ddof=1) / a.size + b.var(ddof=1) / b.size)
+    return 0.0 if se == 0 else float(abs(a.mean() - b.mean()) / se)
+
+
+def check_equivalence(map_name="8x8", is_slippery=True, samples=600, episodes=20000, seed=0):
+    """Compare FastFrozenLake with gymnasium's env; return True if no difference is detected.
+
+    1. Per (state, action) next-state frequencies of both envs vs. the true
+       transition probabilities (chi-square, p = 0.001). A couple of rejections
+       out of all pairs are expected by chance, so up to 1% is tolerated.
+    2. Random-policy rollouts: success rate and episode length (which includes
+       truncation) must agree within a |z| < 4 two-sample test.
+    """
+    gym_env = gym.make('FrozenLake-v1', map_name=map_name, is_slippery=is_slippery)
+    gym_env.reset(seed=seed)
+    model = TransitionModel.from_env(gym_env)
+    fast_env = FastFrozenLake(model, seed=seed)
+    pairs = model.n_states * model.n_actions
+
+    # step the unwrapped env for per-pair sampling (no TimeLimit bookkeeping in the way)
+    gym_counts = _transition_counts(gym_env.unwrapped, model, samples)
+    fast_counts = _transition_counts(fast_env, model, samples)
+    gym_failures = _chi_square_failures(gym_counts, model, samples)
+    fast_failures = _chi_square_failures(fast_counts, model, samples)
+
+    gym_success, gym_lengths = _random_rollouts(gym_env, episodes, seed)
+    fast_success, fast_lengths = _random_rollouts(fast_env, episodes, seed + 1)
+    z_success = _z_score(gym_success, fast_success)
+    z_length = _z_score(gym_lengths, fast_lengths)
+    gym_env.close()
+
+    print(f"chi-square rejections: gymnasium {gym_failures}/{pairs}, fast {fast_failures}/{pairs}")
+    print(f"random-policy success: gymnasium {gym_success.mean():.4f}, fast {fast_success.mean():.4f} (|z| = {z_success:.2f})")
+    print(f"episode length:        gymnasium {gym_lengths.mean():.2f}, fast {fast_lengths.mean():.2f} (|z| = {z_length:.2f})")
+
+    tolerated = max(1, pairs // 100)
+    return fast_failures <= tolerated and z_success < 4 and z_length < 4
+
+
+def _steps_per_second(env, steps, seed):
+    rng = np.random.default_rng(seed)
+    actions = rng.integers(4, size=steps).tolist()
+    env.reset()
+    start = time.perf_counter()
+    for action in actions:
+        _, _, terminated, truncated, _ = env.step(action)
+        if terminated or truncated:
+            env.reset()
+    return steps / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Fast FrozenLake simulator: equivalence check and step throughput")
+    parser.add_argument("--samples", type=int, default=600, help="samples per (state, action) pair")
+    parser.add_argument("--episodes", type=int, default=20000, help="random-policy rollouts per env")
+    parser.add_argument("--steps", type=int, default=200000, help="steps for the throughput comparison")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    ok = check_equivalence(samples=args.samples, episodes=args.episodes, seed=args.seed)
+    print("✅ statistically equivalent" if ok else "❌ distributions differ")
+
+    gym_rate = _steps_per_second(gym.make('FrozenLake-v1', map_name="8x8", is_slippery=True), args.steps, args.seed)
+    fast_rate = _steps_per_second(FastFrozenLake.from_gym("8x8", True, seed=args.seed), args.steps, args.seed)
+    print(f"steps/s: gymnasium {gym_rate:,.0f}, fast {fast_rate:,.0f} ({fast_rate / gym_rate:.1f}x)")
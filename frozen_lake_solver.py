@@ -0,0 +1,143 @@
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+import frozen_lake
+from frozen_lake import DISCOUNT_FACTOR_G
+from frozen_lake_metrics import evaluate_policy
+from frozen_lake_model import TransitionModel
+from frozen_lake_store import load_qtable, save_qtable
+
+
+def transition_tensors(model, sparse=False):
+    """Expected reward R[s, a] and transition weights toward future value.
+
+    Outcomes that end the episode (hole / goal) carry no future value, so they
+    are left out of the transition weights.
+
+    - dense: T[s, a, s'] of shape (S, A, S)
+    - sparse: (next_states, weights) in the padded (S, A, K) outcome layout;
+      memory stays O(S * A * K) instead of O(S^2 * A) on large maps
+    """
+    R = (model.probs * model.rewards).sum(axis=2)
+    weights = model.probs * ~model.terminals
+    if sparse:
+        return R, (model.next_states, weights)
+    T = np.zeros((model.n_states, model.n_actions, model.n_states))
+    s_idx, a_idx = np.indices(model.next_states.shape[:2])
+    for k in range(model.next_states.shape[2]):
+        np.add.at(T, (s_idx, a_idx, model.next_states[:, :, k]), weights[:, :, k])
+    return R, T
+
+
+def _q_from_v(R, T, V, gamma, sparse):
+    if sparse:
+        next_states, weights = T
+        return R + gamma * (weights * V[next_states]).sum(axis=2)
+    return R + gamma * T @ V
+
+
+def value_iteration(model, gamma=DISCOUNT_FACTOR_G, tol=1e-10, max_iterations=100000, sparse=False):
+    """Vectorized value iteration; returns (Q, iterations)."""
+    R, T = transition_tensors(model, sparse)
+    V = np.zeros(model.n_states)
+    for iteration in range(1, max_iterations + 1):
+        Q = _q_from_v(R, T, V, gamma, sparse)
+        V_new = Q.max(axis=1)
+        if np.max(np.abs(V_new - V)) < tol:
+            return Q, iteration
+        V = V_new
+    return Q, max_iterations
+
+
+def policy_iteration(model, gamma=DISCOUNT_FACTOR_G, max_iterations=1000):
+    """Policy iteration with exact (linear solve) policy evaluation; returns (Q, iterations)."""
+    if gamma >= 1:
+        raise ValueError("policy_iteration needs gamma < 1 for the linear solve")
+    R, T = transition_tensors(model)
+    states = np.arange(model.n_states)
+    policy = np.zeros(model.n_states, dtype=np.int64)
+    identity = np.eye(model.n_states)
+    for iteration in range(1, max_iterations + 1):
+        V = np.linalg.solve(identity - gamma * T[states, policy], R[states, policy])
+        Q = _q_from_v(R, T, V, gamma, False)
+        # keep the current action on ties so the loop cannot cycle between equal policies
+        best = Q.max(axis=1)
+        keep = np.isclose(Q[states, policy], best, rtol=0, atol=1e-12)
+        new_policy = np.where(keep, policy, np.argmax(Q, axis=1))
+        if np.array_equal(new_policy, policy):
+            return Q, iteration
+        policy = new_policy
+    return Q, max_iterations
+
+
+def solve(method="value", map_name="8x8", is_slippery=True, gamma=DISCOUNT_FACTOR_G,
+          output='frozen_lake8x8.pkl', sparse=False):
+    """Solve the MDP and write the Q-table in the same format as training (by extension).
+
+    Returns (q, iterations, seconds); the seconds include building the model.
+    """
+    start = time.perf_counter()
+    model = TransitionModel.from_gym(map_name, is_slippery)
+    if method == "value":
+        q, iterations = value_iteration(model, gamma, sparse=sparse)
+    elif method == "policy":
+        q, iterations = policy_iteration(model, gamma)
+    else:
+        raise ValueError(f"Unknown method: {method}")
+    elapsed = time.perf_counter() - start
+    if output:
+        save_qtable(output, q, {"map_name": map_name, "is_slippery": is_slippery, "method": method,
+                                "gamma": gamma, "iterations": iterations})
+    return q, iterations, elapsed
+
+
+def evaluate_q(q, episodes, seed=None, map_name="8x8", is_slippery=True):
+    """Greedy success rate of a Q-table, same policy as run(..., is_training=False)."""
+    model = TransitionModel.from_gym(map_name, is_slippery)
+    return float(evaluate_policy(q, episodes, model=model, seed=seed).mean())
+
+
+def _q_learning_baseline(episodes):
+    """Time run()'s Q-learning in a scratch directory and return (q, seconds)."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            start = time.perf_counter()
+            frozen_lake.run(episodes, is_training=True)
+            elapsed = time.perf_counter() - start
+            q, _ = load_qtable('frozen_lake8x8.pkl')
+        finally:
+            os.chdir(cwd)
+    return q, elapsed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Solve FrozenLake 8x8 with value / policy iteration")
+    parser.add_argument("--method", choices=["value", "policy"], default="value")
+    parser.add_argument("--gamma", type=float, default=DISCOUNT_FACTOR_G)
+    parser.add_argument("--sparse", action="store_true", help="value iteration on the padded outcome layout")
+    parser.add_argument("--output", default='frozen_lake8x8.pkl')
+    parser.add_argument("--eval-episodes", type=int, default=10000)
+    parser.add_argument("--compare", type=int, metavar="EPISODES", default=0,
+                        help="also train run()'s Q-learning for EPISODES episodes and report it alongside")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    q, iterations, elapsed = solve(args.method, gamma=args.gamma, output=args.output, sparse=args.sparse)
+    success = evaluate_q(q, args.eval_episodes, seed=args.seed)
+    rows = [(f"{args.method} iteration ({iterations} it)", elapsed, success)]
+
+    if args.compare:
+        q_learned, learn_elapsed = _q_learning_baseline(args.compare)
+        rows.append((f"Q-learning ({args.compare} ep)", learn_elapsed,
+                     evaluate_q(q_learned, args.eval_episodes, seed=args.seed)))
+
+    print(f"{'method':<30}{'wall-clock (s)':>16}{'success rate':>14}")
+    for name, seconds, rate in rows:
+        print(f"{name:<30}{seconds:>16.3f}{rate * 100:>13.2f}%")
+    print(f"Q-table written to {args.output}")
@@ -0,0 +1,91 @@
+"""Q-table storage for the FrozenLake scripts.
+
+The format follows the file extension:
+
+- ``.pkl``: the original bare pickle (no metadata), still the default path
+- ``.npy``: the raw array, loadable with ``np.load(mmap_mode='r')`` so many
+  evaluation workers share one read-only copy; metadata goes to a
+  ``<path>.json`` sidecar because the .npy header cannot carry extra keys
+- ``.npz``: array plus metadata (as JSON) in one file; also used for checkpoints
+
+Metadata is a JSON-serializable dict (map, hyperparameters, episode count,
+RNG state, ...). Every write goes to a temporary file that is then renamed
+over the target, so a crash mid-write never leaves a truncated Q-table.
+"""
+import json
+import os
+import pickle
+
+import numpy as np
+
+CHECKPOINT_VERSION = 1
+
+
+def _atomic_write(path, write):
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _json_array(metadata):
+    return np.array(json.dumps(metadata or {}))
+
+
+def save_qtable(path, q, metadata=None, dtype=None):
+    """Write ``q`` to ``path`` (format by extension); ``dtype=np.float32`` halves the size."""
+    q = np.asarray(q, dtype=dtype)
+    if path.endswith(".npy"):
+        _atomic_write(path, lambda f: np.save(f, q))
+        _atomic_write(path + ".json", lambda f: f.write(json.dumps(metadata or {}, indent=2).encode()))
+    elif path.endswith(".npz"):
+        _atomic_write(path, lambda f: np.savez(f, q=q, metadata=_json_array(metadata)))
+    else:
+        _atomic_write(path, lambda f: pickle.dump(q, f))
+
+
+def load_qtable(path, mmap=False):
+    """Return (q, metadata) from any of the formats above.
+
+    ``mmap=True`` maps a ``.npy`` file read-only instead of reading it; the
+    other formats are always loaded into memory.
+    """
+    if path.endswith(".npy"):
+        q = np.load(path, mmap_mode="r" if mmap else None)
+        metadata = {}
+        if os.path.exists(path + ".json"):
+            with open(path + ".json") as f:
+                metadata = json.load(f)
+        return q, metadata
+    if path.endswith(".npz"):
+        with np.load(path) as data:
+            return data["q"], json.loads(str(data["metadata"]))
+    with open(path, "rb") as f:
+        return pickle.load(f), {}
+
+
+def save_checkpoint(path, q, rewards_per_episode, episode, rng, metadata=None):
+    """Snapshot of a training run after ``episode`` episodes, resumable with load_checkpoint().
+
+    Stores the Q-table, the rewards so far, and in the metadata the episode
+    count and the agent RNG's bit-generator state.
+    """
+    metadata = dict(metadata or {}, version=CHECKPOINT_VERSION, episode=int(episode),
+                    rng_state=rng.bit_generator.state)
+    _atomic_write(path, lambda f: np.savez(
+        f, q=q, rewards=np.asarray(rewards_per_episode)[:episode], metadata=_json_array(metadata)))
+
+
+def load_checkpoint(path):
+    """Return (q, rewards_so_far, metadata, rng) from save_checkpoint()'s file."""
+    with np.load(path) as data:
+        q = data["q"].copy()
+        rewards = data["rewards"].copy()
+        metadata = json.loads(str(data["metadata"]))
+    if metadata.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version in {path}: {metadata.get('version')}")
+    rng = np.random.default_rng()
+    rng.bit_generator.state = metadata["rng_state"]
+    return q, rewards, metadata, rng
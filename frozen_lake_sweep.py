@@ -0,0 +1,277 @@
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing as mp
+import os
+import time
+
+import numpy as np
+
+from frozen_lake import DISCOUNT_FACTOR_G, EPSILON_DECAY_RATE, LEARNING_RATE_TIERS
+from frozen_lake_metrics import evaluate_policy
+from frozen_lake_model import TransitionModel
+from frozen_lake_vec import train_vectorized
+
+# lr_0 .. lr_4 are the learning_rate_for() tiers, highest epsilon first
+PARAMETERS = ("discount_factor_g", "epsilon_decay_rate") + tuple(
+    f"lr_{i}" for i in range(len(LEARNING_RATE_TIERS)))
+DEFAULTS = dict(zip(PARAMETERS, (DISCOUNT_FACTOR_G, EPSILON_DECAY_RATE) + LEARNING_RATE_TIERS))
+
+# used when no --space file is given: the current schedule plus a few neighbours
+DEFAULT_SPACE = {
+    "discount_factor_g": [0.95, 0.9902, 0.999],
+    "epsilon_decay_rate": [0.00005, 0.00007642, 0.0001],
+    "lr_2": [0.2, 0.425],
+}
+
+RESULT_FIELDS = ("trial", "seed") + PARAMETERS + (
+    "episodes_run", "pruned", "training_success", "success_rate", "seconds")
+
+
+def configurations(space, trials=None, seed=0):
+    """Expand a search space into a list of full parameter dicts.
+
+    Each entry of ``space`` is either a list of values (grid axis) or a
+    ``{"low": a, "high": b, "log": bool}`` range. Pure grids are expanded in
+    full unless ``trials`` is given; any range switches to ``trials`` random
+    samples (default 20). Parameters not in the space keep their defaults.
+    """
+    unknown = set(space) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown parameters: {sorted(unknown)}")
+    ranges = {name: spec for name, spec in space.items() if isinstance(spec, dict)}
+    if not ranges and trials is None:
+        names = list(space)
+        return [dict(DEFAULTS, **dict(zip(names, values)))
+                for values in itertools.product(*(space[name] for name in names))]
+
+    rng = np.random.default_rng(seed)
+    configs = []
+    for _ in range(trials or 20):
+        config = dict(DEFAULTS)
+        for name, spec in space.items():
+            if isinstance(spec, dict):
+                low, high = spec["low"], spec["high"]
+                if spec.get("log"):
+                    config[name] = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+                else:
+                    config[name] = float(rng.uniform(low, high))
+            else:
+                config[name] = spec[rng.integers(len(spec))]
+        configs.append(config)
+    return configs
+
+
+class _EarlyStop:
+    """on_progress callback implementing a median stopping rule.
+
+    At every report the success rate over the last ``window`` finished
+    episodes is added to the trial's curve. The training success rate mostly
+    follows the epsilon schedule, so it is not compared with a fixed floor but
+    with the runs that already finished: once ``after`` of the episodes are
+    done and at least ``min_runs`` curves exist, a run whose rolling success
+    is below their median at the same report is pruned.
+
+    ``history`` holds (report, rolling success) pairs of finished runs and is
+    shared between worker processes.
+    """
+
+    def __init__(self, episodes, window, after, min_runs, history):
+        self.start_at = int(episodes * after)
+        self.window = window
+        self.min_runs = min_runs
+        self.history = history
+        self.completed = episodes
+        self.curve = []
+        self.pruned = False
+
+    def __call__(self, completed, rewards_per_episode, is_complete):
+        self.completed = completed
+        recent = rewards_per_episode[np.flatnonzero(is_complete)[-self.window:]]
+        report = len(self.curve)
+        self.curve.append(float(recent.mean()))
+        if completed < self.start_at:
+            return False
+        peers = [value for at, value in list(self.history) if at == report]
+        if len(peers) < self.min_runs:
+            return False
+        self.pruned = self.curve[-1] < float(np.median(peers))
+        return self.pruned
+
+    def publish(self):
+        """Add a finished (not pruned) run's curve to the shared history."""
+        if not self.pruned:
+            self.history.extend(enumerate(self.curve))
+
+
+def _run_trial(task):
+    """Pool worker: train one (configuration, seed) and evaluate the greedy policy."""
+    trial, seed, config, options, history = task
+    start = time.perf_counter()
+    stopper = _EarlyStop(options["episodes"], options["window"], options["stop_after"], options["min_runs"], history)
+    q, rewards = train_vectorized(
+        options["episodes"], n_envs=options["envs"], seed=seed, model=_model(),
+        discount_factor_g=config["discount_factor_g"],
+        epsilon_decay_rate=config["epsilon_decay_rate"],
+        learning_rate_tiers=tuple(config[f"lr_{i}"] for i in range(len(LEARNING_RATE_TIERS))),
+        on_progress=stopper, progress_every=options["window"],
+    )
+    stopper.publish()
+    success = None if stopper.pruned else float(evaluate_policy(q, options["eval_episodes"], model=_model(), seed=seed).mean())
+    result = {"trial": trial, "seed": seed}
+    result.update(config)
+    result.update(
+        episodes_run=stopper.completed,
+        pruned=stopper.pruned,
+        training_success=float(rewards[:stopper.completed].mean()),
+        success_rate=success,
+        seconds=time.perf_counter() - start,
+    )
+    return result
+
+
+_MODEL = None
+
+
+def _model():
+    # built once per worker process; gym.make is the slow part of a short trial
+    global _MODEL
+    if _MODEL is None:
+        _MODEL = TransitionModel.from_gym("8x8", is_slippery=True)
+    return _MODEL
+
+
+class _ResultWriter:
+    """Append one line per finished trial, flushed so a killed sweep keeps its results."""
+
+    def __init__(self, path):
+        self._file = open(path, "w", newline="")
+        self._csv = None
+        if not path.endswith(".jsonl"):
+            self._csv = csv.DictWriter(self._file, fieldnames=RESULT_FIELDS)
+            self._csv.writeheader()
+
+    def write(self, result):
+        if self._csv is not None:
+            self._csv.writerow(result)
+        else:
+            self._file.write(json.dumps(result) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def sweep(configs, seeds=3, episodes=15000, envs=64, eval_episodes=10000, workers=None,
+          output="sweep_results.jsonl", window=1000, stop_after=0.5, min_runs=3):
+    """Run every configuration with ``seeds`` seeds across a process pool.
+
+    Results are streamed to ``output`` (``.jsonl`` or CSV) as trials finish;
+    returns the list of per-run result dicts. Pruned runs (see _EarlyStop)
+    are not evaluated and have ``success_rate`` None.
+    """
+    options = dict(episodes=episodes, envs=envs, eval_episodes=eval_episodes,
+                   window=window, stop_after=stop_after, min_runs=min_runs)
+    workers = workers or os.cpu_count() or 1
+    manager = mp.Manager() if workers > 1 else None
+    history = manager.list() if manager is not None else []
+    tasks = [(trial, seed, config, options, history)
+             for trial, config in enumerate(configs) for seed in range(seeds)]
+
+    results = []
+    writer = _ResultWriter(output)
+    pool = None
+    try:
+        if workers == 1:
+            finished = map(_run_trial, tasks)
+        else:
+            pool = mp.Pool(workers)
+            finished = pool.imap_unordered(_run_trial, tasks)
+        for result in finished:
+            writer.write(result)
+            results.append(result)
+            outcome = "pruned" if result["pruned"] else f"{result['success_rate'] * 100:.2f}%"
+            print(f"trial {result['trial']} seed {result['seed']}: {outcome} ({result['seconds']:.1f}s)")
+        if pool is not None:
+            pool.close()
+            pool.join()
+    finally:
+        writer.close()
+        if pool is not None:
+            pool.terminate()
+        if manager is not None:
+            manager.shutdown()
+    return results
+
+
+def rank(results):
+    """Group runs by trial; sort by mean success rate, then by lower variance.
+
+    Pruned runs are the below-median seeds, so leaving them out would reward
+    the trials that lost them. Instead every run counts: a pruned run scores 0
+    (it has no greedy evaluation), and trials with any pruned run rank below
+    all fully evaluated trials. A variance needs at least two runs; with one,
+    it is infinite so such a trial loses ties.
+    """
+    trials = {}
+    for result in results:
+        trials.setdefault(result["trial"], []).append(result)
+    rows = []
+    for trial, runs in trials.items():
+        rates = np.array([0.0 if run["pruned"] else run["success_rate"] for run in runs])
+        rows.append({
+            "trial": trial,
+            "params": {name: runs[0][name] for name in PARAMETERS},
+            "mean": float(rates.mean()),
+            "var": float(rates.var(ddof=1)) if rates.size > 1 else float("inf"),
+            "runs": len(runs),
+            "pruned": sum(1 for run in runs if run["pruned"]),
+        })
+    rows.sort(key=lambda row: (row["pruned"] > 0, -row["mean"], row["var"]))
+    return rows
+
+
+def format_ranking(rows, top=10):
+    lines = [f"{'rank':>4} {'trial':>5} {'mean':>8} {'n':>3} {'std':>7} {'pruned':>7}  parameters"]
+    for i, row in enumerate(rows[:top], 1):
+        changed = {name: value for name, value in row["params"].items() if value != DEFAULTS[name]}
+        params = ", ".join(f"{name}={value:g}" for name, value in changed.items()) or "(defaults)"
+        std = "-" if np.isinf(row["var"]) else f"{np.sqrt(row['var']) * 100:.2f}%"
+        lines.append(f"{i:>4} {row['trial']:>5} {row['mean'] * 100:>7.2f}% {row['runs']:>3} {std:>7} "
+                     f"{row['pruned']:>3}/{row['runs']:<3}  {params}")
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Parallel hyperparameter sweep for the FrozenLake Q-learning schedule")
+    parser.add_argument("--space", help="JSON search space (parameter -> list of values or {low, high, log})")
+    parser.add_argument("--trials", type=int, default=None, help="random samples instead of the full grid")
+    parser.add_argument("--seeds", type=int, default=3, help="training seeds per configuration")
+    parser.add_argument("--episodes", type=int, default=15000)
+    parser.add_argument("--envs", type=int, default=64, help="episodes stepped in lockstep per trial")
+    parser.add_argument("--eval-episodes", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--window", type=int, default=1000, help="rolling window for early stopping")
+    parser.add_argument("--stop-after", type=float, default=0.5,
+                        help="fraction of episodes before a trial may be pruned")
+    parser.add_argument("--min-runs", type=int, default=3,
+                        help="finished runs needed before the median stopping rule prunes anything")
+    parser.add_argument("--output", default="sweep_results.jsonl", help=".jsonl or .csv")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0, help="seed for random search")
+    args = parser.parse_args()
+
+    space = DEFAULT_SPACE
+    if args.space:
+        with open(args.space) as f:
+            space = json.load(f)
+    configs = configurations(space, args.trials, args.seed)
+    print(f"{len(configs)} configurations x {args.seeds} seeds")
+
+    start = time.perf_counter()
+    results = sweep(configs, seeds=args.seeds, episodes=args.episodes, envs=args.envs,
+                    eval_episodes=args.eval_episodes, workers=args.workers, output=args.output,
+                    window=args.window, stop_after=args.stop_after, min_runs=args.min_runs)
+    print(f"\n{len(results)} runs in {time.perf_counter() - start:.1f}s, results in {args.output}\n")
+    print(format_ranking(rank(results), args.top))
@@ -0,0 +1,166 @@
+import argparse
+import time
+
+import numpy as np
+
+from frozen_lake import DISCOUNT_FACTOR_G, EPSILON_DECAY_RATE, LEARNING_RATE_TIERS, learning_rate_for
+from frozen_lake_model import TransitionModel
+from frozen_lake_store import save_qtable
+
+
+def schedules(episodes, epsilon_decay_rate=EPSILON_DECAY_RATE, learning_rate_tiers=LEARNING_RATE_TIERS):
+    """Per-episode epsilon and learning rate, exactly as the serial loop in run() produces them.
+
+    Episode i is played with epsilon[i] and learning_rate[i]; both are only
+    updated between episodes, so they can be precomputed.
+    """
+    epsilon = np.empty(episodes)
+    learning_rate = np.empty(episodes)
+    eps = 1
+    lr = learning_rate_tiers[0]
+    for i in range(episodes):
+        epsilon[i] = eps
+        learning_rate[i] = lr
+        eps = max(eps - epsilon_decay_rate, 0)
+        lr = learning_rate_for(eps, learning_rate_tiers)
+    return epsilon, learning_rate
+
+
+def _apply_updates(q, s, actions, reward, s_next, lr, discount_factor_g):
+    """Q-learning updates for one lockstep step, in env order.
+
+    Averaging the updates that share a (state, action) would learn only one
+    step's worth from the whole batch: with 64 envs all starting in state 0,
+    the table learns far less per episode than the serial loop, and some seeds
+    reach epsilon 0 with a still all-zero table. Instead, the k-th env to hit a
+    (state, action) is applied in round k, so each round has unique indices
+    and sees the values written by the rounds before it. Within a round the
+    TD targets read the table as it was before that round.
+    """
+    n_actions = q.shape[1]
+    flat = s * n_actions + actions
+    order = np.argsort(flat, kind="stable")
+    sorted_flat = flat[order]
+    first = np.ones(flat.size, dtype=bool)
+    first[1:] = sorted_flat[1:] != sorted_flat[:-1]
+    positions = np.arange(flat.size)
+    rank = np.empty(flat.size, dtype=np.int64)
+    rank[order] = positions - np.maximum.accumulate(np.where(first, positions, 0))
+
+    for k in range(int(rank.max()) + 1 if flat.size else 0):
+        sel = rank == k
+        ss, aa, nn = s[sel], actions[sel], s_next[sel]
+        td = reward[sel] + discount_factor_g * q[nn].max(axis=1) - q[ss, aa]
+        q[ss, aa] += lr[sel] * td
+
+
+def train_vectorized(episodes, n_envs=64, seed=None, model=None,
+                     discount_factor_g=DISCOUNT_FACTOR_G, epsilon_decay_rate=EPSILON_DECAY_RATE,
+                     learning_rate_tiers=LEARNING_RATE_TIERS, on_progress=None, progress_every=1000):
+    """Q-learning over ``n_envs`` independent FrozenLake episodes stepped in lockstep.
+
+    Each slot plays one episode at a time; when it ends, the slot starts the next
+    unplayed episode index, using that episode's epsilon / learning rate from
+    schedules(). Action selection, transition sampling and Q updates are all
+    array operations. Updates that hit the same (state, action) in one step
+    are applied one after another rather than averaged (see _apply_updates),
+    so each env's step counts as much as it would in the serial loop.
+
+    ``on_progress(completed, rewards_per_episode, is_complete)`` is called each
+    time another ``progress_every`` episodes have finished; ``is_complete`` marks
+    which episode indices are done (they finish out of order). Returning True
+    stops training early.
+
+    Returns (q, rewards_per_episode) with the same shapes as the serial loop.
+    """
+    if model is None:
+        model = TransitionModel.from_gym("8x8", is_slippery=True)
+    n_states, n_actions = model.n_states, model.n_actions
+    max_steps = model.max_episode_steps or np.inf
+    epsilon, learning_rate = schedules(episodes, epsilon_decay_rate, learning_rate_tiers)
+    rng = np.random.default_rng(seed)
+
+    q = np.zeros((n_states, n_actions))
+    rewards_per_episode = np.zeros(episodes)
+    is_complete = np.zeros(episodes, dtype=bool)
+    completed = 0
+    next_report = progress_every
+
+    n_envs = max(1, min(n_envs, episodes))
+    state = np.full(n_envs, model.initial_state, dtype=np.int64)
+    episode = np.arange(n_envs)
+    steps = np.zeros(n_envs, dtype=np.int64)
+    active = np.ones(n_envs, dtype=bool)
+    next_episode = n_envs
+
+    while active.any():
+        idx = np.flatnonzero(active)
+        s = state[idx]
+        ep = episode[idx]
+
+        # epsilon-greedy: np.argmax keeps the serial loop's first-max tie breaking
+        greedy = np.argmax(q[s], axis=1)
+        explore = rng.random(idx.size) < epsilon[ep]
+        actions = np.where(explore, rng.integers(0, n_actions, idx.size), greedy)
+
+        s_next, reward, terminated = model.sample(s, actions, rng.random(idx.size))
+
+        _apply_updates(q, s, actions, reward, s_next, learning_rate[ep], discount_factor_g)
+
+        steps[idx] += 1
+        state[idx] = s_next
+        done = terminated | (steps[idx] >= max_steps)
+        if not done.any():
+            continue
+
+        finished = idx[done]
+        rewards_per_episode[episode[finished]] = reward[done] == 1
+        is_complete[episode[finished]] = True
+        completed += finished.size
+        if on_progress is not None and completed >= next_report:
+            next_report += progress_every
+            if on_progress(completed, rewards_per_episode, is_complete):
+                break
+
+        n_new = min(finished.size, episodes - next_episode)
+        restart = finished[:n_new]
+        episode[restart] = np.arange(next_episode, next_episode + n_new)
+        state[restart] = model.initial_state
+        steps[restart] = 0
+        next_episode += n_new
+        active[finished[n_new:]] = False
+
+    return q, rewards_per_episode
+
+
+def run_vectorized(episodes, n_envs=64, seed=None, output='frozen_lake8x8.pkl', dtype=None):
+    """Batched replacement for run(episodes, is_training=True): writes the same Q-table file."""
+    q, rewards_per_episode = train_vectorized(episodes, n_envs=n_envs, seed=seed)
+    save_qtable(output, q, {
+        "map_name": "8x8",
+        "is_slippery": True,
+        "episodes": episodes,
+        "seed": seed,
+        "n_envs": n_envs,
+        "discount_factor_g": DISCOUNT_FACTOR_G,
+        "epsilon_decay_rate": EPSILON_DECAY_RATE,
+        "learning_rate_tiers": list(LEARNING_RATE_TIERS),
+    }, dtype=dtype)
+    return rewards_per_episode
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Vectorized multi-environment Q-learning for FrozenLake 8x8")
+    parser.add_argument("--episodes", type=int, default=15000)
+    parser.add_argument("--envs", type=int, default=64, help="episodes stepped in lockstep")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default='frozen_lake8x8.pkl', help=".pkl / .npy / .npz")
+    parser.add_argument("--float32", action="store_true", help="store the Q-table as float32")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rewards = run_vectorized(args.episodes, n_envs=args.envs, seed=args.seed, output=args.output,
+                             dtype=np.float32 if args.float32 else None)
+    elapsed = time.perf_counter() - start
+    print(f"Trained {args.episodes} episodes in {elapsed:.2f}s ({args.episodes / elapsed:,.0f} episodes/s), "
+          f"training success {rewards.mean() * 100:.2f}%")
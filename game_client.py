@@ -0,0 +1,169 @@
+# game_client.py
+"""
+game_server.py 的 client 與壓力測試工具。
+
+GameClient：一條連線，request() 送出一個請求並等待回應。
+直接執行時是 load generator：開 --clients 條連線同時對戰，
+每條連線以隨機的合法步當「人類」，和伺服器上的 AI 打 --games 局，
+最後回報每秒處理的走步數與 move 請求延遲的 p50 / p95 / p99。
+
+用法：
+    python game_server.py &
+    python game_client.py --clients 200 --games 20 --difficulty medium
+    python game_client.py --spawn --clients 500            # 自己開一個伺服器 process
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from game_server import DEFAULT_HOST, DEFAULT_PORT
+from instrumentation import percentile
+
+
+class GameClient:
+    """一條到 game_server 的連線；同一條連線上的請求依序送出、依序收到回應。"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._next_id = 0
+
+    @classmethod
+    async def connect(cls, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> "GameClient":
+        reader, writer = await asyncio.open_connection(host, port, limit=1 << 16)
+        return cls(reader, writer)
+
+    async def request(self, op: str, **fields: Any) -> Dict[str, Any]:
+        self._next_id += 1
+        message = {"id": self._next_id, "op": op, **fields}
+        self._writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+        await self._writer.drain()
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        return json.loads(line)
+
+    async def close(self) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
+
+
+# ========= load generator =========
+
+async def _player(host: str, port: int, games: int, difficulty: str, size: int, k: int,
+                  seed: int, latencies: List[float], counters: Dict[str, int]) -> None:
+    rng = random.Random(seed)
+    client = await GameClient.connect(host, port)
+    try:
+        for _ in range(games):
+            response = await client.request("create", mode="ai_vs_human", difficulty=difficulty,
+                                            size=size, k=k)
+            session = response["session"]
+            state = response["state"]
+            while not state["done"]:
+                empty = [i for i, cell in enumerate(state["board"]) if cell == "."]
+                start = time.perf_counter()
+                response = await client.request("move", session=session, action=rng.choice(empty))
+                latencies.append(time.perf_counter() - start)
+                if not response["ok"]:
+                    counters["errors"] += 1
+                    break
+                state = response["state"]
+                counters["moves"] += 1 + (response.get("ai_action") is not None)
+            await client.request("close", session=session)
+            counters["games"] += 1
+    finally:
+        await client.close()
+
+
+async def load_test(host: str, port: int, clients: int, games: int, difficulty: str,
+                    size: int = 3, k: int = 3, seed: int = 0) -> Dict[str, float]:
+    latencies: List[float] = []
+    counters = {"moves": 0, "games": 0, "errors": 0}
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _player(host, port, games, difficulty, size, k, seed + i, latencies, counters)
+        for i in range(clients)
+    ))
+    elapsed = time.perf_counter() - start
+    ms = sorted(t * 1000 for t in latencies)
+    return {
+        "clients": clients,
+        "games": counters["games"],
+        "moves": counters["moves"],
+        "errors": counters["errors"],
+        "elapsed": elapsed,
+        "moves_per_second": counters["moves"] / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": percentile(ms, 50),
+        "p95_ms": percentile(ms, 95),
+        "p99_ms": percentile(ms, 99),
+        "max_ms": ms[-1] if ms else 0.0,
+    }
+
+
+async def _wait_for_server(host: str, port: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+        else:
+            writer.close()
+            return
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="game_server.py 壓力測試")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--clients", type=int, default=100, help="同時連線數")
+    parser.add_argument("--games", type=int, default=10, help="每條連線打幾局")
+    parser.add_argument("--difficulty", default="hard")
+    parser.add_argument("--size", type=int, default=3)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--spawn", action="store_true", help="先啟動一個伺服器 process，測完關掉")
+    parser.add_argument("--processes", type=int, default=0, help="--spawn 時傳給伺服器的 --processes")
+    args = parser.parse_args()
+
+    server: Optional[subprocess.Popen] = None
+    if args.spawn:
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "game_server.py")
+        server = subprocess.Popen(
+            [sys.executable, script, "--host", args.host, "--port", str(args.port),
+             "--processes", str(args.processes)],
+            stdout=subprocess.DEVNULL,
+        )
+    try:
+        asyncio.run(_wait_for_server(args.host, args.port))
+        result = asyncio.run(load_test(args.host, args.port, args.clients, args.games,
+                                       args.difficulty, args.size, args.k, args.seed))
+    finally:
+        if server is not None:
+            # 用 SIGINT 讓伺服器走正常的關閉流程，process pool 的 worker 才會一起結束
+            server.send_signal(signal.SIGINT)
+            try:
+                server.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                server.kill()
+                server.wait()
+
+    print(f"{result['clients']} 條連線，{result['games']} 局，{result['moves']} 步"
+          f"（錯誤 {result['errors']}），耗時 {result['elapsed']:.2f} 秒")
+    print(f"{result['moves_per_second']:,.0f} 步 / 秒")
+    print(f"move 延遲：p50 {result['p50_ms']:.2f} ms，p95 {result['p95_ms']:.2f} ms，"
+          f"p99 {result['p99_ms']:.2f} ms，max {result['max_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
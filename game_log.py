@@ -0,0 +1,178 @@
+# game_log.py
+"""
+井字棋對局紀錄（JSON Lines，一行一局）：
+- GameLogWriter：附加寫入，內部有緩衝，每 flush_every 局才真正寫到磁碟
+- read_games()：generator，一次只讀一行，幾百萬局的檔案也不用整個載入記憶體
+- replay()：把一局紀錄重新在 TicTacToeEnvironment 上走一遍
+
+每一行的欄位（名稱刻意取短，讓檔案小一點）：
+    {"mode": "ai_vs_human", "x": "human", "o": "hard", "size": 3, "k": 3,
+     "first": "X", "moves": [4, 0, 8], "ms": [null, 1.234, null],
+     "winner": "X", "t": 1700000000.0}
+ms 是每一步 AI 的思考時間（毫秒），人類下的步是 null。
+
+用法：
+    python game_log.py game_log.jsonl              # 統計
+    python game_log.py game_log.jsonl --replay 0   # 逐步重播第 0 局
+"""
+import argparse
+import json
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from environment import TicTacToeEnvironment
+
+DEFAULT_LOG_PATH = "game_log.jsonl"
+
+
+class GameRecord:
+    """一局完整的紀錄。"""
+
+    def __init__(self, mode: str, x: str, o: str, first: str,
+                 moves: List[int], think_ms: List[Optional[float]],
+                 winner: Optional[str], size: int = 3, k: int = 3,
+                 timestamp: Optional[float] = None) -> None:
+        self.mode = mode
+        self.x = x              # X 的難度，人類是 "human"
+        self.o = o
+        self.first = first      # 先手 'X' / 'O'
+        self.moves = moves
+        self.think_ms = think_ms
+        self.winner = winner    # 'X' / 'O'，平手 None
+        self.size = size
+        self.k = k
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+    def to_dict(self) -> dict:
+        return {
+            "mode": self.mode, "x": self.x, "o": self.o,
+            "size": self.size, "k": self.k, "first": self.first,
+            "moves": self.moves, "ms": self.think_ms,
+            "winner": self.winner, "t": self.timestamp,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "GameRecord":
+        return cls(data["mode"], data["x"], data["o"], data["first"],
+                   data["moves"], data["ms"], data["winner"],
+                   data.get("size", 3), data.get("k", 3), data.get("t"))
+
+
+class GameLogWriter:
+    """
+    附加寫入對局紀錄。
+    檔案本身用大緩衝區開啟；每 flush_every 局（以及 close() 時）才 flush，
+    批次對戰大量寫入時不會每局都做一次系統呼叫。可以當 context manager 使用。
+    """
+
+    def __init__(self, path: str = DEFAULT_LOG_PATH, flush_every: int = 1000,
+                 buffer_size: int = 1 << 16) -> None:
+        self.path = path
+        self.flush_every = flush_every
+        self._file = open(path, "a", encoding="utf-8", buffering=buffer_size)
+        self._pending = 0
+        self.written = 0
+
+    def write(self, record: GameRecord) -> None:
+        self._file.write(json.dumps(record.to_dict(), separators=(",", ":")) + "\n")
+        self.written += 1
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        self._file.flush()
+        self._pending = 0
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> "GameLogWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_games(path: str = DEFAULT_LOG_PATH) -> Iterator[GameRecord]:
+    """
+    逐行讀出每一局（generator）。
+    寫到一半被中斷而不完整的行（通常是最後一行）會被略過。
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield GameRecord.from_dict(json.loads(line))
+            except (ValueError, KeyError):
+                continue
+
+
+def replay(record: GameRecord) -> Iterator[Tuple[int, TicTacToeEnvironment]]:
+    """
+    在新的 TicTacToeEnvironment 上依序重下每一步，每步之後 yield (action, env)。
+    env 是同一個物件，要保留某一步的局面請自行 copy()。
+    走完後若結果和紀錄不符，丟出 ValueError。
+    """
+    env = TicTacToeEnvironment(record.size, record.k)
+    env.current_player = record.first
+    for action in record.moves:
+        env.step(action)  # 不合法的一步會直接丟出 ValueError
+        yield action, env
+    if not env.done or env.winner != record.winner:
+        raise ValueError(f"Replay ended with winner={env.winner!r} (done={env.done}), "
+                         f"but the record says {record.winner!r}")
+
+
+def summarize(records: Iterator[GameRecord]) -> Dict[Tuple[str, str], List[float]]:
+    """串流統計：每組 (X, O) 的 [局數, X 勝, O 勝, 平手, AI 思考總毫秒, AI 步數]。"""
+    stats: Dict[Tuple[str, str], List[float]] = {}
+    for record in records:
+        row = stats.setdefault((record.x, record.o), [0, 0, 0, 0, 0.0, 0])
+        row[0] += 1
+        if record.winner == 'X':
+            row[1] += 1
+        elif record.winner == 'O':
+            row[2] += 1
+        else:
+            row[3] += 1
+        for ms in record.think_ms:
+            if ms is not None:
+                row[4] += ms
+                row[5] += 1
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="井字棋對局紀錄：統計 / 重播")
+    parser.add_argument("path", nargs="?", default=DEFAULT_LOG_PATH)
+    parser.add_argument("--replay", type=int, metavar="INDEX", help="逐步重播第 INDEX 局（從 0 開始）")
+    args = parser.parse_args()
+
+    if args.replay is not None:
+        for index, record in enumerate(read_games(args.path)):
+            if index == args.replay:
+                print(f"{record.x} (X) vs {record.o} (O)，{record.first} 先手")
+                for step, (action, env) in enumerate(replay(record), 1):
+                    print(f"\n第 {step} 步：{action}")
+                    print(env.render_text())
+                print(f"\n結果：{record.winner or '平手'}")
+                return
+        raise SystemExit(f"No game #{args.replay} in {args.path}")
+
+    start = time.perf_counter()
+    stats = summarize(read_games(args.path))
+    elapsed = time.perf_counter() - start
+    total = 0
+    print(f"{'X':<10}{'O':<10}{'局數':>8}{'X 勝':>8}{'O 勝':>8}{'平手':>8}{'平均思考 ms':>14}")
+    for (x, o), (games, x_win, o_win, draw, ms, ai_moves) in sorted(stats.items()):
+        avg = f"{ms / ai_moves:.3f}" if ai_moves else "-"
+        print(f"{x:<10}{o:<10}{games:>8}{x_win:>8}{o_win:>8}{draw:>8}{avg:>14}")
+        total += games
+    print(f"\n共 {total} 局，讀取耗時 {elapsed:.2f} 秒")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,30 @@
 # game_manager.py
-from typing import Literal, Optional
+import time
+from typing import List, Literal, Optional
 from environment import TicTacToeEnvironment
+from game_log import GameLogWriter, GameRecord
+from instrumentation import Metrics, instrument
+from stats_store import StatsStore
 from players import (
     Player,
     HumanPlayer,
+    AIPlayer,
     RandomAIPlayer,
     MediumAIPlayer,
     MinimaxAIPlayer,
+    TableAIPlayer,
+    HeuristicAIPlayer,
+    MCTSAIPlayer,
 )
+from tictactoe_table import table_exists
 import random  # 用來隨機決定先手
 
 
 GameMode = Literal["ai_vs_ai", "ai_vs_human", "human_vs_human"]
-Difficulty = Literal["easy", "medium", "hard"]
+Difficulty = Literal["easy", "medium", "hard", "mcts"]
+
+# 所有 AI 難度（tournament 等工具用來驗證 / 列舉策略名稱）
+DIFFICULTIES = ("easy", "medium", "hard", "mcts")
 
 
 class GameManager:
@@ -21,33 +33,38 @@ class GameManager:
     - 建立 environment + players
     - 控管輪流下棋
     - 提供 GUI 呼叫的方法
+    - 記錄這一局的每一步（history）與 AI 每步的思考時間（think_times）
     """
 
-    def __init__(self, mode: GameMode, difficulty: Difficulty = "hard") -> None:
+    def __init__(self, mode: GameMode, difficulty: Difficulty = "hard",
+                 size: int = 3, k: int = 3,
+                 o_difficulty: Optional[Difficulty] = None,
+                 log: Optional[GameLogWriter] = None,
+                 stats: Optional[StatsStore] = None,
+                 metrics: Optional[Metrics] = None) -> None:
+        """
+        o_difficulty：只用在 ai_vs_ai，讓 O 使用和 X 不同的難度
+        （例如 tournament 的 easy 對 hard）；None 代表和 difficulty 相同。
+        log / stats：有給的話，每一局結束時自動把 game_record() 寫進對局紀錄 / 累計戰績。
+        metrics：有給的話，AI 的策略會被包上 InstrumentedStrategy，
+        每一步的耗時 / 節點數 / cache 命中依難度名稱記進 metrics；None 時完全不包。
+        """
+        self.log = log
+        self.stats = stats
         self.mode: GameMode = mode
         self.difficulty: Difficulty = difficulty
-        self.env = TicTacToeEnvironment()
+        self.o_difficulty: Difficulty = o_difficulty or difficulty
+        # 棋盤大小 size x size、連成 k 個獲勝（預設標準 3x3 井字棋）
+        self.env = TicTacToeEnvironment(size, k)
 
         if mode == "ai_vs_ai":
-            if difficulty == "easy":
-                self.player_X = RandomAIPlayer('X')
-                self.player_O = RandomAIPlayer('O')
-            elif difficulty == "medium":
-                self.player_X = MediumAIPlayer('X')
-                self.player_O = MediumAIPlayer('O')
-            else:  # "hard"
-                self.player_X = MinimaxAIPlayer('X')
-                self.player_O = MinimaxAIPlayer('O')
+            self.player_X = self._create_ai_player(difficulty, 'X')
+            self.player_O = self._create_ai_player(self.o_difficulty, 'O')
 
         elif mode == "ai_vs_human":
             # 人類固定是 X，AI 是 O
             self.player_X = HumanPlayer('X')
-            if difficulty == "easy":
-                self.player_O = RandomAIPlayer('O')
-            elif difficulty == "medium":
-                self.player_O = MediumAIPlayer('O')
-            else:  # "hard"
-                self.player_O = MinimaxAIPlayer('O')
+            self.player_O = self._create_ai_player(difficulty, 'O')
 
         elif mode == "human_vs_human":
             # ✅ 新增：人類對人類
@@ -57,13 +74,79 @@ class GameManager:
         else:
             raise ValueError(f"Unsupported mode: {mode}")
 
+        self.metrics = metrics
+        if metrics is not None:
+            for symbol in ('X', 'O'):
+                instrument(self.player_X if symbol == 'X' else self.player_O,
+                           metrics, self.player_name(symbol))
+
         # 隨機決定這一局由 X 還是 O 先手
         self.env.current_player = random.choice(['X', 'O'])
+        self._start_record()
+
+    def _create_ai_player(self, difficulty: Difficulty, symbol: str) -> Player:
+        if difficulty == "easy":
+            return RandomAIPlayer(symbol)
+        elif difficulty == "medium":
+            return MediumAIPlayer(symbol)
+        elif difficulty == "mcts":
+            return MCTSAIPlayer(symbol)
+        else:  # "hard"
+            return self._hard_player(symbol)
+
+    def _hard_player(self, symbol: str) -> Player:
+        """
+        Hard：
+        - 3x3：有建好的完整解表就查表，否則用 Minimax 搜尋
+        - 大棋盤：深度受限的 alpha-beta + 啟發式評估
+        """
+        if self.env.size != 3 or self.env.k != 3:
+            return HeuristicAIPlayer(symbol)
+        if table_exists():
+            return TableAIPlayer(symbol)
+        return MinimaxAIPlayer(symbol)
 
     def reset(self) -> None:
         self.env.reset()
         # 重新開始遊戲時，也重新隨機先手
         self.env.current_player = random.choice(['X', 'O'])
+        self._start_record()
+
+    # ========= 對局紀錄 =========
+
+    def _start_record(self) -> None:
+        self.first_player: str = self.env.current_player
+        self.history: List[int] = []
+        # 每一步的 AI 思考時間（秒），人類下的步是 None
+        self.think_times: List[Optional[float]] = []
+        self._logged = False
+
+    def _record_move(self, action: int, think_time: Optional[float]) -> None:
+        self.history.append(action)
+        self.think_times.append(think_time)
+        if self.env.done and not self._logged and (self.log is not None or self.stats is not None):
+            self._logged = True
+            record = self.game_record()
+            if self.log is not None:
+                self.log.write(record)
+            if self.stats is not None:
+                self.stats.record_game(record)
+
+    def player_name(self, symbol: str) -> str:
+        """紀錄用的名稱：AI 是難度，人類是 "human"。"""
+        player = self.player_X if symbol == 'X' else self.player_O
+        if isinstance(player, HumanPlayer):
+            return "human"
+        return self.difficulty if symbol == 'X' else self.o_difficulty
+
+    def game_record(self) -> GameRecord:
+        """目前這一局（可以還沒結束）的紀錄。"""
+        return GameRecord(
+            self.mode, self.player_name('X'), self.player_name('O'), self.first_player,
+            list(self.history),
+            [None if t is None else round(t * 1000, 3) for t in self.think_times],
+            self.env.winner, self.env.size, self.env.k,
+        )
 
     def get_current_player(self) -> Player:
         return self.player_X if self.env.current_player == 'X' else self.player_O
@@ -86,6 +169,7 @@ class GameManager:
         if chosen is None:
             return
         self.env.step(chosen)
+        self._record_move(chosen, None)
 
     def ai_move(self) -> Optional[int]:
         """
@@ -97,8 +181,28 @@ class GameManager:
         player = self.get_current_player()
         if isinstance(player, HumanPlayer):
             return None
+        start = time.perf_counter()
         action = player.select_action(self.env)
-        if action is None:
+        return self.apply_ai_action(action, time.perf_counter() - start)
+
+    def apply_ai_action(self, action: Optional[int],
+                        think_time: Optional[float] = None) -> Optional[int]:
+        """
+        把 AI 算好的一步套用到真正的 env。
+        GUI 會在背景 thread 用 env.copy() 讓 AI 思考，算完再回主 thread 呼叫這裡；
+        若這段期間局面已經改變（結束 / 換人 / 格子被佔），就忽略這一步並回傳 None。
+        think_time：AI 想這一步花的秒數，記錄在 think_times。
+        """
+        if action is None or self.env.done or self.is_current_player_human():
+            return None
+        if action not in self.env.available_actions():
             return None
         self.env.step(action)
+        self._record_move(action, think_time)
         return action
+
+    def stop_ai(self) -> None:
+        """要求雙方 AI 中斷正在背景進行的搜尋。"""
+        for player in (self.player_X, self.player_O):
+            if isinstance(player, AIPlayer):
+                player.request_stop()
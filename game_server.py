@@ -0,0 +1,347 @@
+# game_server.py
+"""
+多人連線的井字棋伺服器（asyncio，TCP 上一行一個 JSON）。
+一個 process 同時管理上千個 GameManager（session），每個連線可以操作任意 session。
+
+請求（每行一個 JSON 物件，id 可省略，會原樣放回回應）：
+    {"id": 1, "op": "create", "mode": "ai_vs_human", "difficulty": "hard", "size": 3, "k": 3}
+    {"id": 2, "op": "move", "session": "1a2b...", "action": 4}
+    {"id": 3, "op": "step", "session": "1a2b..."}     # AI 對 AI：讓目前輪到的 AI 下一步
+    {"id": 4, "op": "state", "session": "1a2b..."}
+    {"id": 5, "op": "reset", "session": "1a2b..."}
+    {"id": 6, "op": "close", "session": "1a2b..."}
+回應：
+    {"id": 2, "ok": true, "session": "1a2b...", "state": {...}, "ai_action": 0}
+    {"id": 2, "ok": false, "error": "Invalid action: 4"}
+state 的 board 是長度 size*size 的字串，'.' 是空格。
+
+AI 對人類的 session 在人類下完（或 AI 先手時在 create / reset 之後）會自動讓 AI 回一步。
+easy / medium 只要幾微秒，直接在 event loop 上算；其他難度丟到 executor，
+event loop 不會因為 Minimax / MCTS 卡住。--processes N 改用 process pool，
+大量 CPU 密集的 AI 可以同時用到多個核心。
+
+同時存在的 session 超過 max_sessions 時，淘汰最久沒被用到的（LRU）。
+
+用法：
+    python game_server.py --port 8765
+    python game_client.py --port 8765 --clients 200 --games 20   # 壓力測試
+"""
+import argparse
+import asyncio
+import json
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from environment import TicTacToeEnvironment
+from game_manager import DIFFICULTIES, GameManager
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# 這些難度很快，直接在 event loop 上算，比丟到 executor 的來回成本還低
+INLINE_DIFFICULTIES = ("easy", "medium")
+
+MODES = ("ai_vs_ai", "ai_vs_human", "human_vs_human")
+
+# 棋盤邊長上限（連線表的大小隨邊長平方成長）
+MAX_SIZE = 19
+
+# 一行請求的長度上限（bytes），超過的回 Bad request
+MAX_LINE = 1 << 16
+
+
+class ProtocolError(Exception):
+    """請求本身有問題（欄位缺少、不合法的一步…），回傳給 client 的錯誤訊息。"""
+
+
+def encode_state(manager: GameManager) -> Dict[str, Any]:
+    env = manager.env
+    return {
+        "board": "".join(cell or "." for cell in env.board),
+        "size": env.size,
+        "k": env.k,
+        "current": env.current_player,
+        "done": env.done,
+        "winner": env.winner,
+        "first": manager.first_player,
+        "history": manager.history,
+    }
+
+
+# ========= process pool 用的 worker =========
+
+# 每個 worker process 自己的 AI 玩家：(難度, 棋盤大小, k) -> GameManager
+_REMOTE_MANAGERS: Dict[Tuple[str, int, int], GameManager] = {}
+
+
+def _remote_ai_action(difficulty: str, size: int, k: int, x_bits: int, o_bits: int,
+                      current: str) -> Optional[int]:
+    """在 worker process 裡算一步（AI 的狀態不跨 process，只傳局面過去）。"""
+    manager = _REMOTE_MANAGERS.get((difficulty, size, k))
+    if manager is None:
+        manager = _REMOTE_MANAGERS[(difficulty, size, k)] = GameManager(
+            "ai_vs_ai", difficulty, size, k)  # type: ignore[arg-type]
+    env = TicTacToeEnvironment(size, k)
+    env.set_position(x_bits, o_bits, current)
+    player = manager.player_X if current == 'X' else manager.player_O
+    return player.select_action(env)
+
+
+# ========= 讀取一行請求 =========
+
+async def _read_line(reader: asyncio.StreamReader) -> Optional[bytes]:
+    """
+    讀一行（含結尾的 \n），連線結束回傳 b""。
+    一行超過 reader 的 limit 時，把這一行到 \n 為止整行讀掉丟棄、回傳 None：
+    readline() 只丟掉緩衝區裡已經收到的部分，剩下的會被當成下一行，之後每個回應都會對錯請求。
+    """
+    try:
+        return await reader.readuntil(b"\n")
+    except asyncio.IncompleteReadError as exc:
+        return exc.partial
+    except asyncio.LimitOverrunError as exc:
+        consumed = exc.consumed
+    while True:
+        # LimitOverrunError 不會動到緩衝區：先丟掉已經確定沒有 \n 的部分再找
+        await reader.readexactly(consumed)
+        try:
+            await reader.readuntil(b"\n")
+            return None
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError as exc:
+            consumed = exc.consumed
+
+
+# ========= session =========
+
+class Session:
+    """一局遊戲；lock 讓同一個 session 的請求依序處理（AI 在 executor 思考時也一樣）。"""
+
+    def __init__(self, manager: GameManager) -> None:
+        self.manager = manager
+        self.lock = asyncio.Lock()
+
+
+class GameServer:
+    """
+    管理所有 session 並處理請求；handle() 不依賴網路，也可以直接在程式裡呼叫。
+    executor：非 INLINE_DIFFICULTIES 的 AI 在這裡思考；None 時用 4 個 thread。
+    process_executor=True 代表 executor 是 process pool，AI 改在 worker process 裡算。
+    """
+
+    def __init__(self, executor: Optional[Executor] = None, process_executor: bool = False,
+                 max_sessions: int = 100_000) -> None:
+        self.executor = executor or ThreadPoolExecutor(max_workers=4)
+        self.process_executor = process_executor
+        self.max_sessions = max_sessions
+        self.sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self.requests = 0
+        self.ai_moves = 0
+
+    # ========= 請求分派 =========
+
+    async def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        self.requests += 1
+        response: Dict[str, Any]
+        try:
+            op = request.get("op")
+            if op == "create":
+                response = await self._create(request)
+            elif op in ("move", "step", "state", "reset"):
+                session_id, session = self._session(request)
+                async with session.lock:
+                    response = await getattr(self, "_" + op)(session, request)
+                response["session"] = session_id
+                response["state"] = encode_state(session.manager)
+            elif op == "close":
+                session_id, _ = self._session(request)
+                del self.sessions[session_id]
+                response = {"session": session_id}
+            else:
+                raise ProtocolError(f"Unknown op: {op!r}")
+            response["ok"] = True
+        except ProtocolError as exc:
+            response = {"ok": False, "error": str(exc)}
+        except Exception as exc:  # 程式錯誤也只影響這個請求，不要斷掉整個連線
+            response = {"ok": False, "error": f"Internal error: {exc!r}"}
+        if "id" in request:
+            response["id"] = request["id"]
+        return response
+
+    def _session(self, request: Dict[str, Any]) -> Tuple[str, Session]:
+        session_id = request.get("session")
+        session = self.sessions.get(session_id)  # type: ignore[arg-type]
+        if session is None:
+            raise ProtocolError(f"Unknown session: {session_id!r}")
+        self.sessions.move_to_end(session_id)  # type: ignore[arg-type]
+        return session_id, session  # type: ignore[return-value]
+
+    # ========= 各個 op =========
+
+    async def _create(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        mode = request.get("mode", "ai_vs_human")
+        difficulty = request.get("difficulty", "hard")
+        o_difficulty = request.get("o_difficulty")
+        if mode not in MODES:
+            raise ProtocolError(f"Unknown mode: {mode!r}")
+        for name in (difficulty, o_difficulty):
+            if name is not None and name not in DIFFICULTIES:
+                raise ProtocolError(f"Unknown difficulty: {name!r}")
+        try:
+            size, k = int(request.get("size", 3)), int(request.get("k", 3))
+            if not 1 <= size <= MAX_SIZE:
+                raise ValueError(f"Board size must be between 1 and {MAX_SIZE}: {size}")
+            manager = GameManager(mode, difficulty, size, k, o_difficulty=o_difficulty)
+        except (TypeError, ValueError) as exc:
+            raise ProtocolError(str(exc)) from None
+        self._set_first(manager, request.get("first"))
+
+        session_id = uuid.uuid4().hex
+        session = Session(manager)
+        self.sessions[session_id] = session
+        while len(self.sessions) > self.max_sessions:
+            self.sessions.popitem(last=False)
+
+        async with session.lock:
+            response = await self._ai_reply(session)
+        response["session"] = session_id
+        response["state"] = encode_state(manager)
+        return response
+
+    async def _move(self, session: Session, request: Dict[str, Any]) -> Dict[str, Any]:
+        manager = session.manager
+        action = request.get("action")
+        if manager.env.done:
+            raise ProtocolError("Game already finished")
+        if not manager.is_current_player_human():
+            raise ProtocolError("Not a human player's turn")
+        # bool 是 int 的子類別，JSON 的 true / false 不可以當成第 1 / 0 格
+        if not isinstance(action, int) or isinstance(action, bool) or action not in manager.env.available_actions():
+            raise ProtocolError(f"Invalid action: {action!r}")
+        manager.human_move(action)
+        return await self._ai_reply(session)
+
+    async def _step(self, session: Session, request: Dict[str, Any]) -> Dict[str, Any]:
+        manager = session.manager
+        if manager.env.done:
+            raise ProtocolError("Game already finished")
+        if manager.is_current_player_human():
+            raise ProtocolError("It is a human player's turn")
+        return {"ai_action": await self._ai_move(manager)}
+
+    async def _state(self, session: Session, request: Dict[str, Any]) -> Dict[str, Any]:
+        return {}
+
+    async def _reset(self, session: Session, request: Dict[str, Any]) -> Dict[str, Any]:
+        session.manager.reset()
+        self._set_first(session.manager, request.get("first"))
+        return await self._ai_reply(session)
+
+    # ========= AI =========
+
+    @staticmethod
+    def _set_first(manager: GameManager, first: Optional[str]) -> None:
+        if first is None:
+            return
+        if first not in ('X', 'O'):
+            raise ProtocolError(f"first must be 'X' or 'O': {first!r}")
+        manager.env.current_player = first
+        manager.first_player = first
+
+    async def _ai_reply(self, session: Session) -> Dict[str, Any]:
+        """AI 對人類：輪到 AI 時讓它回一步。"""
+        manager = session.manager
+        if manager.mode != "ai_vs_human" or manager.env.done or manager.is_current_player_human():
+            return {}
+        return {"ai_action": await self._ai_move(manager)}
+
+    async def _ai_move(self, manager: GameManager) -> Optional[int]:
+        loop = asyncio.get_running_loop()
+        env = manager.env
+        symbol = env.current_player
+        difficulty = manager.player_name(symbol)
+        start = loop.time()
+        if difficulty in INLINE_DIFFICULTIES:
+            action = manager.get_current_player().select_action(env)
+        elif self.process_executor:
+            action = await loop.run_in_executor(
+                self.executor, _remote_ai_action, difficulty, env.size, env.k,
+                env.x_bits, env.o_bits, symbol)
+        else:
+            # AI 在副本上思考；回來之後才在 event loop 上改真正的 env
+            action = await loop.run_in_executor(
+                self.executor, manager.get_current_player().select_action, env.copy())
+        self.ai_moves += 1
+        return manager.apply_ai_action(action, loop.time() - start)
+
+    # ========= 網路 =========
+
+    async def serve_client(self, reader: asyncio.StreamReader,
+                           writer: asyncio.StreamWriter) -> None:
+        """一個連線：依序讀一行、處理、回一行。"""
+        try:
+            while True:
+                line = await _read_line(reader)
+                if line == b"":
+                    break
+                try:
+                    if line is None:
+                        raise ValueError(f"line longer than {MAX_LINE} bytes")
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be a JSON object")
+                except ValueError as exc:
+                    response: Dict[str, Any] = {"ok": False, "error": f"Bad request: {exc}"}
+                else:
+                    response = await self.handle(request)
+                writer.write(json.dumps(response, separators=(",", ":")).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.serve_client, host, port, limit=MAX_LINE)
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_server(host: str, port: int, processes: int = 0, threads: int = 4,
+                     max_sessions: int = 100_000) -> None:
+    executor: Executor
+    if processes > 0:
+        executor = ProcessPoolExecutor(max_workers=processes)
+    else:
+        executor = ThreadPoolExecutor(max_workers=threads)
+    server = GameServer(executor, processes > 0, max_sessions)
+    listener = await server.serve(host, port)
+    print(f"listening on {host}:{port}（{'process' if processes else 'thread'} executor）")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="井字棋多人連線伺服器（一行一個 JSON）")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--threads", type=int, default=4, help="AI 用的 thread 數")
+    parser.add_argument("--processes", type=int, default=0,
+                        help="改用 process pool 跑 AI（0 = 用 thread）")
+    parser.add_argument("--max-sessions", type=int, default=100_000)
+    args = parser.parse_args()
+    try:
+        asyncio.run(run_server(args.host, args.port, args.processes, args.threads, args.max_sessions))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
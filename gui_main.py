@@ -1,7 +1,27 @@
 # gui_main.py
+import queue
+import threading
+import time
 import tkinter as tk
-from typing import Optional
+from typing import List, Optional, Tuple
 from game_manager import GameManager, GameMode, Difficulty
+from game_log import DEFAULT_LOG_PATH, GameLogWriter
+from instrumentation import Metrics
+from stats_store import DEFAULT_STATS_PATH, StatsStore
+from environment import TicTacToeEnvironment
+from players import Player
+from speculation import SpeculationStats, SpeculativeSearch
+
+# 背景 AI 思考時，主 thread 檢查結果的間隔（毫秒）
+AI_POLL_MS = 30
+
+# ===== Turbo 連續對戰 =====
+# 畫面（棋盤 + 戰績）每秒最多重畫幾次，和背景實際下了幾步無關
+TURBO_FPS = 30
+# 速度滑桿的刻度：每秒幾步；第一格 2 步 / 秒 = 一般 AI 對 AI 的 500 ms 一步，None = 不限速
+TURBO_SPEEDS: Tuple[Optional[int], ...] = (2, 5, 20, 100, 500, 2000, 10000, None)
+# Turbo 背景 thread 每幾局才寫一次戰績資料庫 / 對局紀錄檔
+TURBO_BATCH = 1000
 
 
 class TicTacToeGUI:
@@ -10,20 +30,26 @@ class TicTacToeGUI:
         self.root.title("OOP Tic-Tac-Toe")
         self.root.resizable(False, False)
         self.root.configure(bg="#f4f4f8")
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
 
         self.manager: Optional[GameManager] = None
         self.buttons = []
         self.status_label: Optional[tk.Label] = None
+        self.think_label: Optional[tk.Label] = None
 
         # 難度選擇（預設 Hard）
         self.difficulty_var = tk.StringVar(value="hard")
 
         # ===== 多局戰績統計 =====
-        self.total_games = 0
-        self.x_wins = 0
-        self.o_wins = 0
-        self.draws = 0
-        self.game_recorded = False  # 這一局的結果是否已經計入戰績
+        # 每一局結束時由 GameManager 寫進 SQLite，關掉程式也不會消失；
+        # 戰績區塊直接從資料庫查目前這組配對（GUI 局數少，每局都 commit）
+        self.stats = StatsStore(DEFAULT_STATS_PATH, batch_size=1)
+
+        # 每一局結束都附加到對局紀錄檔（GUI 局數少，每局都 flush）
+        self.game_log = GameLogWriter(DEFAULT_LOG_PATH, flush_every=1)
+
+        # AI 每一步的耗時 / 節點數；狀態列下方顯示最近一步
+        self.metrics = Metrics()
 
         # 主畫面上的戰績 Label
         self.stats_total_label: Optional[tk.Label] = None
@@ -36,6 +62,46 @@ class TicTacToeGUI:
         self.game_frame: Optional[tk.Frame] = None
         self.after_id: Optional[str] = None
 
+        # ===== 背景 AI 思考 =====
+        # AI 在背景 thread 用棋盤副本思考，結果放進 queue，
+        # 主 thread 用 root.after 輪詢；每次取消就把 token +1，舊結果直接丟掉
+        # queue 裡是 (token, action, 思考秒數)
+        self._ai_results: "queue.Queue[Tuple[int, Optional[int], float]]" = queue.Queue()
+        self._ai_thread: Optional[threading.Thread] = None
+        self._ai_token = 0
+        self.ai_thinking = False
+
+        # ===== Turbo 連續對戰（只在 AI 對 AI）=====
+        # 背景 thread 自己開一個 GameManager 一局接一局下，只更新下面幾個共用欄位；
+        # 主 thread 用 root.after 以 TURBO_FPS 的頻率讀取並重畫，而不是每一步都重畫
+        self.turbo_speed_var = tk.IntVar(value=len(TURBO_SPEEDS) - 1)
+        self.turbo_button: Optional[tk.Button] = None
+        self.turbo_speed_label: Optional[tk.Label] = None
+        self._turbo_thread: Optional[threading.Thread] = None
+        self._turbo_stop: Optional[threading.Event] = None
+        self._turbo_manager: Optional[GameManager] = None
+        # 每一步之間至少間隔幾秒（0 = 不限速）；滑桿一動就改，背景 thread 每步重新讀
+        self._turbo_delay = 0.0
+        # [局數, X 勝, O 勝, 平手, 步數]，只有背景 thread 會寫
+        self._turbo_counts: List[int] = [0] * 5
+        # 最新的盤面 (x_bits, o_bits)，背景 thread 每步整個換掉
+        self._turbo_view: Tuple[int, int] = (0, 0)
+        # 開始 Turbo 時資料庫裡這組配對的戰績，畫面顯示 = 這個 + 本次的計數
+        self._turbo_base: Tuple[int, int, int, int] = (0, 0, 0, 0)
+        # 速率每半秒算一次：(時間, 局數, 步數)
+        self._turbo_rate_mark: Tuple[float, int, int] = (0.0, 0, 0)
+
+        # ===== 預先計算（只在 AI 對人類）=====
+        # 輪到人類時，背景先替人類每一種下法算好 AI 的回應；它和 AI 思考共用 _ai_thread，
+        # 所以 _start_ai_move 會等它停下來才開始真正的搜尋（不會兩個搜尋同時用同一個 AI）
+        self.speculation_stats = SpeculationStats()
+        self._speculation: Optional[SpeculativeSearch] = None
+        # 上一步 AI 是直接用預先算好的結果時，原本的搜尋秒數（顯示用）
+        self._last_speculative: Optional[float] = None
+
+        # 棋盤上每一格目前畫的是什麼，_render_cells 只重設有變的格子
+        self._rendered_cells: List[Optional[str]] = []
+
         self._build_mode_selection()
 
     # ---------- 共用工具：取消 after 排程 ----------
@@ -47,25 +113,28 @@ class TicTacToeGUI:
             except Exception:
                 pass
             self.after_id = None
+        self._cancel_ai_worker()
+        self._stop_speculation()
+        self._stop_turbo()
 
-    # ---------- 戰績：清零（回到主頁就清零） ----------
-
-    def _reset_stats(self) -> None:
-        self.total_games = 0
-        self.x_wins = 0
-        self.o_wins = 0
-        self.draws = 0
-        self.game_recorded = False
+    def _cancel_ai_worker(self) -> None:
+        """讓正在背景思考的 AI 結果作廢，並請它盡快停下來。"""
+        self._ai_token += 1
+        self.ai_thinking = False
+        if self.manager is not None:
+            self.manager.stop_ai()
 
     # ---------- 回到主頁 ----------
 
     def _back_to_home(self) -> None:
         self._cancel_scheduled_tasks()
-        self._reset_stats()
 
         self.manager = None
         self.buttons = []
         self.status_label = None
+        self.think_label = None
+        self.turbo_button = None
+        self.turbo_speed_label = None
 
         if self.game_frame is not None:
             self.game_frame.destroy()
@@ -73,6 +142,14 @@ class TicTacToeGUI:
 
         self._build_mode_selection()
 
+    # ---------- 關閉視窗 ----------
+
+    def _on_close(self) -> None:
+        self._cancel_scheduled_tasks()
+        self.game_log.close()
+        self.stats.close()
+        self.root.destroy()
+
     # ---------- 首頁：選擇模式 & 難度 ----------
 
     def _build_mode_selection(self) -> None:
@@ -151,6 +228,13 @@ class TicTacToeGUI:
         )
         rb_hard.pack(anchor="w")
 
+        rb_mcts = tk.Radiobutton(
+            diff_frame, text="MCTS：蒙地卡羅樹搜尋（每步 0.5 秒）",
+            variable=self.difficulty_var, value="mcts",
+            bg="#f4f4f8"
+        )
+        rb_mcts.pack(anchor="w")
+
         hint = tk.Label(
             frame,
             text="提示：難度只會影響 AI 模式（AI 對人類 / AI 對AI）",
@@ -172,11 +256,14 @@ class TicTacToeGUI:
             self.mode_frame = None
 
         difficulty: Difficulty = self.difficulty_var.get()  # type: ignore
-        self.manager = GameManager(mode, difficulty)
+        self.manager = GameManager(mode, difficulty, log=self.game_log, stats=self.stats,
+                                   metrics=self.metrics)
+        self.metrics.last = None
+        self._last_speculative = None
         self.manager.reset()
 
-        self.game_recorded = False
         self.buttons = []
+        self._rendered_cells = [None] * 9
 
         main_frame = tk.Frame(self.root, bg="#f4f4f8")
         main_frame.pack(fill="both", expand=True, padx=15, pady=15)
@@ -198,7 +285,7 @@ class TicTacToeGUI:
             "ai_vs_ai": "AI 對 AI",
             "human_vs_human": "人類 對 人類",
         }
-        diff_map = {"easy": "簡單", "medium": "中等", "hard": "困難"}
+        diff_map = {"easy": "簡單", "medium": "中等", "hard": "困難", "mcts": "MCTS"}
 
         mode_text = mode_map.get(mode, str(mode))
         # 人類對人類時，難度資訊其實不重要，但保留顯示也沒關係
@@ -222,7 +309,14 @@ class TicTacToeGUI:
             main_frame, text="", font=("Arial", 14),
             bg="#f4f4f8", fg="#333333"
         )
-        self.status_label.pack(pady=(5, 10))
+        self.status_label.pack(pady=(5, 0))
+
+        # 上一步 AI 的思考時間
+        self.think_label = tk.Label(
+            main_frame, text="", font=("Arial", 9),
+            bg="#f4f4f8", fg="#777777"
+        )
+        self.think_label.pack(pady=(0, 10))
 
         # 棋盤外框
         board_frame_outer = tk.Frame(main_frame, bg="#f4f4f8")
@@ -262,6 +356,29 @@ class TicTacToeGUI:
         )
         home_btn.grid(row=0, column=1, padx=6)
 
+        # AI 對 AI：Turbo 連續對戰開關 + 速度滑桿
+        if mode == "ai_vs_ai":
+            self.turbo_button = tk.Button(
+                control_frame, text="Turbo 連續對戰", command=self._toggle_turbo,
+                font=("Arial", 11),
+                width=32
+            )
+            self.turbo_button.grid(row=1, column=0, columnspan=2, pady=(8, 0))
+
+            speed_scale = tk.Scale(
+                control_frame, from_=0, to=len(TURBO_SPEEDS) - 1,
+                orient=tk.HORIZONTAL, showvalue=False, length=260,
+                variable=self.turbo_speed_var, command=self._on_turbo_speed,
+                bg="#f4f4f8", highlightthickness=0
+            )
+            speed_scale.grid(row=2, column=0, columnspan=2, pady=(4, 0))
+
+            self.turbo_speed_label = tk.Label(
+                control_frame, font=("Arial", 9), fg="#555555", bg="#f4f4f8"
+            )
+            self.turbo_speed_label.grid(row=3, column=0, columnspan=2)
+            self._on_turbo_speed(self.turbo_speed_var.get())
+
         # 分隔線
         sep = tk.Frame(main_frame, height=1, bg="#cccccc")
         sep.pack(fill="x", pady=(10, 6))
@@ -271,7 +388,7 @@ class TicTacToeGUI:
         stats_frame.pack(fill="x")
 
         stats_title = tk.Label(
-            stats_frame, text="多局戰績統計", font=("Arial", 12, "bold"),
+            stats_frame, text="累計戰績（本模式與難度）", font=("Arial", 12, "bold"),
             bg="#f4f4f8"
         )
         stats_title.grid(row=0, column=0, columnspan=2, sticky="w")
@@ -306,7 +423,6 @@ class TicTacToeGUI:
             return
 
         self.manager.reset()
-        self.game_recorded = False
         self._update_ui()
         self._update_stats_labels()
 
@@ -321,6 +437,8 @@ class TicTacToeGUI:
             return
         if not self.manager.is_current_player_human():
             self.after_id = self.root.after(400, self._ai_move_once)
+        else:
+            self._start_speculation()
 
     def _on_cell_clicked(self, idx: int) -> None:
         if self.manager is None or self.manager.env.done:
@@ -335,54 +453,289 @@ class TicTacToeGUI:
         if self.manager.mode == "ai_vs_ai":
             return
 
+        # AI 對人類：AI 思考中（或還沒輪到人類）時點擊無效
+        if self.ai_thinking or not self.manager.is_current_player_human():
+            return
+
+        if idx not in self.manager.env.available_actions():
+            return
+
         # AI 對人類：人類下棋
+        speculation = self._speculation
+        self._stop_speculation()
         self.manager.human_move(idx)
         self._update_ui()
+        if self.manager.env.done:
+            return
 
-        if not self.manager.env.done:
-            self.after_id = self.root.after(400, self._ai_move_once)
+        reply = speculation.lookup(self.manager.env) if speculation is not None else None
+        if reply is not None:
+            # 命中：AI 的回應已經算好，直接下，不用等搜尋也不用再延遲
+            action, think_time = reply
+            self._last_speculative = think_time
+            self.manager.apply_ai_action(action, think_time)
+            self._update_ui()
+            self._after_ai_move()
+            return
+        # 沒算到：馬上開始搜尋（還在跑的預先計算會先停下來）
+        self._start_ai_move()
 
     def _ai_move_once(self) -> None:
         self.after_id = None
-        if self.manager is None or self.manager.env.done:
-            return
-        self.manager.ai_move()
-        self._update_ui()
+        self._start_ai_move()
 
     def _ai_vs_ai_loop(self) -> None:
         self.after_id = None
+        self._start_ai_move()
+
+    def _after_ai_move(self) -> None:
+        """AI 的一步已經套用到棋盤：AI 對 AI 就排下一步，AI 對人類就開始預先計算。"""
         if self.manager is None or self.manager.env.done:
             return
-        self.manager.ai_move()
-        self._update_ui()
-        if not self.manager.env.done:
+        if self.manager.mode == "ai_vs_ai":
             self.after_id = self.root.after(500, self._ai_vs_ai_loop)
+        elif self.manager.mode == "ai_vs_human":
+            self._start_speculation()
 
-    # ---------- 戰績統計 ----------
+    # ---------- 預先計算 AI 的回應 ----------
 
-    def _record_result(self) -> None:
-        if self.manager is None:
+    def _start_speculation(self) -> None:
+        """輪到人類：在背景替人類每一種可能的下法先算好 AI 的回應。"""
+        if self.manager is None or self.manager.env.done:
+            return
+        if not self.manager.is_current_player_human():
+            return
+        if self._ai_thread is not None and self._ai_thread.is_alive():
+            # 上一個（已取消的）搜尋還沒停下來，稍後再試
+            self.after_id = self.root.after(AI_POLL_MS, self._start_speculation)
             return
+
         env = self.manager.env
-        if not env.done:
+        ai_player = self.manager.player_O if env.current_player == 'X' else self.manager.player_X
+        self._speculation = SpeculativeSearch(ai_player, env, self.speculation_stats)
+        self._ai_thread = threading.Thread(target=self._speculation.run, daemon=True)
+        self._ai_thread.start()
+
+    def _stop_speculation(self) -> None:
+        if self._speculation is not None:
+            self._speculation.stop()
+            self._speculation = None
+
+    # ---------- 背景 AI 思考 ----------
+
+    def _start_ai_move(self) -> None:
+        """把目前輪到的 AI 丟到背景 thread 思考，主 thread 繼續處理畫面。"""
+        if self.manager is None or self.manager.env.done:
+            return
+        if self.manager.is_current_player_human():
+            return
+        if self._ai_thread is not None and self._ai_thread.is_alive():
+            # 上一個（已取消的）搜尋或預先計算還沒停下來，稍後再試，避免兩個搜尋同時用同一個 AI；
+            # 這段時間已經算是 AI 在思考，先擋住點擊
+            self.ai_thinking = True
+            self._update_ui()
+            self.after_id = self.root.after(AI_POLL_MS, self._start_ai_move)
             return
-        if self.game_recorded:
+
+        player = self.manager.get_current_player()
+        snapshot = self.manager.env.copy()
+        token = self._ai_token
+        self._ai_thread = threading.Thread(
+            target=self._ai_worker, args=(token, player, snapshot), daemon=True
+        )
+        self.ai_thinking = True
+        self._update_ui()
+        self._ai_thread.start()
+        self.after_id = self.root.after(AI_POLL_MS, self._poll_ai_result)
+
+    def _ai_worker(self, token: int, player: Player, env: TicTacToeEnvironment) -> None:
+        """背景 thread：只做計算，不可以碰任何 tkinter 物件。"""
+        start = time.perf_counter()
+        try:
+            action = player.select_action(env)
+        except Exception:
+            action = None
+        self._ai_results.put((token, action, time.perf_counter() - start))
+
+    def _poll_ai_result(self) -> None:
+        self.after_id = None
+        while True:
+            try:
+                token, action, think_time = self._ai_results.get_nowait()
+            except queue.Empty:
+                # 還在想，過一會再看
+                self.after_id = self.root.after(AI_POLL_MS, self._poll_ai_result)
+                return
+            if token == self._ai_token:
+                break
+            # 已取消的舊結果，丟掉
+
+        self.ai_thinking = False
+        if self.manager is None:
             return
+        self._last_speculative = None
+        self.manager.apply_ai_action(action, think_time)
+        self._update_ui()
+        self._after_ai_move()
 
-        self.game_recorded = True
-        self.total_games += 1
+    # ---------- Turbo 連續對戰 ----------
 
-        if env.winner == 'X':
-            self.x_wins += 1
-        elif env.winner == 'O':
-            self.o_wins += 1
+    def _toggle_turbo(self) -> None:
+        if self._turbo_stop is None:
+            self._start_turbo()
+        else:
+            # 停下來後回到一般的單局對戰（戰績改回直接查資料庫）
+            self._reset_game()
+
+    def _on_turbo_speed(self, value) -> None:
+        """滑桿移動：更新每步間隔（背景 thread 下一步就會套用）與說明文字。"""
+        speed = TURBO_SPEEDS[int(float(value))]
+        self._turbo_delay = 0.0 if speed is None else 1.0 / speed
+        if self.turbo_speed_label is None:
+            return
+        if speed is None:
+            text = "速度：不限速"
+        elif speed == TURBO_SPEEDS[0]:
+            text = f"速度：每秒 {speed} 步（即時）"
         else:
-            self.draws += 1
+            text = f"速度：每秒 {speed:,} 步"
+        self.turbo_speed_label.config(text=text)
+
+    def _start_turbo(self) -> None:
+        if self.manager is None or self.manager.mode != "ai_vs_ai":
+            return
+        # 停掉進行中的單局（含背景思考），Turbo 從新的一局開始
+        self._cancel_scheduled_tasks()
+        self.manager.reset()
+        self.metrics.last = None
+
+        self._turbo_base = self.stats.totals(
+            mode=self.manager.mode,
+            x=self.manager.player_name('X'),
+            o=self.manager.player_name('O'),
+        )
+        self._turbo_counts = [0] * 5
+        self._turbo_view = (0, 0)
+        self._turbo_rate_mark = (time.perf_counter(), 0, 0)
+        if self.think_label is not None:
+            self.think_label.config(text="")
+
+        stop = threading.Event()
+        self._turbo_stop = stop
+        self._turbo_thread = threading.Thread(
+            target=self._turbo_worker,
+            args=(self.manager.difficulty, self.manager.o_difficulty, stop),
+            daemon=True,
+        )
+        self._turbo_thread.start()
+        if self.turbo_button is not None:
+            self.turbo_button.config(text="停止 Turbo")
+        self._turbo_frame()
+
+    def _stop_turbo(self) -> None:
+        """請背景 thread 停下並等它把戰績 / 紀錄寫完，之後查資料庫就是最新的。"""
+        if self._turbo_stop is None:
+            return
+        self._turbo_stop.set()
+        self._turbo_stop = None
+        if self._turbo_manager is not None:
+            # MCTS 這類有時間預算的搜尋也立刻中斷
+            self._turbo_manager.stop_ai()
+        if self._turbo_thread is not None:
+            self._turbo_thread.join(timeout=5)
+            self._turbo_thread = None
+        self._turbo_manager = None
+        if self.turbo_button is not None:
+            self.turbo_button.config(text="Turbo 連續對戰")
+
+    def _turbo_worker(self, difficulty: Difficulty, o_difficulty: Difficulty,
+                      stop: threading.Event) -> None:
+        """
+        背景 thread：一局接一局地下，不可以碰任何 tkinter 物件。
+        SQLite 連線不能跨 thread 使用，所以這裡自己開戰績資料庫與對局紀錄，
+        並且每 TURBO_BATCH 局才寫一次，停下來時再把剩下的寫完。
+        """
+        log = GameLogWriter(DEFAULT_LOG_PATH, flush_every=TURBO_BATCH)
+        stats = StatsStore(DEFAULT_STATS_PATH, batch_size=TURBO_BATCH)
+        manager = GameManager("ai_vs_ai", difficulty, o_difficulty=o_difficulty,
+                              log=log, stats=stats)
+        self._turbo_manager = manager
+        env = manager.env
+        counts = self._turbo_counts
+        result_index = {'X': 1, 'O': 2, None: 3}
+        next_move = time.perf_counter()
+        try:
+            while not stop.is_set():
+                if env.done:
+                    manager.reset()
+                if manager.ai_move() is None:
+                    break
+                self._turbo_view = (env.x_bits, env.o_bits)
+                counts[4] += 1
+                if env.done:
+                    counts[result_index[env.winner]] += 1
+                    counts[0] += 1
+
+                # 限速：依滑桿的間隔排下一步的時間；落後太多就不追（例如 MCTS 本身就比較慢）
+                delay = self._turbo_delay
+                if delay > 0:
+                    next_move += delay
+                    ahead = next_move - time.perf_counter()
+                    if ahead > 0:
+                        stop.wait(ahead)
+                    elif ahead < -0.1:
+                        next_move = time.perf_counter()
+                else:
+                    next_move = time.perf_counter()
+        finally:
+            log.close()
+            stats.close()
+
+    def _turbo_frame(self) -> None:
+        """以 TURBO_FPS 的頻率把背景 thread 的最新盤面與戰績畫出來。"""
+        self.after_id = None
+        if self._turbo_stop is None:
+            return
+        if self._turbo_thread is not None and not self._turbo_thread.is_alive():
+            # 背景 thread 意外結束（例如 AI 沒有回傳合法的一步）
+            self._reset_game()
+            return
+
+        x_bits, o_bits = self._turbo_view
+        self._render_cells([
+            'X' if x_bits >> i & 1 else 'O' if o_bits >> i & 1 else None
+            for i in range(9)
+        ])
+
+        games, x_w, o_w, d_w, moves = list(self._turbo_counts)
+        base_total, base_x, base_o, base_d = self._turbo_base
+        self._show_stats(base_total + games, base_x + x_w, base_o + o_w, base_d + d_w)
+
+        if self.status_label is not None:
+            self.status_label.config(text=f"Turbo 連續對戰中：本次 {games:,} 局")
+        now = time.perf_counter()
+        mark_time, mark_games, mark_moves = self._turbo_rate_mark
+        if now - mark_time >= 0.5 and self.think_label is not None:
+            elapsed = now - mark_time
+            self.think_label.config(
+                text=f"{(games - mark_games) / elapsed:,.0f} 局 / 秒，"
+                     f"{(moves - mark_moves) / elapsed:,.0f} 步 / 秒"
+            )
+            self._turbo_rate_mark = (now, games, moves)
 
+        self.after_id = self.root.after(1000 // TURBO_FPS, self._turbo_frame)
+
+    # ---------- 戰績統計 ----------
+
+    def _record_result(self) -> None:
+        """這一局已經由 GameManager 寫進戰績資料庫，這裡只需要重新整理畫面。"""
+        if self.manager is None or not self.manager.env.done:
+            return
         self._update_stats_labels()
 
     def _update_stats_labels(self) -> None:
         if (
+            self.manager is None or
             self.stats_total_label is None or
             self.stats_x_label is None or
             self.stats_o_label is None or
@@ -390,10 +743,21 @@ class TicTacToeGUI:
         ):
             return
 
-        total = self.total_games
-        x_w = self.x_wins
-        o_w = self.o_wins
-        d_w = self.draws
+        # 目前這組配對（模式 + 雙方難度）的累計戰績
+        self._show_stats(*self.stats.totals(
+            mode=self.manager.mode,
+            x=self.manager.player_name('X'),
+            o=self.manager.player_name('O'),
+        ))
+
+    def _show_stats(self, total: int, x_w: int, o_w: int, d_w: int) -> None:
+        if (
+            self.stats_total_label is None or
+            self.stats_x_label is None or
+            self.stats_o_label is None or
+            self.stats_draw_label is None
+        ):
+            return
 
         if total > 0:
             x_rate = x_w / total * 100
@@ -402,10 +766,10 @@ class TicTacToeGUI:
         else:
             x_rate = o_rate = d_rate = 0.0
 
-        self.stats_total_label.config(text=f"總對局數：{total}")
-        self.stats_x_label.config(text=f"X 勝：{x_w} 局（{x_rate:.1f}%）")
-        self.stats_o_label.config(text=f"O 勝：{o_w} 局（{o_rate:.1f}%）")
-        self.stats_draw_label.config(text=f"平手：{d_w} 局（{d_rate:.1f}%）")
+        self.stats_total_label.config(text=f"總對局數：{total:,}")
+        self.stats_x_label.config(text=f"X 勝：{x_w:,} 局（{x_rate:.1f}%）")
+        self.stats_o_label.config(text=f"O 勝：{o_w:,} 局（{o_rate:.1f}%）")
+        self.stats_draw_label.config(text=f"平手：{d_w:,} 局（{d_rate:.1f}%）")
 
     # ---------- UI 更新 ----------
 
@@ -413,16 +777,7 @@ class TicTacToeGUI:
         if self.manager is None:
             return
         env = self.manager.env
-
-        for i, btn in enumerate(self.buttons):
-            value = env.board[i]
-            if value is None:
-                btn.config(text=" ", state="normal", fg="#000000")
-            else:
-                if value == 'X':
-                    btn.config(text="X", fg="#0070f3", state="disabled")
-                else:
-                    btn.config(text="O", fg="#e84118", state="disabled")
+        self._render_cells(env.board)
 
         if self.status_label is None:
             return
@@ -433,10 +788,41 @@ class TicTacToeGUI:
                 self.status_label.config(text="平手！")
             else:
                 self.status_label.config(text=f"{env.winner} 勝利！")
+        elif self.ai_thinking:
+            self.status_label.config(text=f"{env.current_player} 思考中…")
         else:
             # 顯示目前輪到誰（在人類對人類時也很重要）
             self.status_label.config(text=f"輪到 {env.current_player}")
 
+        if self.think_label is not None:
+            last = self.metrics.last
+            if self._last_speculative is not None:
+                text = f"上一步 AI 已預先算好（原本要思考 {self._last_speculative * 1000:.2f} ms）"
+            elif last is None:
+                text = ""
+            else:
+                text = f"上一步 AI（{last.strategy}）思考 {last.seconds * 1000:.2f} ms"
+                if last.nodes is not None:
+                    text += f"，{last.nodes:,} 個節點"
+            if self.manager.mode == "ai_vs_human" and self.speculation_stats.lookups:
+                text = "\n".join(filter(None, (text, self.speculation_stats.summary())))
+            self.think_label.config(text=text)
+
+    def _render_cells(self, cells: List[Optional[str]]) -> None:
+        """只重新設定和上次畫的不一樣的格子（Turbo 模式每秒會重畫很多次）。"""
+        rendered = self._rendered_cells
+        for i, btn in enumerate(self.buttons):
+            value = cells[i]
+            if rendered[i] == value:
+                continue
+            rendered[i] = value
+            if value is None:
+                btn.config(text=" ", state="normal", fg="#000000")
+            elif value == 'X':
+                btn.config(text="X", fg="#0070f3", state="disabled")
+            else:
+                btn.config(text="O", fg="#e84118", state="disabled")
+
 
 if __name__ == "__main__":
     root = tk.Tk()
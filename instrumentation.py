@@ -0,0 +1,214 @@
+# instrumentation.py
+"""
+AI 每一步的量測（instrumentation）：
+- InstrumentedStrategy：包住任何 AIStrategy 的 proxy，記錄每次決策的
+  耗時、拜訪節點數、置換表 / 解表的命中與未命中次數
+- Metrics：依 (策略名稱, 棋盤上已有幾顆子) 分組收集，
+  輸出 p50 / p95 / p99、直方圖、表格與 JSON
+
+關閉模式：Metrics(enabled=False) 時 proxy 只多一次屬性檢查就直接呼叫原本的策略；
+完全不需要量測時，不要傳 metrics 給 GameManager，就不會包 proxy。
+
+只用標準函式庫（井字棋部分不依賴 numpy）。
+"""
+import bisect
+import json
+import math
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from players import AIPlayer, AIStrategy, Player
+
+# 耗時直方圖的邊界（毫秒，1-2-5 級距）；最後一格是「超過 1000 ms」
+HISTOGRAM_EDGES_MS: Tuple[float, ...] = tuple(
+    m * 10.0 ** e for e in range(-3, 3) for m in (1, 2, 5)
+) + (1000.0,)
+
+# (策略名稱, 棋盤上已有的棋子數)
+MetricsKey = Tuple[str, int]
+
+
+def percentile(sorted_values, p: float) -> float:
+    """nearest-rank 百分位數；sorted_values 必須已排序。"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class _Samples:
+    """一組 (策略, 棋子數) 的原始量測值，用 array 存比 list of float 省記憶體。"""
+
+    def __init__(self) -> None:
+        self.seconds = array('d')
+        self.nodes = array('q')
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def merge(self, other: "_Samples") -> None:
+        self.seconds.extend(other.seconds)
+        self.nodes.extend(other.nodes)
+        self.cache_hits += other.cache_hits
+        self.cache_misses += other.cache_misses
+
+
+class DecisionRecord:
+    """最近一次決策（GUI 顯示用）。"""
+
+    def __init__(self, strategy: str, fill: int, seconds: float, nodes: Optional[int]) -> None:
+        self.strategy = strategy
+        self.fill = fill
+        self.seconds = seconds
+        self.nodes = nodes
+
+
+class Metrics:
+    """
+    收集每次決策的量測值。
+    enabled 可以在執行中切換；關閉時 InstrumentedStrategy 不做任何量測。
+    多個 process 的結果可以用 merge() 合併（Metrics 可以 pickle）。
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._samples: Dict[MetricsKey, _Samples] = {}
+        self.last: Optional[DecisionRecord] = None
+
+    def record(self, strategy: str, fill: int, seconds: float,
+               nodes: Optional[int] = None, cache_hits: int = 0, cache_misses: int = 0) -> None:
+        samples = self._samples.get((strategy, fill))
+        if samples is None:
+            samples = self._samples[(strategy, fill)] = _Samples()
+        samples.seconds.append(seconds)
+        if nodes is not None:
+            samples.nodes.append(nodes)
+        samples.cache_hits += cache_hits
+        samples.cache_misses += cache_misses
+        self.last = DecisionRecord(strategy, fill, seconds, nodes)
+
+    def merge(self, other: "Metrics") -> None:
+        for key, samples in other._samples.items():
+            self._samples.setdefault(key, _Samples()).merge(samples)
+
+    def clear(self) -> None:
+        self._samples.clear()
+        self.last = None
+
+    @property
+    def decisions(self) -> int:
+        return sum(len(s.seconds) for s in self._samples.values())
+
+    # ========= 輸出 =========
+
+    def _groups(self, by_fill: bool) -> Dict[MetricsKey, _Samples]:
+        if by_fill:
+            return self._samples
+        groups: Dict[MetricsKey, _Samples] = {}
+        for (strategy, _), samples in self._samples.items():
+            groups.setdefault((strategy, -1), _Samples()).merge(samples)
+        return groups
+
+    def summary(self, by_fill: bool = True) -> List[dict]:
+        """
+        每組一列：count、耗時（毫秒）的 mean / p50 / p95 / p99 / max、
+        節點數的 mean / p99、cache 命中率。by_fill=False 時不分棋子數（fill = -1）。
+        """
+        rows = []
+        for (strategy, fill), samples in sorted(self._groups(by_fill).items()):
+            ms = sorted(s * 1000 for s in samples.seconds)
+            nodes = sorted(samples.nodes)
+            lookups = samples.cache_hits + samples.cache_misses
+            rows.append({
+                "strategy": strategy,
+                "fill": fill,
+                "count": len(ms),
+                "mean_ms": sum(ms) / len(ms) if ms else 0.0,
+                "p50_ms": percentile(ms, 50),
+                "p95_ms": percentile(ms, 95),
+                "p99_ms": percentile(ms, 99),
+                "max_ms": ms[-1] if ms else 0.0,
+                "nodes_mean": sum(nodes) / len(nodes) if nodes else None,
+                "nodes_p99": percentile(nodes, 99) if nodes else None,
+                "cache_hit_rate": samples.cache_hits / lookups if lookups else None,
+            })
+        return rows
+
+    def histograms(self, by_fill: bool = False) -> Dict[str, List[int]]:
+        """耗時直方圖：每組的各格計數，格子邊界是 HISTOGRAM_EDGES_MS。"""
+        result = {}
+        for (strategy, fill), samples in sorted(self._groups(by_fill).items()):
+            counts = [0] * (len(HISTOGRAM_EDGES_MS) + 1)
+            for s in samples.seconds:
+                counts[bisect.bisect_left(HISTOGRAM_EDGES_MS, s * 1000)] += 1
+            result[strategy if fill < 0 else f"{strategy}@{fill}"] = counts
+        return result
+
+    def format_table(self, by_fill: bool = False) -> str:
+        lines = [f"{'策略':<10}{'棋子數':>6}{'次數':>9}{'p50 ms':>10}{'p95 ms':>10}"
+                 f"{'p99 ms':>10}{'max ms':>10}{'平均節點':>10}{'命中率':>8}"]
+        for row in self.summary(by_fill):
+            fill = "全部" if row["fill"] < 0 else str(row["fill"])
+            nodes = "-" if row["nodes_mean"] is None else f"{row['nodes_mean']:.0f}"
+            hit = "-" if row["cache_hit_rate"] is None else f"{row['cache_hit_rate']:.1%}"
+            lines.append(f"{row['strategy']:<10}{fill:>6}{row['count']:>9}{row['p50_ms']:>10.3f}"
+                         f"{row['p95_ms']:>10.3f}{row['p99_ms']:>10.3f}{row['max_ms']:>10.3f}"
+                         f"{nodes:>10}{hit:>8}")
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict:
+        return {
+            "by_strategy": self.summary(by_fill=False),
+            "by_fill": self.summary(by_fill=True),
+            "histogram_edges_ms": list(HISTOGRAM_EDGES_MS),
+            "histograms": self.histograms(by_fill=False),
+        }
+
+    def dump(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+class InstrumentedStrategy(AIStrategy):
+    """
+    包住另一個 AIStrategy 的 proxy：每次 choose_action 都記進 metrics。
+    nodes 用內部策略 counters() 回報的值；cache 命中 / 未命中是決策前後累計值的差。
+    其他屬性（例如 nodes、table）都轉給內部策略，原本的程式不用改。
+    """
+
+    def __init__(self, inner: AIStrategy, metrics: Metrics, name: Optional[str] = None) -> None:
+        self.inner = inner
+        self.metrics = metrics
+        self.name = name or type(inner).__name__
+
+    def choose_action(self, env) -> Optional[int]:
+        if not self.metrics.enabled:
+            return self.inner.choose_action(env)
+        fill = (env.x_bits | env.o_bits).bit_count()
+        before = self.inner.counters()
+        start = time.perf_counter()
+        action = self.inner.choose_action(env)
+        seconds = time.perf_counter() - start
+        after = self.inner.counters()
+        self.metrics.record(
+            self.name, fill, seconds, after.get("nodes"),
+            after.get("cache_hits", 0) - before.get("cache_hits", 0),
+            after.get("cache_misses", 0) - before.get("cache_misses", 0),
+        )
+        return action
+
+    def request_stop(self) -> None:
+        self.inner.request_stop()
+
+    def counters(self) -> Dict[str, int]:
+        return self.inner.counters()
+
+    def __getattr__(self, name):
+        # 只有在 proxy 本身找不到屬性時才會進來
+        return getattr(self.inner, name)
+
+
+def instrument(player: Player, metrics: Metrics, name: Optional[str] = None) -> None:
+    """把 AI 玩家的策略換成 InstrumentedStrategy（人類玩家不處理）。"""
+    if isinstance(player, AIPlayer) and not isinstance(player.strategy, InstrumentedStrategy):
+        player.strategy = InstrumentedStrategy(player.strategy, metrics, name)
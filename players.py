@@ -1,8 +1,15 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, List, Sequence, Tuple
+import math
 import random
+import threading
+import time
+
+from environment import BoardGeometry
+from tictactoe_table import DEFAULT_TABLE_PATH, encode, load_table
 
 
 # ========= 基底 Player 類別 =========
@@ -51,6 +58,21 @@ class AIStrategy(ABC):
     def choose_action(self, env) -> Optional[int]:
         raise NotImplementedError
 
+    def request_stop(self) -> None:
+        """
+        要求正在（別的 thread）進行的 choose_action 盡快結束，
+        例如 GUI 按下重新開始時。預設不做事；可中斷的策略請覆寫。
+        """
+
+    def counters(self) -> Dict[str, int]:
+        """
+        搜尋量計數，給 instrumentation.InstrumentedStrategy 用：
+        - nodes：最近一次 choose_action 拜訪的節點數
+        - cache_hits / cache_misses：置換表或解表的累計命中 / 未命中次數
+        沒有的項目不用回傳；預設是空的。
+        """
+        return {}
+
 
 # ========= 具體策略：Easy - 亂數 AI =========
 
@@ -67,8 +89,9 @@ class RandomStrategy(AIStrategy):
 Medium 策略邏輯：
 1. 如果有一步可以讓自己立刻獲勝 → 下那格
 2. 否則，如果對手下一步會獲勝 → 優先擋對手
-3. 否則，如果中間(4)有空 → 下中間
+3. 否則，如果中間（3x3 是 index 4）有空 → 下中間
 4. 否則，隨機從剩下合法位置中選一格
+「贏 / 擋」直接查環境的連線計數（env.winning_actions），不需要掃棋盤。
 """
 
 class MediumStrategy(AIStrategy):
@@ -77,130 +100,854 @@ class MediumStrategy(AIStrategy):
         self.op_symbol = 'O' if ai_symbol == 'X' else 'X'
 
     def choose_action(self, env) -> Optional[int]:
-        actions: List[int] = env.available_actions()
-        if not actions:
+        if env.done:
             return None
 
-        board: List[Optional[str]] = env.board
-
         # 1. 嘗試找到「自己可以直接獲勝」的一步
-        for a in actions:
-            new_board = board.copy()
-            new_board[a] = self.ai_symbol
-            if self._check_winner(new_board) == self.ai_symbol:
-                return a
+        wins = env.winning_actions(self.ai_symbol)
+        if wins:
+            return wins[0]
 
         # 2. 嘗試擋對手：如果對手下一步會贏，就先佔那格
-        for a in actions:
-            new_board = board.copy()
-            new_board[a] = self.op_symbol
-            if self._check_winner(new_board) == self.op_symbol:
-                return a
+        blocks = env.winning_actions(self.op_symbol)
+        if blocks:
+            return blocks[0]
 
-        # 3. 佔中間（位置 index=4），如果有空
-        if 4 in actions:
-            return 4
+        # 3. 佔中間（3x3 是 index=4），如果有空
+        center = env.geometry.center
+        if not ((env.x_bits | env.o_bits) >> center) & 1:
+            return center
 
         # 4. 其他情況 → 隨機
+        actions: List[int] = env.available_actions()
+        if not actions:
+            return None
         return random.choice(actions)
 
-    def _check_winner(self, board: List[Optional[str]]) -> Optional[str]:
-        lines = [
-            (0, 1, 2),
-            (3, 4, 5),
-            (6, 7, 8),
-            (0, 3, 6),
-            (1, 4, 7),
-            (2, 5, 8),
-            (0, 4, 8),
-            (2, 4, 6),
-        ]
-        for a, b, c in lines:
-            if board[a] is not None and board[a] == board[b] == board[c]:
-                return board[a]
-        return None
+
+# ========= Minimax 用的置換表（Transposition Table） =========
+
+class TranspositionTable:
+    """
+    搜尋結果的快取（LRU）：
+    - key 是 env.canonical_hash（Zobrist），8 種對稱的盤面共用同一個 key
+    - 超過 max_size 時淘汰最久沒被用到的項目
+    - hits / misses 記錄命中與未命中次數
+    - get / put 用同一把 lock：MinimaxStrategy 的表是類別層級的，GUI 的背景搜尋、
+      預先計算和遊戲伺服器的 executor 會在不同 thread 同時讀寫
+    """
+
+    def __init__(self, max_size: int = 100_000) -> None:
+        if max_size <= 0:
+            raise ValueError(f"max_size must be positive: {max_size}")
+        self.max_size = max_size
+        self._store: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self._store.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._store[key] = value
+            self._store.move_to_end(key)
+            if len(self._store) > self.max_size:
+                self._store.popitem(last=False)
+
+    def clear(self) -> None:
+        """清空內容與計數器"""
+        with self._lock:
+            self._store.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            hits, misses, size = self.hits, self.misses, len(self._store)
+        total = hits + misses
+        return {
+            "size": size,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+        }
 
 
 # ========= 具體策略：Hard - Minimax AI =========
 
+# alpha-beta 模式的分數：贏 = WIN_SCORE - 步數，輸 = -(WIN_SCORE - 步數)，平手 = 0
+WIN_SCORE = 10
+
+# 置換表裡 alpha-beta 分數的種類
+_EXACT, _LOWER, _UPPER = 0, 1, 2
+
+# 靜態走步順序：中間 → 角落 → 邊
+_STATIC_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+
+# 每種「已佔用格子」的 bitmask 對應的空格（依 _STATIC_ORDER），搜尋時直接查表
+_EMPTY_ORDER = tuple(
+    tuple(i for i in _STATIC_ORDER if not (occupied >> i) & 1) for occupied in range(1 << 9)
+)
+
+
 class MinimaxStrategy(AIStrategy):
     """
-    標準的 Minimax，用當前棋盤直接評估。
-    不去改動真正的 env，只操作 board 的 copy。
+    Minimax AI，用當前棋盤直接評估（只適用 3x3 井字棋；大棋盤請用
+    HeuristicSearchStrategy）。
+    不去改動真正的 env：每次決策複製一份，在副本上用 make / unmake 搜尋，
+    搜尋過程中不再配置新的棋盤。
+
+    search 有兩種模式：
+    - "alphabeta"（預設）：alpha-beta 剪枝 + 走步排序，分數會考慮步數
+      （越快贏越好、越慢輸越好）
+    - "minimax"：原本的完整 Minimax，分數只有 1 / 0 / -1
+
+    搜尋結果存在類別層級的置換表（所有 X / O 實例、每次 choose_action 共用），
+    key 是 env.canonical_hash：
+    - minimax 模式：table，存「X 的觀點」的分數，O 使用時取負號
+    - alphabeta 模式：alphabeta_table，存「輪到的那一方」的觀點與分數種類
+
+    nodes 記錄最近一次 choose_action 拜訪的節點數。
     """
 
-    def __init__(self, ai_symbol: str) -> None:
+    table = TranspositionTable()
+    alphabeta_table = TranspositionTable()
+
+    def __init__(self, ai_symbol: str, use_table: bool = True,
+                 search: str = "alphabeta") -> None:
+        if search not in ("alphabeta", "minimax"):
+            raise ValueError(f"Unsupported search mode: {search}")
         self.ai_symbol = ai_symbol
         self.op_symbol = 'O' if ai_symbol == 'X' else 'X'
+        self.use_table = use_table
+        self.search = search
+        self.nodes = 0
+        self._sign = 1.0 if ai_symbol == 'X' else -1.0
 
     def choose_action(self, env) -> Optional[int]:
         actions: List[int] = env.available_actions()
-        if not actions:
+        if not actions or env.done:
             return None
 
+        self.nodes = 0
+        env = env.copy()
+        if self.search == "alphabeta":
+            return self._choose_alphabeta(env)
+
         best_score = float('-inf')
         best_action: Optional[int] = None
 
-        board = env.board  # 預設是長度 9 的 list[Optional[str]]
-
         for action in actions:
-            new_board = board.copy()
-            new_board[action] = self.ai_symbol
-            score = self._minimax(new_board, self.op_symbol)
+            env.make(action)
+            score = self._minimax(env)
+            env.unmake()
             if score > best_score:
                 best_score = score
                 best_action = action
 
         return best_action
 
+    def counters(self) -> Dict[str, int]:
+        table = self.alphabeta_table if self.search == "alphabeta" else self.table
+        return {"nodes": self.nodes, "cache_hits": table.hits, "cache_misses": table.misses}
+
     # ----- Minimax 遞迴 -----
 
-    def _minimax(self, board: List[Optional[str]], current_symbol: str) -> float:
-        winner = self._check_winner(board)
-        if winner == self.ai_symbol:
+    def _minimax(self, env) -> float:
+        self.nodes += 1
+        if env.winner == self.ai_symbol:
             return 1.0
-        elif winner == self.op_symbol:
+        elif env.winner == self.op_symbol:
             return -1.0
-        elif all(c is not None for c in board):
+        elif env.done:
             return 0.0  # 平手
 
+        key = None
+        if self.use_table:
+            key = env.canonical_hash
+            cached = self.table.get(key)
+            if cached is not None:
+                return cached * self._sign
+
         # 輪到誰下
-        is_ai_turn = (current_symbol == self.ai_symbol)
+        is_ai_turn = (env.current_player == self.ai_symbol)
 
         if is_ai_turn:
             best_score = float('-inf')
-            for idx in range(9):
-                if board[idx] is None:
-                    board[idx] = self.ai_symbol
-                    score = self._minimax(board, self.op_symbol)
-                    board[idx] = None
-                    best_score = max(best_score, score)
-            return best_score
+            for idx in env.available_actions():
+                env.make(idx)
+                score = self._minimax(env)
+                env.unmake()
+                best_score = max(best_score, score)
         else:
             best_score = float('inf')
-            for idx in range(9):
-                if board[idx] is None:
-                    board[idx] = self.op_symbol
-                    score = self._minimax(board, self.ai_symbol)
-                    board[idx] = None
-                    best_score = min(best_score, score)
-            return best_score
-
-    def _check_winner(self, board: List[Optional[str]]) -> Optional[str]:
-        lines = [
-            (0, 1, 2),
-            (3, 4, 5),
-            (6, 7, 8),
-            (0, 3, 6),
-            (1, 4, 7),
-            (2, 5, 8),
-            (0, 4, 8),
-            (2, 4, 6),
+            for idx in env.available_actions():
+                env.make(idx)
+                score = self._minimax(env)
+                env.unmake()
+                best_score = min(best_score, score)
+
+        if key is not None:
+            self.table.put(key, best_score * self._sign)
+        return best_score
+
+    # ----- Alpha-beta（negamax 形式） -----
+
+    def _choose_alphabeta(self, env) -> Optional[int]:
+        best_score = -WIN_SCORE - 1
+        best_action: Optional[int] = None
+        alpha, beta = -WIN_SCORE - 1, WIN_SCORE + 1
+
+        for action in self._ordered_moves(env):
+            score = self._score_move(env, action, 0, alpha, beta)
+            if score > best_score:
+                best_score = score
+                best_action = action
+                alpha = max(alpha, score)
+
+        return best_action
+
+    def _score_move(self, env, action: int, ply: int, alpha: int, beta: int) -> int:
+        """
+        輪到的那一方在 action 下一步，回傳這一步對他的分數（回傳前 unmake）。
+        ply 是這一步之前已經下了幾步（從 choose_action 算起）。
+        """
+        env.make(action)
+        if env.winner is not None:
+            self.nodes += 1
+            score = WIN_SCORE - (ply + 1)
+        else:
+            score = -self._alphabeta(env, ply + 1, -beta, -alpha)
+        env.unmake()
+        return score
+
+    def _alphabeta(self, env, ply: int, alpha: int, beta: int) -> int:
+        """回傳對 env.current_player 而言的分數（對手上一步沒有贏）。"""
+        self.nodes += 1
+        if env.done:
+            return 0  # 平手
+
+        alpha_orig = alpha
+        key = None
+        if self.use_table:
+            key = env.canonical_hash
+            entry = self.alphabeta_table.get(key)
+            if entry is not None:
+                value, flag = entry
+                value = _score_from_table(value, ply)
+                if flag == _EXACT:
+                    return value
+                if flag == _LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        best_score = -WIN_SCORE - 1
+        for idx in self._ordered_moves(env):
+            score = self._score_move(env, idx, ply, alpha, beta)
+            if score > best_score:
+                best_score = score
+            if best_score > alpha:
+                alpha = best_score
+            if alpha >= beta:
+                break
+
+        if key is not None:
+            if best_score <= alpha_orig:
+                flag = _UPPER
+            elif best_score >= beta:
+                flag = _LOWER
+            else:
+                flag = _EXACT
+            self.alphabeta_table.put(key, (_score_to_table(best_score, ply), flag))
+        return best_score
+
+    @staticmethod
+    def _ordered_moves(env) -> Sequence[int]:
+        """
+        走步排序：先下「自己直接贏」的格子、再下「擋對手」的格子
+        （和 MediumStrategy 同一套連線計數），其餘依 中間 → 角落 → 邊。
+        沒有威脅時回傳查表得到的 tuple，不配置新的 list。
+        """
+        empties = _EMPTY_ORDER[env.x_bits | env.o_bits]
+        to_move = env.current_player
+        wins = env.winning_mask(to_move)
+        threats = wins | env.winning_mask('O' if to_move == 'X' else 'X')
+        if not threats:
+            return empties
+        ordered = [a for a in empties if (wins >> a) & 1]
+        ordered += [a for a in empties if (threats >> a) & 1 and not (wins >> a) & 1]
+        ordered += [a for a in empties if not (threats >> a) & 1]
+        return ordered
+
+
+def _score_to_table(score: int, ply: int) -> int:
+    """把「距離根節點」的步數分數轉成「距離這個節點」的分數，才能跨局面共用。"""
+    if score > 0:
+        return score + ply
+    if score < 0:
+        return score - ply
+    return 0
+
+
+def _score_from_table(score: int, ply: int) -> int:
+    if score > 0:
+        return score - ply
+    if score < 0:
+        return score + ply
+    return 0
+
+
+# ========= 具體策略：Hard - 查表 AI =========
+
+class TableStrategy(AIStrategy):
+    """
+    用 tictactoe_table.py 事先解好的完整解表下棋，每一步都是 O(1) 查表。
+    多個最佳走步時取 index 最小的一格。
+    若查到的不是有效局面（例如被手動改過的棋盤），退回 MinimaxStrategy。
+    hits / misses 記錄查表成功與退回 Minimax 的次數。
+    """
+
+    def __init__(self, ai_symbol: str, path: str = DEFAULT_TABLE_PATH) -> None:
+        self.ai_symbol = ai_symbol
+        self.table = load_table(path)
+        self._fallback: Optional[MinimaxStrategy] = None
+        self.hits = 0
+        self.misses = 0
+
+    def choose_action(self, env) -> Optional[int]:
+        if env.done:
+            return None
+        moves = self.table.best_moves(env.board, self.ai_symbol)
+        if moves:
+            self.hits += 1
+            return moves[0]
+        self.misses += 1
+        if self._fallback is None:
+            self._fallback = MinimaxStrategy(self.ai_symbol)
+        return self._fallback.choose_action(env)
+
+    def counters(self) -> Dict[str, int]:
+        return {"cache_hits": self.hits, "cache_misses": self.misses}
+
+
+# ========= 具體策略：Q-learning 查表 AI =========
+
+class QTableStrategy(AIStrategy):
+    """
+    用 tictactoe_vec.py self-play 訓練出來的 Q 表下棋（只適用 3x3）：
+    以「輪到的那一方」觀點編碼局面，在合法步中取 Q 值最大的一格（同分取 index 最小）。
+    q 沒給時從 path 載入（需要 numpy，先執行 python tictactoe_vec.py 訓練）。
+    """
+
+    def __init__(self, ai_symbol: str, q: Any = None, path: Optional[str] = None) -> None:
+        self.ai_symbol = ai_symbol
+        if q is None:
+            from tictactoe_vec import DEFAULT_QTABLE_PATH, load
+            q = load(path or DEFAULT_QTABLE_PATH)
+        self.q = q
+
+    def choose_action(self, env) -> Optional[int]:
+        actions: List[int] = env.available_actions()
+        if not actions or env.done:
+            return None
+        row = self.q[encode(env.board, env.current_player)].tolist()
+        return max(actions, key=row.__getitem__)
+
+
+# ========= 具體策略：大棋盤 - 深度受限 Alpha-beta AI =========
+
+class _SearchTimeout(Exception):
+    """搜尋超過時間預算（或被 request_stop），中斷目前這一層的迭代加深。"""
+
+
+class HeuristicSearchStrategy(AIStrategy):
+    """
+    給大棋盤（4x4、5x5 連 4、15x15 五子棋…）用的 AI，完整 Minimax 在那裡不可行：
+    - 迭代加深的 alpha-beta（negamax），最多搜到 max_depth 層
+    - 每一步最多花 time_limit 秒，超時（或 request_stop）就用上一層完整搜完的結果
+    - 葉節點用「威脅數」評估：只有單方棋子的連線，子越多權重越高（10 的次方）
+    - 只考慮既有棋子 radius 格內的空格，並依威脅程度只展開前 max_branch 個
+    直接在 env 的 bitboard 上搜尋，不改動 env。
+    nodes 記錄最近一次 choose_action 拜訪的節點數。
+    """
+
+    def __init__(self, ai_symbol: str, max_depth: int = 4, time_limit: float = 1.0,
+                 radius: int = 1, max_branch: int = 12) -> None:
+        self.ai_symbol = ai_symbol
+        self.op_symbol = 'O' if ai_symbol == 'X' else 'X'
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.radius = radius
+        self.max_branch = max_branch
+        self.nodes = 0
+        self._geometry: Optional[BoardGeometry] = None
+        self._near: List[int] = []
+        self._weights: List[int] = []
+        self._win = 0
+        self._deadline = 0.0
+        self._stop = False
+
+    def request_stop(self) -> None:
+        self._stop = True
+
+    def counters(self) -> Dict[str, int]:
+        return {"nodes": self.nodes}
+
+    def choose_action(self, env) -> Optional[int]:
+        actions: List[int] = env.available_actions()
+        if env.done or not actions:
+            return None
+
+        self._stop = False
+        geometry: BoardGeometry = env.geometry
+        self._prepare(geometry)
+        # 一律替輪到的那一方搜尋（不看 ai_symbol），才能拿來幫任一方決策
+        if env.current_player == 'X':
+            me, op = env.x_bits, env.o_bits
+        else:
+            me, op = env.o_bits, env.x_bits
+        if not me | op:
+            return geometry.center
+
+        self.nodes = 0
+        self._deadline = time.perf_counter() + self.time_limit
+        moves = self._ordered_moves(me, op, self._candidates(me, op))
+        best_action = moves[0]
+        if len(moves) == 1:
+            return best_action
+
+        for depth in range(1, self.max_depth + 1):
+            try:
+                action, score = self._search_root(me, op, moves, depth)
+            except _SearchTimeout:
+                break
+            best_action = action
+            if abs(score) >= self._win:
+                break  # 已經找到必勝 / 必敗，更深也不會改變
+            # 下一層先試這一層的最佳步
+            moves = [action] + [m for m in moves if m != action]
+
+        return best_action
+
+    # ----- 搜尋 -----
+
+    def _prepare(self, geometry: BoardGeometry) -> None:
+        """換棋盤時重新計算鄰近格 mask 與權重。"""
+        if geometry is self._geometry:
+            return
+        self._geometry = geometry
+        n = geometry.size
+        near = []
+        for i in range(geometry.n_cells):
+            r, c = divmod(i, n)
+            mask = 0
+            for rr in range(max(0, r - self.radius), min(n, r + self.radius + 1)):
+                for cc in range(max(0, c - self.radius), min(n, c + self.radius + 1)):
+                    mask |= 1 << (rr * n + cc)
+            near.append(mask)
+        self._near = near
+        self._weights = [10 ** c for c in range(geometry.k + 1)]
+        self._win = 10 ** (geometry.k + 2)
+
+    def _candidates(self, me: int, op: int) -> int:
+        occupied = me | op
+        cand = 0
+        stones = occupied
+        while stones:
+            low = stones & -stones
+            cand |= self._near[low.bit_length() - 1]
+            stones ^= low
+        cand &= ~occupied
+        return cand or (self._geometry.full_mask & ~occupied)
+
+    def _search_root(self, me: int, op: int, moves: List[int], depth: int) -> Tuple[int, int]:
+        alpha, beta = -self._win * 2, self._win * 2
+        best_action, best_score = moves[0], -self._win * 2
+        cand = self._candidates(me, op)
+        for m in moves:
+            score = self._score_move(me, op, cand, m, depth, alpha, beta)
+            if score > best_score:
+                best_action, best_score = m, score
+                alpha = max(alpha, score)
+        return best_action, best_score
+
+    def _score_move(self, me: int, op: int, cand: int, m: int, depth: int,
+                    alpha: int, beta: int) -> int:
+        """me 在 m 下一步後，對 me 的分數。越快贏分數越高。"""
+        after = me | (1 << m)
+        for mask in self._geometry.cell_line_masks[m]:
+            if after & mask == mask:
+                return self._win + depth
+        occupied = after | op
+        child = (cand | self._near[m]) & ~occupied
+        if not child:
+            child = self._geometry.full_mask & ~occupied
+        return -self._negamax(op, after, child, depth - 1, -beta, -alpha)
+
+    def _negamax(self, me: int, op: int, cand: int, depth: int, alpha: int, beta: int) -> int:
+        self.nodes += 1
+        if self.nodes & 255 == 0 and (self._stop or time.perf_counter() > self._deadline):
+            raise _SearchTimeout
+        if not cand:
+            return 0  # 棋盤滿了 → 平手
+        if depth == 0:
+            return self._evaluate(me, op)
+
+        best = -self._win * 2
+        for m in self._ordered_moves(me, op, cand):
+            score = self._score_move(me, op, cand, m, depth, alpha, beta)
+            if score > best:
+                best = score
+            if best > alpha:
+                alpha = best
+            if alpha >= beta:
+                break
+        return best
+
+    def _evaluate(self, me: int, op: int) -> int:
+        """威脅數評估（對 me）：只有單方棋子的連線才算分。"""
+        weights = self._weights
+        score = 0
+        for mask in self._geometry.line_masks:
+            mine = me & mask
+            theirs = op & mask
+            if mine and not theirs:
+                score += weights[mine.bit_count()]
+            elif theirs and not mine:
+                score -= weights[theirs.bit_count()]
+        return score
+
+    def _ordered_moves(self, me: int, op: int, cand: int) -> List[int]:
+        """
+        走步排序：能直接贏就只下那步；對手有一步就贏就只考慮擋；
+        其餘依經過該格的連線威脅程度排序，只留前 max_branch 個。
+        """
+        cell_line_masks = self._geometry.cell_line_masks
+        weights = self._weights
+        blocks = []
+        scored = []
+        while cand:
+            low = cand & -cand
+            cand ^= low
+            m = low.bit_length() - 1
+            masks = cell_line_masks[m]
+            mine_after = me | low
+            if any(mine_after & mask == mask for mask in masks):
+                return [m]
+            theirs_after = op | low
+            if any(theirs_after & mask == mask for mask in masks):
+                blocks.append(m)
+                continue
+            s = 0
+            for mask in masks:
+                mine = me & mask
+                theirs = op & mask
+                if not theirs:
+                    s += weights[mine.bit_count()]
+                if not mine:
+                    s += weights[theirs.bit_count()]
+            scored.append((s, m))
+        if blocks:
+            return blocks
+        scored.sort(key=lambda item: -item[0])
+        return [m for _, m in scored[:self.max_branch]]
+
+
+# ========= 具體策略：MCTS - 蒙地卡羅樹搜尋 =========
+
+# 模擬結果：哪一方贏（0 = X、1 = O），平手 -1
+_DRAW = -1
+
+
+class _MCTSNode:
+    """
+    搜尋樹的一個節點，直接存 bitboard（整數）當作局面。
+    to_move：輪到誰（0 = X、1 = O）；wins：從「走到這個節點的那一方」來看的累計得分
+    （贏 1、平 0.5）；terminal：終局時是勝方或 _DRAW，沒結束是 None。
+    """
+
+    __slots__ = ("x_bits", "o_bits", "to_move", "move", "parent", "children",
+                 "untried", "visits", "wins", "terminal")
+
+    def __init__(self, x_bits: int, o_bits: int, to_move: int, move: Optional[int],
+                 parent: Optional["_MCTSNode"], terminal: Optional[int],
+                 untried: List[int]) -> None:
+        self.x_bits = x_bits
+        self.o_bits = o_bits
+        self.to_move = to_move
+        self.move = move
+        self.parent = parent
+        self.children: Dict[int, "_MCTSNode"] = {}
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0
+        self.terminal = terminal
+
+
+class MCTSStrategy(AIStrategy):
+    """
+    UCT 蒙地卡羅樹搜尋，任何 size / k 都能用：
+    - 預算：time_limit 秒（None = 不限時）和 / 或 iterations 次迭代，先到先停；
+      request_stop() 也會讓搜尋提早結束
+    - 每次展開一個新節點後，從那裡連續跑 batch_size 場隨機模擬（同一份空格清單、
+      直接在 bitboard 上落子與判斷連線），一次把結果倒傳回去
+    - reuse_tree：同一局裡保留上一步的搜尋樹，下一步從實際走到的子樹接著搜
+    - workers > 1：root parallel，每個 process 各自從目前局面搜一棵樹
+      （同樣的預算、不同的亂數種子），最後把根節點各走步的拜訪次數加總；
+      這個模式不重用子樹。process pool 在第一次使用時建立，用完請 close()
+    最後選拜訪次數最多的走步（各走步的拜訪次數留在 last_visits）。
+    nodes 是最近一次 choose_action 新建的節點數，playouts 是模擬場數；重用子樹 / 重建樹的次數透過 counters() 以 cache_hits /
+    cache_misses 回報。
+    """
+
+    def __init__(self, ai_symbol: str, time_limit: Optional[float] = 1.0,
+                 iterations: Optional[int] = None, exploration: float = 1.4,
+                 batch_size: int = 8, workers: int = 1, reuse_tree: bool = True,
+                 seed: Optional[int] = None) -> None:
+        if time_limit is None and iterations is None:
+            raise ValueError("MCTSStrategy needs a time_limit or an iterations budget")
+        self.ai_symbol = ai_symbol
+        self.time_limit = time_limit
+        self.iterations = iterations
+        self.exploration = exploration
+        self.batch_size = batch_size
+        self.workers = workers
+        self.reuse_tree = reuse_tree
+        self.nodes = 0
+        self.playouts = 0
+        self.reused = 0
+        self.rebuilt = 0
+        self.last_visits: Dict[int, int] = {}
+        self._rng = random.Random(seed)
+        self._root: Optional[_MCTSNode] = None
+        self._geometry: Optional[BoardGeometry] = None
+        self._stop = False
+        self._pool = None
+
+    def request_stop(self) -> None:
+        self._stop = True
+
+    def counters(self) -> Dict[str, int]:
+        return {"nodes": self.nodes, "cache_hits": self.reused, "cache_misses": self.rebuilt}
+
+    def close(self) -> None:
+        """關掉 root parallel 用的 process pool。"""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
+
+    def choose_action(self, env) -> Optional[int]:
+        actions: List[int] = env.available_actions()
+        if env.done or not actions:
+            # 已經分出勝負：不建樹、也不動可重用的子樹
+            return None
+        self._stop = False
+        self.nodes = 0
+        self.playouts = 0
+        self.last_visits = {}
+        if len(actions) == 1:
+            return actions[0]
+        to_move = 0 if env.current_player == 'X' else 1
+        if self.workers > 1:
+            return self._choose_root_parallel(env, to_move)
+
+        root = self._find_root(env.geometry, env.x_bits, env.o_bits, to_move)
+        self.search(root)
+        if not root.children:
+            # 預算是 0，或第一次迭代之前就被 request_stop()：樹是空的
+            self._root = None
+            return self._fallback_action(env, actions)
+        self.last_visits = {move: child.visits for move, child in root.children.items()}
+        best = max(root.children.values(), key=lambda child: child.visits)
+        # 下一步從這個子樹（再往下一層是對手實際的回應）繼續
+        self._root = best if self.reuse_tree else None
+        return best.move
+
+    @staticmethod
+    def _fallback_action(env, actions: List[int]) -> int:
+        """沒有搜尋結果時的一步：能直接贏就贏，否則下第一個空格。"""
+        wins = env.winning_actions(env.current_player)
+        return wins[0] if wins else actions[0]
+
+    def root_visits(self, env) -> Dict[int, int]:
+        """從 env 的局面搜一棵新樹，回傳根節點各走步的拜訪次數（root parallel 用）。"""
+        to_move = 0 if env.current_player == 'X' else 1
+        self._geometry = env.geometry
+        root = self._new_node(env.x_bits, env.o_bits, to_move, None, None, None)
+        self.search(root)
+        return {move: child.visits for move, child in root.children.items()}
+
+    def search(self, root: _MCTSNode) -> None:
+        """在預算內對 root 反覆做 選擇 → 展開 → 批次模擬 → 倒傳。"""
+        deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+        budget = self.iterations
+        batch = self.batch_size
+        iteration = 0
+        while budget is None or iteration < budget:
+            if iteration & 15 == 0 and (
+                self._stop or (deadline is not None and time.perf_counter() > deadline)
+            ):
+                break
+            iteration += 1
+
+            node = root
+            while not node.untried and node.children:
+                node = self._select(node)
+            if node.terminal is None and node.untried:
+                node = self._expand(node, node.untried.pop())
+
+            if node.terminal is None:
+                x_wins, o_wins = self._playouts(node, batch)
+            elif node.terminal == _DRAW:
+                x_wins = o_wins = 0
+            else:
+                x_wins = batch if node.terminal == 0 else 0
+                o_wins = batch - x_wins
+            draws = batch - x_wins - o_wins
+
+            while node is not None:
+                node.visits += batch
+                # 從走到這個節點的那一方（不是 to_move）來看
+                node.wins += (o_wins if node.to_move == 0 else x_wins) + 0.5 * draws
+                node = node.parent
+
+    # ----- 樹的維護 -----
+
+    def _find_root(self, geometry: BoardGeometry, x_bits: int, o_bits: int,
+                   to_move: int) -> _MCTSNode:
+        """沿著上一棵樹往下找目前的局面；找不到（新的一局、換棋盤…）就建新的根。"""
+        node = self._root if self.reuse_tree and self._geometry is geometry else None
+        if node is not None and not (node.x_bits & ~x_bits or node.o_bits & ~o_bits):
+            while node is not None and (node.x_bits != x_bits or node.o_bits != o_bits):
+                placed = (x_bits | o_bits) & ~(node.x_bits | node.o_bits)
+                node = next((child for move, child in node.children.items()
+                             if (placed >> move) & 1
+                             and not (child.x_bits & ~x_bits or child.o_bits & ~o_bits)),
+                            None)
+            if node is not None and node.to_move == to_move:
+                node.parent = None
+                self.reused += 1
+                return node
+        self.rebuilt += 1
+        self._geometry = geometry
+        return self._new_node(x_bits, o_bits, to_move, None, None, None)
+
+    def _new_node(self, x_bits: int, o_bits: int, to_move: int, move: Optional[int],
+                  parent: Optional[_MCTSNode], terminal: Optional[int]) -> _MCTSNode:
+        untried: List[int] = []
+        if terminal is None:
+            empty = self._geometry.full_mask & ~(x_bits | o_bits)
+            while empty:
+                low = empty & -empty
+                untried.append(low.bit_length() - 1)
+                empty ^= low
+            self._rng.shuffle(untried)
+        self.nodes += 1
+        return _MCTSNode(x_bits, o_bits, to_move, move, parent, terminal, untried)
+
+    def _expand(self, node: _MCTSNode, move: int) -> _MCTSNode:
+        bit = 1 << move
+        x_bits, o_bits = node.x_bits, node.o_bits
+        if node.to_move == 0:
+            x_bits |= bit
+            mine = x_bits
+        else:
+            o_bits |= bit
+            mine = o_bits
+        terminal = None
+        if any(mine & mask == mask for mask in self._geometry.cell_line_masks[move]):
+            terminal = node.to_move
+        elif x_bits | o_bits == self._geometry.full_mask:
+            terminal = _DRAW
+        child = self._new_node(x_bits, o_bits, node.to_move ^ 1, move, node, terminal)
+        node.children[move] = child
+        return child
+
+    def _select(self, node: _MCTSNode) -> _MCTSNode:
+        log_visits = math.log(node.visits)
+        c = self.exploration
+        best, best_score = None, float('-inf')
+        for child in node.children.values():
+            score = child.wins / child.visits + c * math.sqrt(log_visits / child.visits)
+            if score > best_score:
+                best, best_score = child, score
+        return best
+
+    # ----- 隨機模擬 -----
+
+    def _playouts(self, node: _MCTSNode, count: int) -> Tuple[int, int]:
+        """從 node 的局面跑 count 場隨機對局，回傳 (X 勝場數, O 勝場數)。"""
+        cell_line_masks = self._geometry.cell_line_masks
+        shuffle = self._rng.shuffle
+        empties = []
+        empty = self._geometry.full_mask & ~(node.x_bits | node.o_bits)
+        while empty:
+            low = empty & -empty
+            empties.append(low.bit_length() - 1)
+            empty ^= low
+
+        wins = [0, 0]
+        for _ in range(count):
+            order = empties[:]
+            shuffle(order)
+            bits = [node.x_bits, node.o_bits]
+            player = node.to_move
+            for move in order:
+                mine = bits[player] | (1 << move)
+                bits[player] = mine
+                if any(mine & mask == mask for mask in cell_line_masks[move]):
+                    wins[player] += 1
+                    break
+                player ^= 1
+        self.playouts += count
+        return wins[0], wins[1]
+
+    # ----- root parallel -----
+
+    def _choose_root_parallel(self, env, to_move: int) -> Optional[int]:
+        if self._pool is None:
+            import multiprocessing
+            self._pool = multiprocessing.Pool(self.workers)
+        tasks = [
+            (env.size, env.k, env.x_bits, env.o_bits, to_move, self.time_limit,
+             self.iterations, self.exploration, self.batch_size, self._rng.randrange(1 << 31))
+            for _ in range(self.workers)
         ]
-        for a, b, c in lines:
-            if board[a] is not None and board[a] == board[b] == board[c]:
-                return board[a]
-        return None
+        visits: Dict[int, int] = {}
+        for counts in self._pool.map(_mcts_root_visits, tasks):
+            for move, n in counts.items():
+                visits[move] = visits.get(move, 0) + n
+        self.rebuilt += 1
+        self.last_visits = visits
+        if not visits:
+            return self._fallback_action(env, env.available_actions())
+        return max(visits, key=visits.get)
+
+
+def _mcts_root_visits(task: Tuple) -> Dict[int, int]:
+    """root parallel 的 worker：在自己的 process 裡搜一棵樹（module 層級才能 pickle）。"""
+    size, k, x_bits, o_bits, to_move, time_limit, iterations, exploration, batch_size, seed = task
+    from environment import TicTacToeEnvironment
+    env = TicTacToeEnvironment(size, k)
+    env.set_position(x_bits, o_bits, 'X' if to_move == 0 else 'O')
+    strategy = MCTSStrategy(env.current_player, time_limit, iterations, exploration,
+                            batch_size, reuse_tree=False, seed=seed)
+    return strategy.root_visits(env)
 
 
 # ========= AI Player：持有「策略」的玩家 =========
@@ -218,6 +965,9 @@ class AIPlayer(Player):
     def select_action(self, env) -> Optional[int]:
         return self.strategy.choose_action(env)
 
+    def request_stop(self) -> None:
+        self.strategy.request_stop()
+
 
 # ========= 對外相容用的名稱（保留原本 API） =========
 
@@ -251,3 +1001,43 @@ class MinimaxAIPlayer(AIPlayer):
 
     def __init__(self, symbol: str) -> None:
         super().__init__(symbol, MinimaxStrategy(symbol))
+
+
+class TableAIPlayer(AIPlayer):
+    """
+    查表版的 Hard AI：
+    - 使用 TableStrategy（需要先執行 python tictactoe_table.py 建表）
+    """
+
+    def __init__(self, symbol: str) -> None:
+        super().__init__(symbol, TableStrategy(symbol))
+
+
+class QTableAIPlayer(AIPlayer):
+    """
+    Q-learning 版的 AI：
+    - 使用 QTableStrategy（需要先執行 python tictactoe_vec.py 訓練）
+    """
+
+    def __init__(self, symbol: str) -> None:
+        super().__init__(symbol, QTableStrategy(symbol))
+
+
+class HeuristicAIPlayer(AIPlayer):
+    """
+    大棋盤用的 Hard AI：
+    - 使用 HeuristicSearchStrategy（深度受限 alpha-beta + 威脅數評估 + 時間預算）
+    """
+
+    def __init__(self, symbol: str) -> None:
+        super().__init__(symbol, HeuristicSearchStrategy(symbol))
+
+
+class MCTSAIPlayer(AIPlayer):
+    """
+    MCTS 難度：
+    - 使用 MCTSStrategy（UCT，每步 0.5 秒，同一局重用搜尋樹），任何棋盤大小都能用
+    """
+
+    def __init__(self, symbol: str) -> None:
+        super().__init__(symbol, MCTSStrategy(symbol, time_limit=0.5))
@@ -0,0 +1,124 @@
+# speculation.py
+"""
+AI 對人類時的預先計算（speculative precomputation）：
+輪到人類思考時，CPU 本來是閒著的；SpeculativeSearch 在背景替「人類每一種可能的下法」
+先算好 AI 的回應，人類真的下了之後只要查表（lookup），不用再等 AI 搜尋。
+
+- SpeculativeSearch：一個人類回合的預先計算，run() 在背景 thread 執行，
+  stop() 之後沒算完的下法就不算了（被中斷的搜尋結果不可靠，不會放進表裡）
+- SpeculationStats：累計命中率與省下的等待時間（= 命中時那一步原本要花的搜尋時間）
+
+搜尋用的是沒有包 InstrumentedStrategy 的策略：預先計算不是真正下出去的一步，
+不應該算進每一步的耗時統計。每個候選都在策略的淺複製上搜尋：
+MCTSStrategy 會把下一步要重用的子樹存在 _root，假設性的局面不能蓋掉它
+（置換表、搜尋樹的節點仍然共用，預先計算長出來的子樹之後也能被重用）。
+"""
+import copy
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from instrumentation import InstrumentedStrategy
+from players import AIPlayer, AIStrategy
+
+# 盤面 (x_bits, o_bits) -> (AI 的回應, 搜尋秒數)
+Reply = Tuple[Optional[int], float]
+
+
+class SpeculationStats:
+    """預先計算的累計命中率與省下的時間。"""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        # 命中時原本要花在搜尋上的時間總和
+        self.saved_seconds = 0.0
+        # 背景總共算了幾個回應、花了多少時間（包含沒用到的）
+        self.computed = 0
+        self.computed_seconds = 0.0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def summary(self) -> str:
+        if not self.lookups:
+            return ""
+        return (f"預先計算命中 {self.hits}/{self.lookups}（{self.hit_rate:.0%}），"
+                f"共省下 {self.saved_seconds * 1000:,.1f} ms")
+
+
+class SpeculativeSearch:
+    """
+    一個人類回合的預先計算。env 是輪到人類時的盤面（會複製一份）。
+    run() 依「人類最可能下的順序」逐一算 AI 的回應：
+    人類能直接贏的格子、要擋 AI 的格子先算，其他照 available_actions 的順序。
+    """
+
+    def __init__(self, player: AIPlayer, env, stats: Optional[SpeculationStats] = None) -> None:
+        strategy = player.strategy
+        if isinstance(strategy, InstrumentedStrategy):
+            strategy = strategy.inner
+        self.strategy = strategy
+        self.env = env.copy()
+        self.stats = stats if stats is not None else SpeculationStats()
+        self.replies: Dict[Tuple[int, int], Reply] = {}
+        self._stop = threading.Event()
+        # 正在搜尋的那個淺複製（stop() 要請它停下來）
+        self._running: Optional[AIStrategy] = None
+
+    def candidate_actions(self) -> List[int]:
+        env = self.env
+        human = env.current_player
+        ai = 'O' if human == 'X' else 'X'
+        order = env.winning_actions(human)
+        order += [a for a in env.winning_actions(ai) if a not in order]
+        order += [a for a in env.available_actions() if a not in order]
+        return order
+
+    def run(self) -> None:
+        """背景 thread：只做計算，不可以碰任何 tkinter 物件。"""
+        for action in self.candidate_actions():
+            if self._stop.is_set():
+                return
+            child = self.env.copy()
+            child.make(action)
+            if child.done:
+                # 人類這一步就結束遊戲，AI 不用回應
+                continue
+            strategy = copy.copy(self.strategy)
+            self._running = strategy
+            if self._stop.is_set():
+                return
+            start = time.perf_counter()
+            try:
+                reply = strategy.choose_action(child)
+            except Exception:
+                return
+            seconds = time.perf_counter() - start
+            if self._stop.is_set():
+                return
+            self.replies[(child.x_bits, child.o_bits)] = (reply, seconds)
+            self.stats.computed += 1
+            self.stats.computed_seconds += seconds
+
+    def stop(self) -> None:
+        """不再算新的下法，並請正在進行的搜尋盡快停下來。"""
+        self._stop.set()
+        running = self._running
+        if running is not None:
+            running.request_stop()
+
+    def lookup(self, env) -> Optional[Reply]:
+        """人類下完之後查表：命中回傳 (AI 的回應, 原本的搜尋秒數)，沒算到回傳 None。"""
+        reply = self.replies.get((env.x_bits, env.o_bits))
+        if reply is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        self.stats.saved_seconds += reply[1]
+        return reply
@@ -0,0 +1,167 @@
+# stats_store.py
+"""
+持久化的井字棋戰績統計（SQLite）。
+
+只存彙總後的計數，每一組 (模式, X, O, 棋盤大小, k, 先手) 一列：
+    games / x_wins / o_wins / draws
+每局結束呼叫 record() 只是在記憶體裡把計數 +1，累積到 batch_size 局
+（或 flush() / close() / 查詢時）才用一個 transaction 一次 UPSERT 進資料庫，
+tournament 每秒幾千局也不會卡在磁碟 I/O。
+
+用法：
+    python stats_store.py                      # 依配對列出累計戰績
+    python stats_store.py --x hard --o easy    # 只看某一組配對
+"""
+import argparse
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+from game_log import GameRecord
+
+DEFAULT_STATS_PATH = "game_stats.sqlite3"
+
+# (mode, x, o, size, k, first)
+StatsKey = Tuple[str, str, str, int, int, str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    mode   TEXT    NOT NULL,
+    x      TEXT    NOT NULL,
+    o      TEXT    NOT NULL,
+    size   INTEGER NOT NULL,
+    k      INTEGER NOT NULL,
+    first  TEXT    NOT NULL,
+    games  INTEGER NOT NULL DEFAULT 0,
+    x_wins INTEGER NOT NULL DEFAULT 0,
+    o_wins INTEGER NOT NULL DEFAULT 0,
+    draws  INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (mode, x, o, size, k, first)
+)
+"""
+
+_UPSERT = """
+INSERT INTO results (mode, x, o, size, k, first, games, x_wins, o_wins, draws)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (mode, x, o, size, k, first) DO UPDATE SET
+    games  = games  + excluded.games,
+    x_wins = x_wins + excluded.x_wins,
+    o_wins = o_wins + excluded.o_wins,
+    draws  = draws  + excluded.draws
+"""
+
+
+class StatsStore:
+    """
+    累計戰績。可以當 context manager 使用（離開時 close()，會先寫入剩下的計數）。
+    同一個檔案可以同時被多個 process 開啟：每次寫入都是對計數做加法，不會互相覆蓋。
+    """
+
+    def __init__(self, path: str = DEFAULT_STATS_PATH, batch_size: int = 1000) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self._conn = sqlite3.connect(path, timeout=30)
+        # WAL：寫入時不擋讀取；NORMAL：每個 transaction 不必等 fsync
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+        # 還沒寫入的增量：key -> [games, x_wins, o_wins, draws]
+        self._pending: Dict[StatsKey, List[int]] = {}
+        self._pending_games = 0
+
+    # ========= 寫入 =========
+
+    def record(self, mode: str, x: str, o: str, first: str, winner: Optional[str],
+               size: int = 3, k: int = 3) -> None:
+        """記一局的結果（winner：'X' / 'O'，平手 None）。"""
+        counts = self._pending.setdefault((mode, x, o, size, k, first), [0, 0, 0, 0])
+        counts[0] += 1
+        if winner == 'X':
+            counts[1] += 1
+        elif winner == 'O':
+            counts[2] += 1
+        else:
+            counts[3] += 1
+        self._pending_games += 1
+        if self._pending_games >= self.batch_size:
+            self.flush()
+
+    def record_game(self, record: GameRecord) -> None:
+        self.record(record.mode, record.x, record.o, record.first, record.winner,
+                    record.size, record.k)
+
+    def flush(self) -> None:
+        """把累積的增量用一個 transaction 寫進資料庫。"""
+        if not self._pending:
+            return
+        rows = [key + tuple(counts) for key, counts in self._pending.items()]
+        with self._conn:
+            self._conn.executemany(_UPSERT, rows)
+        self._pending.clear()
+        self._pending_games = 0
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self) -> "StatsStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ========= 查詢 =========
+
+    def totals(self, mode: Optional[str] = None, x: Optional[str] = None,
+               o: Optional[str] = None, first: Optional[str] = None,
+               size: Optional[int] = None, k: Optional[int] = None) -> List[int]:
+        """符合條件（None 代表不限）的 [局數, X 勝, O 勝, 平手]。"""
+        where, params = self._where(mode=mode, x=x, o=o, first=first, size=size, k=k)
+        row = self._conn.execute(
+            "SELECT COALESCE(SUM(games), 0), COALESCE(SUM(x_wins), 0), "
+            "COALESCE(SUM(o_wins), 0), COALESCE(SUM(draws), 0) FROM results" + where,
+            params,
+        ).fetchone()
+        return list(row)
+
+    def by_pairing(self, mode: Optional[str] = None, size: Optional[int] = None,
+                   k: Optional[int] = None) -> List[Tuple[str, str, int, int, int, int]]:
+        """每一組 (X, O) 的 (X, O, 局數, X 勝, O 勝, 平手)。"""
+        where, params = self._where(mode=mode, size=size, k=k)
+        return self._conn.execute(
+            "SELECT x, o, SUM(games), SUM(x_wins), SUM(o_wins), SUM(draws) FROM results"
+            + where + " GROUP BY x, o ORDER BY x, o",
+            params,
+        ).fetchall()
+
+    def _where(self, **filters) -> Tuple[str, list]:
+        # 查詢前先寫入增量，結果才會包含還在記憶體裡的局
+        self.flush()
+        conditions = [f"{name} = ?" for name, value in filters.items() if value is not None]
+        params = [value for value in filters.values() if value is not None]
+        return (" WHERE " + " AND ".join(conditions) if conditions else ""), params
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="井字棋累計戰績")
+    parser.add_argument("path", nargs="?", default=DEFAULT_STATS_PATH)
+    parser.add_argument("--mode", choices=["ai_vs_ai", "ai_vs_human", "human_vs_human"])
+    parser.add_argument("--x", help="X 的難度（人類是 human）")
+    parser.add_argument("--o", help="O 的難度（人類是 human）")
+    args = parser.parse_args()
+
+    with StatsStore(args.path) as store:
+        print(f"{'X':<10}{'O':<10}{'局數':>10}{'X 勝':>10}{'O 勝':>10}{'平手':>10}")
+        for x, o, games, x_win, o_win, draw in store.by_pairing(args.mode):
+            if (args.x and x != args.x) or (args.o and o != args.o):
+                continue
+            print(f"{x:<10}{o:<10}{games:>10}{x_win:>10}{o_win:>10}{draw:>10}")
+        for first in ('X', 'O'):
+            games, x_win, o_win, draw = store.totals(args.mode, args.x, args.o, first)
+            if games:
+                print(f"{first} 先手：{games} 局，X 勝 {x_win / games:.1%}，"
+                      f"O 勝 {o_win / games:.1%}，平手 {draw / games:.1%}")
+
+
+if __name__ == "__main__":
+    main()
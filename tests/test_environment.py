@@ -0,0 +1,176 @@
+import random
+
+import pytest
+
+from environment import TicTacToeEnvironment
+
+# (size, k)：標準井字棋、k < size、k == size、五子棋大小
+SHAPES = [(3, 3), (4, 3), (4, 4), (5, 4), (6, 4), (15, 5)]
+
+
+def _brute_lines(size, k):
+    """不靠 BoardGeometry：直接掃每一格往右、下、右下、左下走 k 格。"""
+    lines = []
+    for r in range(size):
+        for c in range(size):
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                cells = [(r + dr * j, c + dc * j) for j in range(k)]
+                if all(0 <= rr < size and 0 <= cc < size for rr, cc in cells):
+                    lines.append([rr * size + cc for rr, cc in cells])
+    return lines
+
+
+def _brute_winner(board, lines):
+    for line in lines:
+        first = board[line[0]]
+        if first is not None and all(board[i] == first for i in line):
+            return first
+    return None
+
+
+def _random_games(size, k, games, seed):
+    """隨機下完 games 局，逐步產生 (env, 下一步)；env 每一步都是同一個物件。"""
+    rng = random.Random(seed)
+    for _ in range(games):
+        env = TicTacToeEnvironment(size, k)
+        env.current_player = rng.choice('XO')
+        while not env.done:
+            yield env, rng.choice(env.available_actions())
+
+
+@pytest.mark.parametrize("size, k", SHAPES)
+def test_step_matches_brute_force_board(size, k):
+    lines = _brute_lines(size, k)
+    for env, action in _random_games(size, k, games=30, seed=size * 100 + k):
+        board = list(env.board)
+        player = env.current_player
+        env.step(action)
+        board[action] = player
+
+        winner = _brute_winner(board, lines)
+        assert env.board == board
+        assert env.winner == winner
+        assert env.done == (winner is not None or None not in board)
+        assert env.available_actions() == [i for i, cell in enumerate(board) if cell is None]
+        if not env.done:
+            assert env.current_player == ('O' if player == 'X' else 'X')
+
+
+def test_step_rejects_occupied_cells_and_finished_games():
+    env = TicTacToeEnvironment()
+    env.step(4)
+    with pytest.raises(ValueError):
+        env.step(4)
+    with pytest.raises(ValueError):
+        env.step(9)
+    for action in (0, 2, 1, 6):  # X: 4 2 6 斜線
+        env.step(action)
+    assert env.winner == 'X'
+    with pytest.raises(ValueError):
+        env.step(8)
+
+
+# ========= make / unmake、Zobrist、立即獲勝 =========
+
+def _snapshot(env):
+    return (env.x_bits, env.o_bits, env.line_counts('X'), env.line_counts('O'),
+            env.zobrist_hash, env.canonical_hash, env.current_player, env.done,
+            env.winner, env.last_action, list(env.board))
+
+
+@pytest.mark.parametrize("size, k", SHAPES)
+def test_winning_moves_match_brute_force(size, k):
+    through = {cell: [line for line in _brute_lines(size, k) if cell in line]
+               for cell in range(size * size)}
+    games = 20 if size <= 6 else 3
+    for env, action in _random_games(size, k, games, seed=size * 100 + k + 1):
+        board = env.board
+        for symbol in 'XO':
+            expected = {cell for cell in env.available_actions()
+                        if any(all(i == cell or board[i] == symbol for i in line)
+                               for line in through[cell])}
+            assert {c for c in env.available_actions() if env.is_winning_move(c, symbol)} == expected
+            assert env.winning_mask(symbol) == sum(1 << c for c in expected)
+            assert env.winning_actions(symbol) == sorted(expected)
+        env.step(action)
+
+
+@pytest.mark.parametrize("size, k", SHAPES)
+def test_line_counts_match_brute_force(size, k):
+    for env, action in _random_games(size, k, 10 if size <= 6 else 2, seed=size * 100 + k + 2):
+        env.step(action)
+        for symbol in 'XO':
+            assert env.line_counts(symbol) == [
+                sum(env.board[i] == symbol for i in line) for line in env.geometry.lines]
+
+
+@pytest.mark.parametrize("size, k", SHAPES)
+def test_unmake_restores_every_earlier_position(size, k):
+    rng = random.Random(size * 100 + k + 3)
+    for _ in range(20):
+        env = TicTacToeEnvironment(size, k)
+        env.current_player = rng.choice('XO')
+        history = []
+        while not env.done:
+            history.append(_snapshot(env))
+            env.make(rng.choice(env.available_actions()))
+        while history:
+            env.unmake()
+            assert _snapshot(env) == history.pop()
+
+
+@pytest.mark.parametrize("size, k", SHAPES)
+def test_incremental_hash_matches_set_position(size, k):
+    for env, action in _random_games(size, k, games=10, seed=size * 100 + k + 4):
+        env.make(action)
+        rebuilt = TicTacToeEnvironment(size, k)
+        rebuilt.set_position(env.x_bits, env.o_bits, env.current_player)
+        assert _snapshot(rebuilt)[:9] == _snapshot(env)[:9]
+
+
+def _brute_symmetries(size):
+    """8 種對稱，直接用座標轉換寫出（不靠 square_symmetries）。"""
+    n = size - 1
+    maps = [
+        lambda r, c: (r, c), lambda r, c: (c, n - r), lambda r, c: (n - r, n - c),
+        lambda r, c: (n - c, r), lambda r, c: (r, n - c), lambda r, c: (n - r, c),
+        lambda r, c: (c, r), lambda r, c: (n - c, n - r),
+    ]
+    return [[rr * size + cc for rr, cc in (f(i // size, i % size) for i in range(size * size))]
+            for f in maps]
+
+
+def _transform(bits, target):
+    out = 0
+    while bits:
+        low = bits & -bits
+        out |= 1 << target[low.bit_length() - 1]
+        bits ^= low
+    return out
+
+
+@pytest.mark.parametrize("size, k", SHAPES)
+def test_canonical_hash_is_the_same_for_all_symmetries(size, k):
+    symmetries = _brute_symmetries(size)
+    for env, action in _random_games(size, k, 10 if size <= 6 else 2, seed=size * 100 + k + 5):
+        env.make(action)
+        side = env.geometry.zobrist_side if env.current_player == 'O' else 0
+        hashes, plain = set(), set()
+        for target in symmetries:
+            image = TicTacToeEnvironment(size, k)
+            image.set_position(_transform(env.x_bits, target), _transform(env.o_bits, target),
+                               env.current_player)
+            hashes.add(image.canonical_hash)
+            plain.add(image.zobrist_hash ^ side)
+        assert hashes == {env.canonical_hash}
+        # canonical_hash = 8 個對稱盤面（只算棋子）的 Zobrist hash 取最小，再併入輪到誰
+        assert env.canonical_hash == min(plain) ^ side
+
+
+def test_hash_depends_on_side_to_move():
+    env = TicTacToeEnvironment()
+    env.make(4)
+    other = env.copy()
+    other.current_player = 'X'
+    assert env.zobrist_hash != other.zobrist_hash
+    assert env.canonical_hash != other.canonical_hash
@@ -0,0 +1,62 @@
+import gymnasium as gym
+import numpy as np
+import pytest
+
+from frozen_lake_model import TransitionModel
+from frozen_lake_sim import FastFrozenLake, _chi_square_failures, _transition_counts, check_equivalence
+
+
+@pytest.mark.parametrize("map_name, is_slippery", [("8x8", True), ("4x4", True), ("4x4", False)])
+def test_fast_env_matches_gymnasium(map_name, is_slippery):
+    assert check_equivalence(map_name, is_slippery, samples=200, episodes=2000, seed=0)
+
+
+@pytest.mark.parametrize("map_name, is_slippery", [("8x8", True), ("4x4", False)])
+def test_model_copies_transition_table(map_name, is_slippery):
+    env = gym.make('FrozenLake-v1', map_name=map_name, is_slippery=is_slippery)
+    model = TransitionModel.from_env(env)
+    P = env.unwrapped.P
+    assert model.max_episode_steps == env.spec.max_episode_steps
+    for s in range(model.n_states):
+        for a in range(model.n_actions):
+            outcomes = P[s][a]
+            n = len(outcomes)
+            assert model.probs[s, a, :n].tolist() == [p for p, _, _, _ in outcomes]
+            assert model.next_states[s, a, :n].tolist() == [s_next for _, s_next, _, _ in outcomes]
+            assert model.rewards[s, a, :n].tolist() == [r for _, _, r, _ in outcomes]
+            assert model.terminals[s, a, :n].tolist() == [done for _, _, _, done in outcomes]
+            assert model.cum_probs[s, a, -1] == pytest.approx(1.0)
+    env.close()
+
+
+def test_sample_uses_first_cumulative_probability_above_u():
+    model = TransitionModel.from_gym("8x8", is_slippery=True)
+    rng = np.random.default_rng(0)
+    states = rng.integers(model.n_states, size=5000)
+    actions = rng.integers(model.n_actions, size=5000)
+    u = rng.random(5000)
+    s_next, rewards, terminals = model.sample(states, actions, u)
+    for i in range(0, 5000, 50):
+        cum = model.cum_probs[states[i], actions[i]]
+        k = min(int(np.argmax(cum > u[i])), cum.size - 1)
+        assert s_next[i] == model.next_states[states[i], actions[i], k]
+        assert rewards[i] == model.rewards[states[i], actions[i], k]
+        assert terminals[i] == model.terminals[states[i], actions[i], k]
+
+
+def test_chi_square_check_detects_wrong_probabilities():
+    model = TransitionModel.from_gym("4x4", is_slippery=True)
+    env = gym.make('FrozenLake-v1', map_name="4x4", is_slippery=True)
+    P = env.unwrapped.P
+    env.close()
+    # slip with probability 1/2 / 1/4 / 1/4 instead of 1/3 each
+    skewed = {
+        s: {a: [(p, s_next, r, done) for p, (_, s_next, r, done) in zip((0.5, 0.25, 0.25), outcomes)]
+            if len(outcomes) == 3 else outcomes
+            for a, outcomes in actions.items()}
+        for s, actions in P.items()
+    }
+    broken = FastFrozenLake(TransitionModel(skewed, max_episode_steps=model.max_episode_steps), seed=0)
+    counts = _transition_counts(broken, model, 600)
+    pairs = model.n_states * model.n_actions
+    assert _chi_square_failures(counts, model, 600) > max(1, pairs // 100)
@@ -0,0 +1,230 @@
+import asyncio
+import json
+
+import pytest
+
+from game_server import MAX_LINE, GameServer, _read_line
+
+
+def _run(scenario, **kwargs):
+    """建一個 GameServer 跑 scenario(server)，跑完關掉 executor。"""
+    server = GameServer(**kwargs)
+    try:
+        return asyncio.run(scenario(server))
+    finally:
+        server.close()
+
+
+async def _exchange(server, payloads):
+    """在同一個 process 裡開 server，依序送出 payloads（bytes），回傳每一行回應。"""
+    listener = await server.serve("127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        for payload in payloads:
+            writer.write(payload)
+            await writer.drain()
+        writer.write_eof()
+        replies = []
+        while True:
+            line = await asyncio.wait_for(reader.readline(), 10)
+            if not line:
+                return replies
+            replies.append(json.loads(line))
+    finally:
+        writer.close()
+        listener.close()
+        await listener.wait_closed()
+
+
+def _line(request):
+    return json.dumps(request).encode() + b"\n"
+
+
+async def _create(server, **fields):
+    response = await server.handle({"op": "create", "first": "X", **fields})
+    assert response["ok"], response
+    return response["session"]
+
+
+# ========= 每行一個請求 =========
+
+def test_pipelined_requests_are_answered_in_order():
+    async def scenario(server):
+        session = await _create(server, mode="human_vs_human")
+        return await _exchange(server, [
+            _line({"id": 1, "op": "move", "session": session, "action": 4})
+            + _line({"id": 2, "op": "move", "session": session, "action": 0})
+            + _line({"id": 3, "op": "state", "session": session})])
+
+    replies = _run(scenario)
+    assert [reply["id"] for reply in replies] == [1, 2, 3]
+    assert all(reply["ok"] for reply in replies)
+    assert replies[2]["state"]["board"] == "O...X...."
+
+
+@pytest.mark.parametrize("payload, error", [
+    (b"not json\n", "Bad request"),
+    (b"[1, 2]\n", "request must be a JSON object"),
+    (b"\n", "Bad request"),
+])
+def test_malformed_lines_get_one_error_each(payload, error):
+    async def scenario(server):
+        return await _exchange(server, [payload, _line({"id": 9, "op": "nope"})])
+
+    bad, unknown = _run(scenario)
+    assert bad["ok"] is False and error in bad["error"]
+    assert unknown == {"ok": False, "error": "Unknown op: 'nope'", "id": 9}
+
+
+def test_overlong_line_gets_one_reply_and_framing_recovers():
+    async def scenario(server):
+        session = await _create(server, mode="human_vs_human")
+        overlong = b'{"op": "state", "pad": "' + b"x" * (200 * 1024) + b'"}\n'
+        return session, await _exchange(server, [
+            overlong, _line({"id": 7, "op": "state", "session": session})])
+
+    session, replies = _run(scenario)
+    assert len(replies) == 2
+    assert replies[0]["ok"] is False
+    assert str(MAX_LINE) in replies[0]["error"]
+    assert replies[1]["id"] == 7
+    assert replies[1]["ok"] is True
+    assert replies[1]["session"] == session
+    assert replies[1]["state"]["board"] == "." * 9
+
+
+def test_read_line_discards_overlong_line_split_across_chunks():
+    async def scenario():
+        reader = asyncio.StreamReader(limit=16)
+        first = asyncio.ensure_future(_read_line(reader))
+        reader.feed_data(b"a" * 40)
+        await asyncio.sleep(0)  # 先讓它讀到還沒有 \n 的前半段
+        reader.feed_data(b"b" * 40 + b"\nnext\n" + b"c" * 40)
+        reader.feed_eof()
+        return [await first] + [await _read_line(reader) for _ in range(3)]
+
+    assert asyncio.run(scenario()) == [None, b"next\n", None, b""]
+
+
+# ========= create =========
+
+@pytest.mark.parametrize("fields, error", [
+    ({"mode": "solo"}, "Unknown mode: 'solo'"),
+    ({"difficulty": "insane"}, "Unknown difficulty: 'insane'"),
+    ({"mode": "ai_vs_ai", "o_difficulty": "insane"}, "Unknown difficulty: 'insane'"),
+    ({"size": 0}, "Board size must be between 1 and 19: 0"),
+    ({"size": "big"}, "invalid literal"),
+    ({"first": "Z"}, "first must be 'X' or 'O': 'Z'"),
+])
+def test_create_rejects_bad_fields(fields, error):
+    async def scenario(server):
+        return await server.handle({"id": "c", "op": "create", **fields}), len(server.sessions)
+
+    response, sessions = _run(scenario)
+    assert response["ok"] is False and error in response["error"]
+    assert response["id"] == "c"
+    assert sessions == 0
+
+
+def test_create_lets_the_ai_open_when_it_moves_first():
+    async def scenario(server):
+        return await server.handle({"op": "create", "mode": "ai_vs_human",
+                                    "difficulty": "medium", "first": "O"})
+
+    response = _run(scenario)
+    assert response["ok"] is True
+    assert response["state"]["board"].count("O") == 1
+    assert response["state"]["board"][response["ai_action"]] == "O"
+    assert response["state"]["current"] == "X"
+
+
+def test_oldest_session_is_evicted_past_max_sessions():
+    async def scenario(server):
+        first = await _create(server, mode="human_vs_human")
+        await _create(server, mode="human_vs_human")
+        await _create(server, mode="human_vs_human")
+        return await server.handle({"op": "state", "session": first}), len(server.sessions)
+
+    response, sessions = _run(scenario, max_sessions=2)
+    assert response["ok"] is False and "Unknown session" in response["error"]
+    assert sessions == 2
+
+
+# ========= move / step =========
+
+@pytest.mark.parametrize("action", [True, False, 9, -1, "4", 4.0, None])
+def test_move_rejects_invalid_actions(action):
+    async def scenario(server):
+        session = await _create(server, mode="human_vs_human")
+        response = await server.handle({"op": "move", "session": session, "action": action})
+        state = await server.handle({"op": "state", "session": session})
+        return response, state
+
+    response, state = _run(scenario)
+    assert response == {"ok": False, "error": f"Invalid action: {action!r}"}
+    assert state["state"]["board"] == "." * 9
+
+
+def test_move_rejects_occupied_cell_and_finished_game():
+    async def scenario(server):
+        session = await _create(server, mode="human_vs_human")
+        replies = []
+        for action in (0, 0, 3, 1, 4, 2, 5):
+            replies.append(await server.handle({"op": "move", "session": session, "action": action}))
+        return replies
+
+    replies = _run(scenario)
+    assert replies[1] == {"ok": False, "error": "Invalid action: 0"}
+    # X: 0 1 2 連成一線
+    assert replies[5]["state"]["winner"] == "X" and replies[5]["state"]["done"] is True
+    assert replies[6] == {"ok": False, "error": "Game already finished"}
+
+
+def test_move_and_step_check_whose_turn_it_is():
+    async def scenario(server):
+        vs_ai = await _create(server, mode="ai_vs_ai", difficulty="easy")
+        humans = await _create(server, mode="human_vs_human")
+        return (await server.handle({"op": "move", "session": vs_ai, "action": 0}),
+                await server.handle({"op": "step", "session": humans}),
+                await server.handle({"op": "step", "session": vs_ai}))
+
+    move, step_humans, step_ai = _run(scenario)
+    assert move == {"ok": False, "error": "Not a human player's turn"}
+    assert step_humans == {"ok": False, "error": "It is a human player's turn"}
+    assert step_ai["ok"] is True
+    assert step_ai["state"]["board"][step_ai["ai_action"]] == "X"
+
+
+def test_requests_on_one_session_wait_for_the_ai_reply():
+    async def scenario(server):
+        session = await _create(server, mode="ai_vs_human", difficulty="hard")
+        # 第二步送出時第一步的 AI 還在 executor 裡想；沒有 session lock 的話
+        # 第二步會看到「輪到 AI」而被拒絕
+        return await asyncio.gather(
+            server.handle({"id": 1, "op": "move", "session": session, "action": 0}),
+            server.handle({"id": 2, "op": "move", "session": session, "action": 8}))
+
+    first, second = _run(scenario)
+    assert first["ok"] is True and first["ai_action"] != 8
+    assert second["ok"] is True, second
+    board = second["state"]["board"]
+    assert board.count("X") == 2 and board.count("O") == 2
+
+
+# ========= reset / close =========
+
+def test_reset_and_close():
+    async def scenario(server):
+        session = await _create(server, mode="human_vs_human")
+        await server.handle({"op": "move", "session": session, "action": 4})
+        reset = await server.handle({"op": "reset", "session": session, "first": "O"})
+        close = await server.handle({"id": 5, "op": "close", "session": session})
+        again = await server.handle({"op": "close", "session": session})
+        return reset, close, again, len(server.sessions)
+
+    reset, close, again, sessions = _run(scenario)
+    assert reset["state"]["board"] == "." * 9 and reset["state"]["current"] == "O"
+    assert close == {"session": close["session"], "ok": True, "id": 5}
+    assert again["ok"] is False and "Unknown session" in again["error"]
+    assert sessions == 0
@@ -0,0 +1,34 @@
+import pytest
+
+from environment import TicTacToeEnvironment
+from players import MCTSStrategy
+
+
+def _position(moves):
+    env = TicTacToeEnvironment()
+    for action in moves:
+        env.step(action)
+    return env
+
+
+@pytest.mark.parametrize("budget", [dict(iterations=0, time_limit=None), dict(time_limit=1e-9)])
+def test_mcts_without_search_still_returns_a_legal_move(budget):
+    env = _position([0, 4])
+    assert MCTSStrategy('X', seed=0, **budget).choose_action(env) in env.available_actions()
+
+
+def test_mcts_without_search_takes_the_winning_move():
+    # X: 0, 1；O: 3, 4 → X 下 2 就贏
+    env = _position([0, 3, 1, 4])
+    strategy = MCTSStrategy('X', time_limit=None, iterations=0, seed=0)
+    assert strategy.choose_action(env) == 2
+    assert strategy._root is None
+
+
+def test_mcts_root_parallel_without_search_returns_a_legal_move():
+    env = _position([0, 4])
+    strategy = MCTSStrategy('X', time_limit=None, iterations=0, workers=2, seed=0)
+    try:
+        assert strategy.choose_action(env) in env.available_actions()
+    finally:
+        strategy.close()
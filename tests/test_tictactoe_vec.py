@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+
+from tictactoe_vec import _apply_updates
+
+
+@pytest.mark.parametrize("learning_rate", [0.5, 0.1, 1.0])
+def test_duplicate_updates_are_applied_in_env_order(learning_rate):
+    rng = np.random.default_rng(0)
+    # 第 0 格像開局的空棋盤一樣被大部分的盤打到
+    flat = np.where(rng.random(1024) < 0.8, 0, rng.integers(1, 30, size=1024))
+    target = rng.normal(size=flat.size)
+    q_flat = rng.random(30).astype(np.float32)
+
+    expected = q_flat.astype(np.float64)
+    for cell, value in zip(flat, target):
+        expected[cell] += learning_rate * (value - expected[cell])
+
+    _apply_updates(q_flat, flat, target, learning_rate)
+    np.testing.assert_allclose(q_flat, expected, rtol=0, atol=1e-6)
@@ -0,0 +1,210 @@
+# tictactoe_table.py
+"""
+井字棋完整解表（perfect-play table）
+
+一次把所有局面用逆向分析（retrograde analysis）解完，存成一個
+以 base-3 局面編碼為 index 的 uint16 陣列，之後每一步都是 O(1) 查表。
+
+局面編碼一律用「輪到的那一方」的觀點：
+    code = sum(digit_i * 3**i)，digit = 0 空格 / 1 輪到的一方 / 2 對手
+所以 X 先手或 O 先手、輪到 X 或輪到 O，都共用同一張表。
+
+每個 entry（uint16, little-endian）：
+    bit 0~8   最佳走步的 mask（考慮步數：越快贏 / 越慢輸越好）
+    bit 9~10  局面價值（對輪到的一方）：0 輸 / 1 平手 / 2 贏
+    bit 15    1 = 有效局面
+
+建表（在專案根目錄）：
+    python tictactoe_table.py
+"""
+import argparse
+import mmap
+import os
+import struct
+from array import array
+from functools import lru_cache
+from typing import List, Optional
+
+from environment import CELL_LINE_MASKS, LINE_MASKS
+
+DEFAULT_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  "tictactoe_table.bin")
+
+NUM_CODES = 3 ** 9
+
+LOSS, DRAW, WIN = 0, 1, 2
+VALID_BIT = 1 << 15
+_VALUE_SHIFT = 9
+_MOVE_MASK = (1 << 9) - 1
+
+# 分數（對輪到的一方）：立刻輸 = -_WIN_SCORE，往上一層就往 0 靠近 1
+_WIN_SCORE = 10
+
+# _BASE3[mask] = mask 中每個 bit i 的 3**i 加總
+_BASE3 = [sum(3 ** i for i in range(9) if (mask >> i) & 1) for mask in range(1 << 9)]
+
+
+def encode(board: List[Optional[str]], to_move: str) -> int:
+    """把 list 棋盤轉成「輪到 to_move」觀點的 base-3 編碼。"""
+    code = 0
+    for i in range(8, -1, -1):
+        cell = board[i]
+        code = code * 3 + (0 if cell is None else 1 if cell == to_move else 2)
+    return code
+
+
+def _has_line(bits: int) -> bool:
+    return any(bits & mask == mask for mask in LINE_MASKS)
+
+
+def solve() -> array:
+    """
+    逆向分析：從棋子最多的局面往回解，每一層只依賴下一層（多一顆子）的結果。
+    回傳長度 3**9 的 array('H')。
+    """
+    # 依棋子數分組的 (mine, theirs)
+    layers: List[List[tuple]] = [[] for _ in range(10)]
+    for mine in range(1 << 9):
+        m = bin(mine).count("1")
+        if _has_line(mine):
+            continue  # 輪到的一方已經連線 → 對局早就結束，不可能出現
+        rest = _MOVE_MASK & ~mine
+        theirs = rest
+        while True:
+            t = bin(theirs).count("1")
+            if t in (m, m + 1):
+                layers[m + t].append((mine, theirs))
+            if theirs == 0:
+                break
+            theirs = (theirs - 1) & rest
+
+    scores = {}
+    table = array('H', [0]) * NUM_CODES
+
+    for count in range(9, -1, -1):
+        for mine, theirs in layers[count]:
+            code = _BASE3[mine] + 2 * _BASE3[theirs]
+            occupied = mine | theirs
+
+            if _has_line(theirs):
+                scores[code] = -_WIN_SCORE
+                table[code] = VALID_BIT | (LOSS << _VALUE_SHIFT)
+                continue
+            if occupied == _MOVE_MASK:
+                scores[code] = 0
+                table[code] = VALID_BIT | (DRAW << _VALUE_SHIFT)
+                continue
+
+            best = None
+            best_mask = 0
+            empty = _MOVE_MASK & ~occupied
+            for i in range(9):
+                bit = 1 << i
+                if not empty & bit:
+                    continue
+                after = mine | bit
+                if any(after & mask == mask for mask in CELL_LINE_MASKS[i]):
+                    score = _WIN_SCORE - 1
+                else:
+                    # 換對手的觀點：對手的子變成「輪到的一方」
+                    child = _BASE3[theirs] + 2 * _BASE3[after]
+                    score = -scores[child]
+                    if score > 0:
+                        score -= 1
+                    elif score < 0:
+                        score += 1
+                if best is None or score > best:
+                    best, best_mask = score, bit
+                elif score == best:
+                    best_mask |= bit
+
+            scores[code] = best
+            value = WIN if best > 0 else LOSS if best < 0 else DRAW
+            table[code] = VALID_BIT | (value << _VALUE_SHIFT) | best_mask
+
+    return table
+
+
+def build_table(path: str = DEFAULT_TABLE_PATH) -> int:
+    """解完整個遊戲並寫到 path，回傳有效局面數。"""
+    table = solve()
+    data = table.tobytes() if _is_little_endian() else _swapped(table).tobytes()
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return sum(1 for entry in table if entry & VALID_BIT)
+
+
+def _is_little_endian() -> bool:
+    return array('H', [1]).tobytes()[0] == 1
+
+
+def _swapped(table: array) -> array:
+    copy = array('H', table)
+    copy.byteswap()
+    return copy
+
+
+class SolvedTable:
+    """
+    用 mmap 開啟建好的表；查詢時直接從對應位移讀 2 bytes，
+    不需要把整個檔案讀進記憶體。
+    """
+
+    def __init__(self, path: str = DEFAULT_TABLE_PATH) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) != NUM_CODES * 2:
+            self._mm.close()
+            raise ValueError(f"Corrupt table file: {path}")
+
+    def entry(self, code: int) -> int:
+        return struct.unpack_from('<H', self._mm, code * 2)[0]
+
+    def lookup(self, board: List[Optional[str]], to_move: str) -> Optional[int]:
+        """回傳該局面的 entry；若不是有效局面則回傳 None。"""
+        entry = self.entry(encode(board, to_move))
+        if not entry & VALID_BIT:
+            return None
+        return entry
+
+    def best_moves(self, board: List[Optional[str]], to_move: str) -> List[int]:
+        entry = self.lookup(board, to_move)
+        if entry is None:
+            return []
+        return [i for i in range(9) if (entry >> i) & 1]
+
+    def value(self, board: List[Optional[str]], to_move: str) -> Optional[int]:
+        """回傳 LOSS / DRAW / WIN（對 to_move）；無效局面回傳 None。"""
+        entry = self.lookup(board, to_move)
+        if entry is None:
+            return None
+        return (entry >> _VALUE_SHIFT) & 0b11
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+def table_exists(path: str = DEFAULT_TABLE_PATH) -> bool:
+    return os.path.isfile(path) and os.path.getsize(path) == NUM_CODES * 2
+
+
+@lru_cache(maxsize=None)
+def load_table(path: str = DEFAULT_TABLE_PATH) -> SolvedTable:
+    """同一個路徑只開一次，所有 TableStrategy 共用。"""
+    return SolvedTable(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="建立井字棋完整解表")
+    parser.add_argument("--output", default=DEFAULT_TABLE_PATH, help="輸出檔案路徑")
+    args = parser.parse_args()
+
+    valid = build_table(args.output)
+    print(f"已寫入 {args.output}（有效局面 {valid} 個，{NUM_CODES * 2} bytes）")
+
+
+if __name__ == "__main__":
+    main()
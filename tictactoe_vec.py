@@ -0,0 +1,308 @@
+# tictactoe_vec.py
+"""
+向量化的井字棋環境與 self-play Q-learning（需要 numpy）
+
+VecTicTacToeEnv 同時推進 N 盤 3x3 井字棋：
+- boards 是 (N, 9) 的 int8 陣列：0 空格 / 1 = X / -1 = O
+- 合法步是 boards == 0 的 mask
+- 勝負用「棋盤 @ 連線矩陣」一次算出每盤 8 條連線的和，和為 ±3 就是連線
+
+train_selfplay() 在上面跑 self-play 的表格式 Q-learning：
+- 狀態用 tictactoe_table.encode() 同一套「輪到的那一方」觀點的 base-3 編碼，
+  所以 X / O 共用一張 (3**9, 9) 的表
+- negamax 形式的目標：贏 = 1、平手 = 0，否則 = -gamma * max Q(對手的下一個局面)
+- 同一步裡打到同一個 (state, action) 的更新依盤的順序一個接一個套用，不取平均
+  （target 用這一步之前的表，見 _apply_updates）
+
+訓練完的表由 players.QTableStrategy 使用。
+
+訓練（在專案根目錄）：
+    python tictactoe_vec.py --games 200000 --envs 1024
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from environment import LINES
+from tictactoe_table import NUM_CODES
+
+DEFAULT_QTABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                   "tictactoe_qtable.npy")
+
+N_CELLS = 9
+
+# (9, 8)：第 j 欄是第 j 條連線經過的格子
+LINE_MATRIX = np.zeros((N_CELLS, len(LINES)), dtype=np.int8)
+for _j, _line in enumerate(LINES):
+    LINE_MATRIX[list(_line), _j] = 1
+
+_POWERS_OF_3 = 3 ** np.arange(N_CELLS, dtype=np.int64)
+
+
+class VecTicTacToeEnv:
+    """
+    N 盤獨立的 3x3 井字棋，一次 step 全部（或指定的幾盤）。
+    - boards：(N, 9) int8，0 空格 / 1 = X / -1 = O
+    - current：(N,) int8，輪到誰（1 = X / -1 = O）
+    - done / winner：每盤是否結束、勝方（1 / -1，平手或未結束為 0）
+    indices 參數都是「要操作哪幾盤」的 index 陣列，None 代表全部。
+    """
+
+    def __init__(self, n_envs: int, first: int = 1) -> None:
+        if n_envs <= 0:
+            raise ValueError(f"n_envs must be positive: {n_envs}")
+        self.n_envs = n_envs
+        self.boards = np.zeros((n_envs, N_CELLS), dtype=np.int8)
+        self.current = np.full(n_envs, first, dtype=np.int8)
+        self.done = np.zeros(n_envs, dtype=bool)
+        self.winner = np.zeros(n_envs, dtype=np.int8)
+
+    def reset(self, indices=None, first: int = 1) -> None:
+        """重設棋盤（預設全部）。"""
+        rows = slice(None) if indices is None else indices
+        self.boards[rows] = 0
+        self.current[rows] = first
+        self.done[rows] = False
+        self.winner[rows] = 0
+
+    def legal_mask(self, indices=None) -> np.ndarray:
+        """(n, 9) bool：每盤哪些格子可以下（已結束的盤全部為 False）。"""
+        if indices is None:
+            return (self.boards == 0) & ~self.done[:, None]
+        return (self.boards[indices] == 0) & ~self.done[indices, None]
+
+    def encode(self, indices=None) -> np.ndarray:
+        """
+        每盤以「輪到的那一方」觀點的 base-3 編碼（和 tictactoe_table.encode 相同）：
+        digit = 0 空格 / 1 輪到的一方 / 2 對手。
+        """
+        if indices is None:
+            boards, current = self.boards, self.current
+        else:
+            boards, current = self.boards[indices], self.current[indices]
+        # 輪到的一方 = 1、對手 = -1，再 mod 3 把 -1 變成 2
+        digits = (boards * current[:, None]) % 3
+        return digits.astype(np.int64) @ _POWERS_OF_3
+
+    def step(self, actions, indices=None):
+        """
+        每盤輪到的一方下在 actions 對應的格子。
+        回傳 (won, draw)：這一步是否連成一線 / 是否因下滿而平手（bool 陣列）。
+        有任何一步不合法就丟出 ValueError，棋盤不會被修改。
+        """
+        rows = np.arange(self.n_envs) if indices is None else np.asarray(indices)
+        actions = np.asarray(actions)
+        if (self.done[rows] | (self.boards[rows, actions] != 0)).any():
+            raise ValueError("Invalid action in batch.")
+
+        mover = self.current[rows]
+        self.boards[rows, actions] = mover
+        boards = self.boards[rows]
+
+        # 每盤 8 條連線的和；輪到的一方連成一線時和等於 3 * mover
+        line_sums = boards @ LINE_MATRIX
+        won = (line_sums == 3 * mover[:, None]).any(axis=1)
+        draw = ~won & (boards != 0).all(axis=1)
+
+        finished = won | draw
+        self.done[rows] = finished
+        self.winner[rows] = np.where(won, mover, 0)
+        self.current[rows] = np.where(finished, mover, -mover)
+        return won, draw
+
+
+def epsilon_schedule(games: int, epsilon_start: float = 1.0, epsilon_end: float = 0.05,
+                     decay_fraction: float = 0.8) -> np.ndarray:
+    """第 i 局使用的 epsilon：前 decay_fraction 的局數線性遞減，之後維持 epsilon_end。"""
+    decay_games = max(1, int(games * decay_fraction))
+    return np.maximum(epsilon_end,
+                      epsilon_start - (epsilon_start - epsilon_end) * np.arange(games) / decay_games)
+
+
+def _apply_updates(q_flat: np.ndarray, flat: np.ndarray, target: np.ndarray,
+                   learning_rate: float) -> None:
+    """
+    把同一步的 Q 更新 q += lr * (target - q) 依盤的順序套用到 q_flat（原地）。
+    取平均的話，每一波開局時上千盤同時在空棋盤上，最常見的局面只學到 1 / n_envs 的步長。
+    target 在這一步之前就算好、lr 固定，所以同一格連續套用 m 次有封閉解：
+        q_m = (1 - lr)^m * q_0 + sum_r lr * (1 - lr)^(m-1-r) * target_r
+    （r 是這個更新在同一格裡的先後順序），不用一輪一輪跑。
+    """
+    touched, inverse, counts = np.unique(flat, return_inverse=True, return_counts=True)
+    order = np.argsort(inverse, kind="stable")
+    rank = np.empty_like(inverse)
+    rank[order] = np.arange(inverse.size) - (np.cumsum(counts) - counts)[inverse[order]]
+    keep = 1.0 - learning_rate
+    weights = learning_rate * keep ** (counts[inverse] - 1 - rank)
+    q_flat[touched] = (keep ** counts * q_flat[touched]
+                       + np.bincount(inverse, weights=weights * target, minlength=touched.size)
+                       ).astype(q_flat.dtype)
+
+
+def train_selfplay(games: int, n_envs: int = 1024, seed=None, learning_rate: float = 0.5,
+                   discount: float = 0.95, epsilon_start: float = 1.0, epsilon_end: float = 0.05,
+                   decay_fraction: float = 0.8, q=None):
+    """
+    self-play Q-learning：n_envs 盤同時進行，每盤打完就接著開下一局，直到打完 games 局。
+    先手在 X / O 之間輪流。每一步都是陣列運算（選步、落子、勝負判斷、Q 更新）。
+
+    q 可以傳入既有的表繼續訓練（會被原地更新），否則從全 0 開始。
+    回傳 (q, outcomes)：q 是 (3**9, 9) float32；outcomes[i] 是第 i 局的結果
+    （1 = X 勝 / -1 = O 勝 / 0 = 平手）。
+    """
+    rng = np.random.default_rng(seed)
+    if q is None:
+        q = np.zeros((NUM_CODES, N_CELLS), dtype=np.float32)
+    q_flat = q.reshape(-1)
+    epsilon = epsilon_schedule(games, epsilon_start, epsilon_end, decay_fraction)
+    outcomes = np.zeros(games, dtype=np.int8)
+
+    n_envs = max(1, min(n_envs, games))
+    env = VecTicTacToeEnv(n_envs)
+    game = np.arange(n_envs)
+    env.current[:] = np.where(game % 2 == 0, 1, -1)
+    active = np.ones(n_envs, dtype=bool)
+    next_game = n_envs
+    # 每盤目前局面的編碼與合法步；下完一步後的結果直接留給下一輪用（空棋盤的編碼是 0）
+    states = np.zeros(n_envs, dtype=np.int64)
+    legal = np.ones((n_envs, N_CELLS), dtype=bool)
+
+    while active.any():
+        # 全部都在進行時不做 fancy indexing（訓練大部分時間都是這種情況）
+        idx = None if active.all() else np.flatnonzero(active)
+        if idx is None:
+            s, lg, g = states, legal, game
+        else:
+            s, lg, g = states[idx], legal[idx], game[idx]
+
+        # epsilon-greedy；非法步設成 -inf，隨機步在合法格子中均勻選
+        greedy = np.argmax(np.where(lg, q[s], -np.inf), axis=1)
+        random_moves = np.argmax(rng.random(lg.shape) * lg, axis=1)
+        explore = rng.random(s.size) < epsilon[g]
+        actions = np.where(explore, random_moves, greedy)
+
+        won, draw = env.step(actions, idx)
+        finished = won | draw
+
+        # 對手接手後的局面價值；結束的盤不需要
+        next_states = env.encode(idx)
+        next_legal = env.legal_mask(idx)
+        next_best = np.where(next_legal, q[next_states], -np.inf).max(axis=1)
+        next_best[finished] = 0.0
+        target = np.where(won, 1.0, np.where(draw, 0.0, -discount * next_best))
+
+        # 只更新這一步碰到的 (state, action)，重複的依盤的順序一個接一個套用
+        _apply_updates(q_flat, s * N_CELLS + actions, target, learning_rate)
+
+        if idx is None:
+            states, legal = next_states, next_legal
+            finished = np.flatnonzero(finished)
+        else:
+            states[idx], legal[idx] = next_states, next_legal
+            finished = idx[finished]
+        if finished.size == 0:
+            continue
+        outcomes[game[finished]] = env.winner[finished]
+
+        n_new = min(finished.size, games - next_game)
+        restart = finished[:n_new]
+        game[restart] = np.arange(next_game, next_game + n_new)
+        env.reset(restart)
+        env.current[restart] = np.where(game[restart] % 2 == 0, 1, -1)
+        states[restart] = 0
+        legal[restart] = True
+        next_game += n_new
+        active[finished[n_new:]] = False
+
+    return q, outcomes
+
+
+def save(path: str, q: np.ndarray, metadata=None) -> None:
+    """存成 float32 的 .npy；metadata（訓練參數）另外寫在 <path>.json。"""
+    with open(path, "wb") as f:
+        np.save(f, q.astype(np.float32, copy=False))
+    if metadata is not None:
+        with open(path + ".json", "w", encoding="utf-8") as f:
+            json.dump(metadata, f, indent=2)
+
+
+def load(path: str = DEFAULT_QTABLE_PATH) -> np.ndarray:
+    q = np.load(path)
+    if q.shape != (NUM_CODES, N_CELLS):
+        raise ValueError(f"Unexpected Q-table shape {q.shape}: {path}")
+    return q
+
+
+def evaluate(q: np.ndarray, games: int = 1000, opponent: str = "random", seed: int = 0):
+    """
+    用 QTableStrategy 和 opponent（"random" / "medium" / "minimax"）在 TicTacToeEnvironment
+    上對打，輪流先手，回傳 (勝, 和, 敗)。
+    """
+    import random
+
+    from environment import TicTacToeEnvironment
+    from players import MediumStrategy, MinimaxStrategy, QTableStrategy, RandomStrategy
+
+    random.seed(seed)
+    factories = {
+        "random": lambda symbol: RandomStrategy(),
+        "medium": MediumStrategy,
+        "minimax": MinimaxStrategy,
+    }
+    win = draw = loss = 0
+    for i in range(games):
+        agent_symbol = 'X' if i % 2 == 0 else 'O'
+        agent = QTableStrategy(agent_symbol, q=q)
+        other = factories[opponent]('O' if agent_symbol == 'X' else 'X')
+        env = TicTacToeEnvironment()
+        env.current_player = 'X' if (i // 2) % 2 == 0 else 'O'
+        while not env.done:
+            strategy = agent if env.current_player == agent_symbol else other
+            env.step(strategy.choose_action(env))
+        if env.winner == agent_symbol:
+            win += 1
+        elif env.winner is None:
+            draw += 1
+        else:
+            loss += 1
+    return win, draw, loss
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="井字棋向量化 self-play Q-learning")
+    parser.add_argument("--games", type=int, default=200_000)
+    parser.add_argument("--envs", type=int, default=1024, help="同時進行的盤數")
+    parser.add_argument("--learning-rate", type=float, default=0.5)
+    parser.add_argument("--discount", type=float, default=0.95)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default=DEFAULT_QTABLE_PATH, help="Q 表 .npy（訓練參數寫在 <output>.json）")
+    parser.add_argument("--eval-games", type=int, default=1000, help="訓練完和各對手打幾局（0 = 略過）")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    q, outcomes = train_selfplay(args.games, args.envs, args.seed, args.learning_rate, args.discount)
+    elapsed = time.perf_counter() - start
+    save(args.output, q, {
+        "games": args.games,
+        "n_envs": args.envs,
+        "learning_rate": args.learning_rate,
+        "discount": args.discount,
+        "seed": args.seed,
+    })
+    tail = outcomes[-max(1, args.games // 10):]
+    print(f"訓練 {args.games:,} 局，耗時 {elapsed:.2f} 秒（{args.games / elapsed:,.0f} 局 / 秒），"
+          f"已寫入 {args.output}")
+    print(f"最後 {tail.size:,} 局：X 勝 {np.mean(tail == 1):.1%}，O 勝 {np.mean(tail == -1):.1%}，"
+          f"平手 {np.mean(tail == 0):.1%}")
+
+    if args.eval_games > 0:
+        for opponent in ("random", "medium", "minimax"):
+            win, draw, loss = evaluate(q, args.eval_games, opponent)
+            print(f"對 {opponent:<8}勝 {win:>5}  和 {draw:>5}  敗 {loss:>5}")
+
+
+if __name__ == "__main__":
+    main()
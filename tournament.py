@@ -0,0 +1,261 @@
+# tournament.py
+"""
+無 GUI 的批次對戰（tournament）：
+- 每一組 (X 策略, O 策略) 各打 N 局，用 GameManager + Player 類別實際對戰
+- 對局切成小批次丟到 process pool 平行執行
+- 每個批次有自己的亂數種子（由 --seed、組合、批次編號決定），結果可重現
+- 彙整勝 / 和 / 敗表與每秒對局數
+- --log：每一局都寫進對局紀錄（game_log.py 的 JSON Lines 格式）
+- --stats：每一局都累加進 SQLite 戰績（stats_store.py，整批一次 commit）
+- --metrics：記錄每個策略每一步的耗時 / 節點數 / cache 命中（instrumentation.py），
+  印出 p50 / p95 / p99 並寫成 JSON
+
+不會 import tkinter，可以在沒有螢幕的環境（CI、伺服器）執行：
+    python tournament.py --games 1000 --strategies easy medium hard
+"""
+import argparse
+import glob
+import itertools
+import json
+import os
+import random
+import shutil
+import time
+import uuid
+from multiprocessing import Pool
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from game_log import GameLogWriter
+from game_manager import DIFFICULTIES, GameManager
+from instrumentation import Metrics
+from stats_store import StatsStore
+
+Pairing = Tuple[str, str]  # (X 的策略, O 的策略)
+
+# 每個批次的結果：[X 勝, O 勝, 平手]
+_X_WIN, _O_WIN, _DRAW = 0, 1, 2
+
+
+def play_game(manager: GameManager) -> Optional[str]:
+    """從頭打完一局，回傳勝利者（'X' / 'O'），平手回傳 None。"""
+    manager.reset()
+    while not manager.env.done:
+        if manager.ai_move() is None:
+            break
+    return manager.env.winner
+
+
+def _shard_prefix(log_path: str) -> str:
+    """
+    這一次 run_tournament 的分檔前綴：帶一個每次執行都不同的 token，
+    合併時只收這次的分檔（之前中斷留下的分檔、或重複使用的 pid 都不會被混進來）。
+    """
+    return f"{log_path}.{uuid.uuid4().hex}.part"
+
+
+def _shard_path(shard_prefix: str, pid: int) -> str:
+    return f"{shard_prefix}{pid}"
+
+
+def _play_batch(task: Tuple[Pairing, int, int, int, int, Optional[str], Optional[str], bool]
+                ) -> Tuple[Pairing, List[int], Optional[Metrics]]:
+    """
+    worker：用指定的種子打完一批對局。
+    有 shard_prefix 時，每個 process 寫自己的分檔，最後由 run_tournament 合併，
+    避免多個 process 同時寫同一個檔案把行交錯在一起。
+    有 stats_path 時，整批的戰績在批次結束時用一個 transaction 寫入。
+    with_metrics 時，回傳這一批的 Metrics 讓主 process 合併。
+    """
+    (x_name, o_name), games, seed, size, k, shard_prefix, stats_path, with_metrics = task
+    random.seed(seed)
+    log = GameLogWriter(_shard_path(shard_prefix, os.getpid())) if shard_prefix else None
+    stats = StatsStore(stats_path, batch_size=games) if stats_path else None
+    metrics = Metrics() if with_metrics else None
+    manager = GameManager("ai_vs_ai", x_name, size, k, o_difficulty=o_name,  # type: ignore[arg-type]
+                          log=log, stats=stats, metrics=metrics)
+    counts = [0, 0, 0]
+    try:
+        for _ in range(games):
+            winner = play_game(manager)
+            if winner == 'X':
+                counts[_X_WIN] += 1
+            elif winner == 'O':
+                counts[_O_WIN] += 1
+            else:
+                counts[_DRAW] += 1
+    finally:
+        if log is not None:
+            log.close()
+        if stats is not None:
+            stats.close()
+    return (x_name, o_name), counts, metrics
+
+
+def _merge_shards(log_path: str, shard_prefix: str) -> None:
+    """把這次執行（shard_prefix）各 process 的分檔依序接到 log_path 後面，再刪掉分檔。"""
+    with open(log_path, "ab") as out:
+        for shard in sorted(glob.glob(glob.escape(shard_prefix) + "*")):
+            with open(shard, "rb") as f:
+                shutil.copyfileobj(f, out, 1 << 20)
+            os.remove(shard)
+
+
+def _batch_seed(base_seed: int, pairing_index: int, batch: int) -> int:
+    return (base_seed * 1_000_003 + pairing_index) * 1_000_003 + batch
+
+
+class TournamentResult:
+    """
+    彙整後的結果：counts[(X 策略, O 策略)] = [X 勝, O 勝, 平手]
+    metrics：有開 metrics 時，所有批次合併後的每步量測，否則 None。
+    """
+
+    def __init__(self, counts: Dict[Pairing, List[int]], elapsed: float,
+                 metrics: Optional[Metrics] = None) -> None:
+        self.counts = counts
+        self.elapsed = elapsed
+        self.metrics = metrics
+
+    @property
+    def games(self) -> int:
+        return sum(sum(c) for c in self.counts.values())
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.elapsed if self.elapsed > 0 else 0.0
+
+    def strategy_totals(self) -> Dict[str, List[int]]:
+        """每個策略（不分 X / O）的 [勝, 和, 敗]。"""
+        totals: Dict[str, List[int]] = {}
+        for (x_name, o_name), (x_win, o_win, draw) in self.counts.items():
+            x = totals.setdefault(x_name, [0, 0, 0])
+            o = totals.setdefault(o_name, [0, 0, 0])
+            x[0] += x_win
+            x[1] += draw
+            x[2] += o_win
+            o[0] += o_win
+            o[1] += draw
+            o[2] += x_win
+        return totals
+
+    def format_table(self) -> str:
+        lines = [f"{'X 策略':<10}{'O 策略':<10}{'局數':>8}{'X 勝':>8}{'平手':>8}{'O 勝':>8}"]
+        for (x_name, o_name), (x_win, o_win, draw) in self.counts.items():
+            total = x_win + o_win + draw
+            lines.append(f"{x_name:<10}{o_name:<10}{total:>8}{x_win:>8}{draw:>8}{o_win:>8}")
+        lines.append("")
+        lines.append(f"{'策略':<10}{'勝':>8}{'和':>8}{'敗':>8}{'勝率':>9}")
+        for name, (win, draw, loss) in self.strategy_totals().items():
+            total = win + draw + loss
+            rate = win / total * 100 if total else 0.0
+            lines.append(f"{name:<10}{win:>8}{draw:>8}{loss:>8}{rate:>8.1f}%")
+        lines.append("")
+        lines.append(f"共 {self.games} 局，耗時 {self.elapsed:.2f} 秒，"
+                     f"{self.games_per_second:,.0f} 局 / 秒")
+        if self.metrics is not None:
+            lines.append("")
+            lines.append(self.metrics.format_table())
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict:
+        return {
+            "pairings": [
+                {"x": x_name, "o": o_name, "x_wins": c[_X_WIN],
+                 "o_wins": c[_O_WIN], "draws": c[_DRAW]}
+                for (x_name, o_name), c in self.counts.items()
+            ],
+            "games": self.games,
+            "elapsed": self.elapsed,
+            "games_per_second": self.games_per_second,
+        }
+
+
+def run_tournament(strategies: Sequence[str], games: int, workers: Optional[int] = None,
+                   seed: int = 0, batch_size: int = 200,
+                   size: int = 3, k: int = 3,
+                   log_path: Optional[str] = None,
+                   stats_path: Optional[str] = None,
+                   metrics: bool = False) -> TournamentResult:
+    """
+    對 strategies 的每一組有序配對 (X, O)（含自己對自己）各打 games 局。
+    workers=1 時在目前的 process 直接執行，不開 pool。
+    log_path：每一局附加寫入這個對局紀錄檔。
+    stats_path：每一局累加進這個 SQLite 戰績檔。
+    metrics：記錄每一步的量測，結果放在 TournamentResult.metrics。
+    """
+    for name in strategies:
+        if name not in DIFFICULTIES:
+            raise ValueError(f"Unknown strategy: {name} (choose from {', '.join(DIFFICULTIES)})")
+    if games <= 0:
+        raise ValueError(f"games must be positive: {games}")
+
+    pairings: List[Pairing] = list(itertools.product(strategies, repeat=2))
+    shard_prefix = _shard_prefix(log_path) if log_path else None
+    tasks = []
+    for p_index, pairing in enumerate(pairings):
+        for batch, start in enumerate(range(0, games, batch_size)):
+            n = min(batch_size, games - start)
+            tasks.append((pairing, n, _batch_seed(seed, p_index, batch), size, k,
+                          shard_prefix, stats_path, metrics))
+
+    if stats_path:
+        StatsStore(stats_path).close()  # 先建好資料表，worker 就不會同時搶著建
+    counts: Dict[Pairing, List[int]] = {pairing: [0, 0, 0] for pairing in pairings}
+    merged = Metrics() if metrics else None
+    start_time = time.perf_counter()
+    if workers == 1:
+        results = map(_play_batch, tasks)
+        for pairing, batch_counts, batch_metrics in results:
+            _accumulate(counts[pairing], batch_counts, merged, batch_metrics)
+    else:
+        with Pool(processes=workers) as pool:
+            for pairing, batch_counts, batch_metrics in pool.imap_unordered(_play_batch, tasks):
+                _accumulate(counts[pairing], batch_counts, merged, batch_metrics)
+    if log_path and shard_prefix:
+        _merge_shards(log_path, shard_prefix)
+    elapsed = time.perf_counter() - start_time
+    return TournamentResult(counts, elapsed, merged)
+
+
+def _accumulate(counts: List[int], batch_counts: List[int],
+                merged: Optional[Metrics], batch_metrics: Optional[Metrics]) -> None:
+    for i, c in enumerate(batch_counts):
+        counts[i] += c
+    if merged is not None and batch_metrics is not None:
+        merged.merge(batch_metrics)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="無 GUI 的 AI 批次對戰")
+    parser.add_argument("--games", type=int, default=1000, help="每組配對的對局數")
+    # mcts 每步要想 0.5 秒，預設不參賽，需要時再用 --strategies 加進來
+    parser.add_argument("--strategies", nargs="+", default=["easy", "medium", "hard"],
+                        choices=DIFFICULTIES, help="參賽策略")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="process 數（預設為 CPU 核心數，1 = 不開 pool）")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=200, help="每個工作批次的對局數")
+    parser.add_argument("--size", type=int, default=3, help="棋盤邊長")
+    parser.add_argument("--k", type=int, default=3, help="連成幾個獲勝")
+    parser.add_argument("--json", help="把結果另外寫成 JSON 檔")
+    parser.add_argument("--log", help="把每一局附加寫進對局紀錄檔（JSON Lines）")
+    parser.add_argument("--stats", help="把每一局累加進 SQLite 戰績檔")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="記錄每一步的耗時 / 節點數，印出百分位數並寫成 JSON")
+    args = parser.parse_args()
+
+    result = run_tournament(args.strategies, args.games, workers=args.workers,
+                            seed=args.seed, batch_size=args.batch_size,
+                            size=args.size, k=args.k, log_path=args.log, stats_path=args.stats,
+                            metrics=args.metrics is not None)
+    print(result.format_table())
+    if result.metrics is not None:
+        result.metrics.dump(args.metrics)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()